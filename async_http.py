@@ -0,0 +1,271 @@
+"""
+Асинхронный обход каталогов ggsel и plati по HTTP для многих страниц и
+категорий сразу.
+
+Все запросы идут через один пул соединений (httpx с HTTP/2, если установлен
+h2; иначе aiohttp; без них - сессия requests в потоках) с общим лимитом и
+лимитом на хост, таймаутами и повторами. Разметка разбирается теми же
+парсерами, что и в HttpFetcher, но в пуле потоков или в пуле процессов
+ParsePool, чтобы разбор не останавливал цикл событий.
+"""
+
+import asyncio
+import json
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlparse
+
+import requests
+
+from core import (HTTP_HEADERS, HttpFetcher, ProductStream, RecordedResponse, create_http_session, create_parser,
+                  full_url)
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+try:
+    import h2
+except ImportError:
+    h2 = None
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+ASYNC_CONCURRENCY = 32      # одновременных запросов за весь обход
+ASYNC_PER_HOST = 4          # одновременных запросов к одному хосту
+ASYNC_TIMEOUT = 15          # таймаут запроса, сек
+ASYNC_RETRIES = 3           # повторов при сетевой ошибке, 429 и 5xx
+ASYNC_BACKOFF = 0.5         # пауза перед первым повтором, сек; дальше удваивается
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_page(parser, text, url):
+    """Разбор страницы каталога в пуле; функция модуля, чтобы подходил и пул процессов"""
+    return list(parser.iter_products(text, url))
+
+
+def parse_plati_search(text):
+    """(товары, всего страниц, карточек в ответе) из ответа API поиска plati.io"""
+    data = json.loads(text)
+    items = data.get('items') or []
+    total_pages = int(data.get('Totalpages') or data.get('totalpages') or 1)
+    return HttpFetcher.plati_products(items), total_pages, len(items)
+
+
+class AsyncClient:
+    """Общий пул соединений с лимитами на весь обход и на каждый хост"""
+
+    def __init__(self, concurrency=ASYNC_CONCURRENCY, per_host=ASYNC_PER_HOST, timeout=ASYNC_TIMEOUT,
+                 retries=ASYNC_RETRIES, rate_limiter=None, backend=None):
+        if backend is None:
+            backend = 'httpx' if httpx is not None else 'aiohttp' if aiohttp is not None else 'requests'
+        self.backend = backend
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.rate_limiter = rate_limiter    # DomainRateLimiter: используется только его корзина токенов
+        self.bytes_received = 0
+        self.requests = 0
+        self.retried = 0
+        self._client = None
+        self._io_pool = None
+        self._total = None
+        self._hosts = {}
+        self._errors = (asyncio.TimeoutError, OSError, requests.RequestException)
+
+    async def __aenter__(self):
+        # Семафоры создаются внутри цикла событий, в котором идет обход
+        self._total = asyncio.Semaphore(self.concurrency)
+        if self.backend == 'httpx':
+            self._client = httpx.AsyncClient(
+                http2=h2 is not None, headers=HTTP_HEADERS, timeout=self.timeout, follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency))
+            self._errors += (httpx.HTTPError,)
+        elif self.backend == 'aiohttp':
+            self._client = aiohttp.ClientSession(
+                headers=HTTP_HEADERS, timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host))
+            self._errors += (aiohttp.ClientError,)
+        else:
+            self._client = create_http_session()
+            self._io_pool = ThreadPoolExecutor(max_workers=self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.backend == 'httpx':
+            await self._client.aclose()
+        elif self.backend == 'aiohttp':
+            await self._client.close()
+        else:
+            self._client.close()
+            self._io_pool.shutdown(wait=False)
+
+    async def _request(self, url, headers):
+        if self.backend == 'httpx':
+            resp = await self._client.get(url, headers=headers)
+            body = resp.content
+            return RecordedResponse(str(resp.url), resp.status_code, resp.text, dict(resp.headers)), len(body)
+        if self.backend == 'aiohttp':
+            async with self._client.get(url, headers=headers) as resp:
+                body = await resp.read()
+                text = body.decode(resp.charset or 'utf-8', errors='replace')
+                return RecordedResponse(str(resp.url), resp.status, text, dict(resp.headers)), len(body)
+        loop = asyncio.get_running_loop()
+        resp = await loop.run_in_executor(
+            self._io_pool, partial(self._client.get, url, headers=headers, timeout=self.timeout))
+        return RecordedResponse(resp.url, resp.status_code, resp.text, dict(resp.headers)), len(resp.content)
+
+    def _retry_delay(self, attempt, resp):
+        retry_after = resp.headers.get('Retry-After') if resp is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), 60.0)
+        return ASYNC_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5)
+
+    async def get(self, url, params=None, headers=None):
+        """Ответ с успешным статусом; сетевые ошибки, 429 и 5xx повторяются с паузой"""
+        url = full_url(url, params)
+        host = urlparse(url).netloc
+        semaphore = self._hosts.setdefault(host, asyncio.Semaphore(self.per_host))
+
+        for attempt in range(self.retries + 1):
+            resp = error = None
+            async with self._total, semaphore:
+                if self.rate_limiter:
+                    delay = self.rate_limiter.reserve(host)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                try:
+                    resp, size = await asyncio.wait_for(self._request(url, headers), self.timeout)
+                    self.requests += 1
+                    self.bytes_received += size
+                except self._errors as e:
+                    error = e
+
+            if resp is not None and resp.status_code not in RETRY_STATUSES:
+                break
+            if attempt < self.retries:
+                self.retried += 1
+                await asyncio.sleep(self._retry_delay(attempt, resp))
+
+        if resp is None:
+            raise error
+        resp.raise_for_status()
+        return resp
+
+
+class AsyncCatalogFetcher:
+    """
+    Обход нескольких каталогов одновременно.
+
+    Первая страница каталога загружается одна, дальше страницы идут окнами.
+    Результаты окна принимаются по порядку, обход каталога останавливается на
+    первой странице без новых товаров, как в HttpFetcher; лишние страницы окна
+    отбрасываются. Окно - доля лимита хоста на один каталог: когда каталогов
+    больше лимита, хост загружен и без окон, и лишних запросов нет.
+    """
+
+    def __init__(self, product_type="Все", max_items=None, max_pages=None, page_size=500,
+                 concurrency=ASYNC_CONCURRENCY, per_host=ASYNC_PER_HOST, timeout=ASYNC_TIMEOUT,
+                 retries=ASYNC_RETRIES, parse_workers=PARSE_WORKERS, parse_executor=None, rate_limiter=None,
+                 on_products=None, backend=None, parse_pool=None):
+        self.parser = create_parser(product_type, max_items)
+        self.parse_pool = parse_pool    # ParsePool: большие страницы разбираются в отдельных процессах
+        self.max_items = max_items
+        self.max_pages = max_pages      # None - до первой страницы без новых товаров или до лимита
+        self.page_size = page_size
+        self.parse_workers = parse_workers
+        self.parse_executor = parse_executor
+        self.on_products = on_products
+        self.client = AsyncClient(concurrency, per_host, timeout, retries, rate_limiter, backend)
+        self._executor = None
+        self._window = 1
+
+    @staticmethod
+    def supports(url):
+        return HttpFetcher.supports(url)
+
+    def fetch_all(self, urls):
+        """{url: товары или исключение} для всех адресов; вызывается вне цикла событий"""
+        return asyncio.run(self._fetch_all(urls))
+
+    async def _fetch_all(self, urls):
+        self._window = max(1, self.client.per_host // max(1, len(urls)))
+        self._executor = self.parse_executor or ThreadPoolExecutor(max_workers=self.parse_workers)
+        try:
+            async with self.client:
+                results = await asyncio.gather(*(self.fetch(url) for url in urls), return_exceptions=True)
+        finally:
+            if self.parse_executor is None:
+                self._executor.shutdown()
+        return dict(zip(urls, results))
+
+    async def _in_pool(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def fetch(self, url):
+        query = HttpFetcher.plati_query(url)
+        stream = ProductStream(max_items=self.parser.limit(self.parser.site(url)), on_chunk=self.on_products)
+        if query:
+            await self._fetch_plati_search(query, stream)
+        else:
+            await self._fetch_pages(url, stream)
+        print(f"HTTP: {url} - товаров {stream.count}")
+        return stream.products
+
+    async def _fetch_page(self, url, page):
+        resp = await self.client.get(url if page == 1 else full_url(url, {'page': page}))
+        if self.parse_pool:
+            return await asyncio.wrap_future(self.parse_pool.submit(self.parser, resp.text, url))
+        return await self._in_pool(parse_page, self.parser, resp.text, url)
+
+    async def _fetch_pages(self, url, stream):
+        max_pages = 1 if url.rstrip('/') == 'https://ggsel.net' else self.max_pages
+        page = 1
+        window = 1
+
+        while (max_pages is None or page <= max_pages) and not stream.full:
+            pages = range(page, page + window if max_pages is None else min(page + window, max_pages + 1))
+            results = await asyncio.gather(*(self._fetch_page(url, p) for p in pages), return_exceptions=True)
+            for p, products in zip(pages, results):
+                if isinstance(products, Exception):
+                    if p == 1:
+                        raise products
+                    print(f"HTTP: {url} страница {p} не загружена ({products}), обход каталога остановлен")
+                    return
+                before = stream.count
+                stream.consume(products)
+                if stream.count == before:
+                    return
+            page += len(pages)
+            window = self._window
+
+    async def _plati_page(self, query, page):
+        resp = await self.client.get(HttpFetcher.PLATI_SEARCH_API,
+                                     params=HttpFetcher.plati_params(query, page, self.page_size))
+        return await self._in_pool(parse_plati_search, resp.text)
+
+    async def _fetch_plati_search(self, query, stream):
+        # Число страниц известно из первого ответа, остальные загружаются параллельно: без лимита все
+        # сразу, с лимитом - столько, сколько нужно до него при числе товаров первой страницы
+        products, total_pages, per_page = await self._plati_page(query, 1)
+        stream.consume(products)
+        last = total_pages if self.max_pages is None else min(total_pages, self.max_pages)
+        page = 2
+        while page <= last and not stream.full:
+            needed = -(-(stream.max_items - stream.count) // max(per_page, 1)) if stream.max_items else last
+            pages = range(page, min(page + needed, last + 1))
+            results = await asyncio.gather(*(self._plati_page(query, p) for p in pages), return_exceptions=True)
+            for p, result in zip(pages, results):
+                if isinstance(result, Exception):
+                    print(f"HTTP: plati.io страница {p} не загружена ({result})")
+                    continue
+                stream.consume(result[0])
+                if stream.full:
+                    break
+            page += len(pages)
@@ -0,0 +1,118 @@
+"""
+Сравнение AnalyticsEngine на колонках numpy с прежней реализацией на списке словарей.
+
+Запуск:
+    python benchmarks/bench_analytics.py [--sizes 1000 10000 100000]
+
+Перед замером проверяется, что обе реализации дают одинаковые результаты.
+Колонка "повтор" - повторный запрос всех метрик у того же движка (результаты запомнены),
+"по пачкам" - те же товары, добавленные через add_batch пачками по --chunk с запросом
+статистики после каждой пачки, как при показе во время парсинга.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import AnalyticsEngine, ProductColumns  # noqa: E402
+from legacy_analytics import LegacyAnalyticsEngine  # noqa: E402
+
+CATEGORIES = ["Ключ", "Гифт", "DLC", "Пополнение", ""] + [f"Игра {i}" for i in range(40)]
+
+
+def make_products(n, seed=7):
+    rnd = random.Random(seed)
+    return [{
+        'name': f"Товар {i}",
+        'price': round(rnd.lognormvariate(5.5, 1.0), 2),
+        'sales': int(rnd.paretovariate(1.2) * 10),
+        'link': f"https://ggsel.net/catalog/product/{i}",
+        'category': rnd.choice(CATEGORIES)
+    } for i in range(n)]
+
+
+def run_all(engine_cls, products):
+    return run_analytics(engine_cls(products))
+
+
+def run_analytics(engine):
+    return (engine.get_category_stats(), engine.get_price_segments(),
+            engine.get_anomalies(), engine.get_top_products())
+
+
+def run_online(products, chunk):
+    engine = AnalyticsEngine()
+    for start in range(0, len(products), chunk):
+        engine.add_batch(products[start:start + chunk])
+        engine.get_category_stats()
+        engine.get_price_segments()
+        engine.get_top_products()
+    return run_analytics(engine)
+
+
+def same_results(legacy, new):
+    """Сравнение с эталоном по его полям (новые поля, например разброс, не учитываются)"""
+    def strip(rows, reference):
+        return [{key: row[key] for key in ref} for row, ref in zip(rows, reference)]
+
+    (l_stats, l_segments, l_anomalies, l_top), (n_stats, n_segments, n_anomalies, n_top) = legacy, new
+    return (len(l_stats) == len(n_stats) and strip(n_stats, l_stats) == l_stats
+            and len(l_segments) == len(n_segments) and strip(n_segments, l_segments) == l_segments
+            and l_anomalies == n_anomalies and l_top == n_top)
+
+
+def close_results(exact, online):
+    """Суммы по пачкам складываются в другом порядке - сравнение с допуском"""
+    for rows_a, rows_b in ((exact[0], online[0]), (exact[1], online[1])):
+        if len(rows_a) != len(rows_b):
+            return False
+        for a, b in zip(rows_a, rows_b):
+            for key, value in a.items():
+                if isinstance(value, float) and not math.isclose(value, b[key], rel_tol=1e-9, abs_tol=1e-6):
+                    return False
+    return exact[3] == online[3]
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--chunk', type=int, default=1000)
+    args = ap.parse_args()
+
+    # Первый ProductColumns загружает pandas - в замер первого размера это попадать не должно
+    ProductColumns(make_products(10))
+
+    print(f"{'товаров':>9}{'списки, мс':>13}{'numpy, мс':>12}{'ускорение':>12}{'повтор, мкс':>14}{'по пачкам, мс':>16}")
+    for n in args.sizes:
+        products = make_products(n)
+        legacy_time, legacy = best_of(lambda: run_all(LegacyAnalyticsEngine, products), args.repeat)
+        new_time, new = best_of(lambda: run_all(AnalyticsEngine, products), args.repeat)
+        engine = AnalyticsEngine(products)
+        run_analytics(engine)
+        cached_time, cached = best_of(lambda: run_analytics(engine), args.repeat)
+        online_time, online = best_of(lambda: run_online(products, args.chunk), args.repeat)
+        if not same_results(legacy, new) or cached != new or not close_results(new, online):
+            print(f"{n}: результаты различаются")
+            sys.exit(1)
+        print(f"{n:>9}{legacy_time * 1000:>13.1f}{new_time * 1000:>12.1f}{legacy_time / new_time:>11.1f}x"
+              f"{cached_time * 1e6:>14.1f}{online_time * 1000:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Обход многих каталогов по HTTP: последовательный HttpFetcher, пакетный режим
+(потоки по одному каталогу) и асинхронный AsyncCatalogFetcher на каждом из
+доступных клиентов (httpx, aiohttp, requests в потоках).
+
+Страницы отдает локальный сервер с искусственной задержкой ответа, так что
+замер не зависит от сети и сайтов. Для асинхронного обхода дополнительно
+меряется наибольшая задержка цикла событий: разбор идет в пуле и не должен
+её заметно увеличивать. Все варианты обязаны вернуть одинаковые товары.
+
+Запуск:
+    python benchmarks/bench_async.py [--catalogs 8] [--pages 6] [--cards 100] [--latency 0.2] [--per-host 4]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import async_http  # noqa: E402
+from async_http import AsyncCatalogFetcher  # noqa: E402
+from core import HttpFetcher, create_http_session, create_parser, merge_products  # noqa: E402
+from fixtures import ggsel_page  # noqa: E402
+
+
+def start_server(pages, cards, latency):
+    cache = {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            parts = urlparse(self.path)
+            page = int(parse_qs(parts.query).get('page', ['1'])[0])
+            key = (parts.path, page)
+            with lock:
+                if key not in cache:
+                    # Свой диапазон номеров карточек у каждой страницы каждого каталога
+                    catalog = int(parts.path.rstrip('/').rsplit('/', 1)[-1])
+                    start = (catalog * 1000 + page) * 1000
+                    cache[key] = ggsel_page(cards if page <= pages else 0, seed=start,
+                                            start=start).encode('utf-8')
+                body = cache[key]
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def sequential(urls):
+    session = create_http_session()
+    return merge_products([HttpFetcher(create_parser(max_items=0), session=session).fetch(url) for url in urls])
+
+
+def threaded(urls, workers=4):
+    local = threading.local()
+
+    def fetch(url):
+        if not hasattr(local, 'session'):
+            local.session = create_http_session()
+        return HttpFetcher(create_parser(max_items=0), session=local.session).fetch(url)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return merge_products(list(executor.map(fetch, urls)))
+
+
+def run_async(urls, backend, per_host):
+    """(товары, наибольшая задержка цикла событий в мс, запросов)"""
+    fetcher = AsyncCatalogFetcher(max_items=0, per_host=per_host, backend=backend)
+    lag = [0.0]
+
+    async def ticker(stop):
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lag[0] = max(lag[0], time.perf_counter() - start - 0.005)
+
+    async def main():
+        stop = asyncio.Event()
+        tick = asyncio.create_task(ticker(stop))
+        results = await fetcher._fetch_all(urls)
+        stop.set()
+        await tick
+        return results
+
+    results = asyncio.run(main())
+    errors = [r for r in results.values() if isinstance(r, Exception)]
+    if errors:
+        raise errors[0]
+    return merge_products(results[url] for url in urls), lag[0] * 1000, fetcher.client.requests
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--catalogs', type=int, default=8)
+    ap.add_argument('--pages', type=int, default=6)
+    ap.add_argument('--cards', type=int, default=100)
+    ap.add_argument('--latency', type=float, default=0.2, help="задержка ответа сервера, сек")
+    ap.add_argument('--per-host', type=int, default=4,
+                    help="одновременных запросов к хосту (и потоков в пакетном режиме)")
+    args = ap.parse_args()
+
+    server = start_server(args.pages, args.cards, args.latency)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/ggsel/catalog/{i}" for i in range(args.catalogs)]
+
+    backends = [name for name, module in (('httpx', async_http.httpx), ('aiohttp', async_http.aiohttp))
+                if module is not None] + ['requests']
+    variants = [("последовательно", lambda: (sequential(urls), None, None)),
+                (f"потоки x{args.per_host}", lambda: (threaded(urls, args.per_host), None, None))]
+    variants += [(f"async {name}", partial_backend(urls, name, args.per_host)) for name in backends]
+
+    print(f"{args.catalogs} каталогов x {args.pages} стр. x {args.cards} карточек, задержка {args.latency * 1000:.0f} мс")
+    print(f"{'вариант':<18}{'время, с':>10}{'товаров':>9}{'запросов':>10}{'задержка цикла, мс':>20}")
+    reference = None
+    for title, run in variants:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            products, lag, requests = run()
+        elapsed = time.perf_counter() - start
+        links = sorted(p['link'] for p in products)
+        if reference is None:
+            reference = links
+        assert links == reference, f"{title}: товары отличаются от последовательного обхода"
+        print(f"{title:<18}{elapsed:>10.2f}{len(products):>9}{requests or '-':>10}"
+              f"{'-' if lag is None else f'{lag:.1f}':>20}")
+    server.shutdown()
+
+
+def partial_backend(urls, backend, per_host):
+    return lambda: run_async(urls, backend, per_host)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Облегченный профиль Chrome против полного: время загрузки страницы, объем
+трафика, число запросов и RSS процессов Chrome для каждого сайта.
+
+Первый заход идет с пустым кэшем, остальные - с прогретым. Трафик берется
+из журнала производительности (Network.loadingFinished), RSS - суммой по
+дереву процессов chromedriver (нужен psutil). Заодно сверяется, что на
+облегченной странице карточек не меньше, чем на полной.
+
+Нужен установленный Chrome и доступ к сайтам:
+    python benchmarks/bench_browser.py [--urls URL ...] [--runs 4]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core import DriverPool, create_parser  # noqa: E402
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DEFAULT_URLS = [
+    'https://ggsel.net',
+    'https://ggsel.net/catalog/steam-keys',
+    'https://plati.market/games/',
+]
+
+
+class LoggingDriverPool(DriverPool):
+    """Пул с журналом производительности для подсчета трафика"""
+
+    def _options(self, cache=None):
+        options = super()._options(cache)
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        return options
+
+
+def network_totals(driver):
+    """(байт получено, запросов, заблокировано) по журналу с прошлого вызова"""
+    received = requests = blocked = 0
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        method = message.get('method')
+        if method == 'Network.requestWillBeSent':
+            requests += 1
+        elif method == 'Network.loadingFinished':
+            received += message['params'].get('encodedDataLength', 0)
+        elif method == 'Network.loadingFailed' and message['params'].get('blockedReason'):
+            blocked += 1
+    return received, requests, blocked
+
+
+def chrome_rss_mb(driver):
+    if psutil is None:
+        return float('nan')
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        return sum(p.memory_info().rss for p in root.children(recursive=True)) / 2**20
+    except psutil.Error:
+        return float('nan')
+
+
+def measure(url, lean, runs, cache_dir):
+    pool = LoggingDriverPool(size=1, lean=lean, cache_dir=cache_dir)
+    parser = create_parser()
+    results = []
+    try:
+        driver = pool.acquire()
+        network_totals(driver)
+        for _ in range(runs):
+            driver.get('about:blank')
+            network_totals(driver)
+            start = time.perf_counter()
+            driver.get(url)
+            seconds = time.perf_counter() - start
+            received, requests, blocked = network_totals(driver)
+            cards = len(list(parser.parse_html(driver.page_source, url)))
+            results.append({'seconds': seconds, 'bytes': received, 'requests': requests, 'blocked': blocked,
+                            'rss': chrome_rss_mb(driver), 'cards': cards})
+        pool.release(driver)
+    finally:
+        pool.shutdown()
+    return results
+
+
+def summary(results):
+    cold, warm = results[0], results[1:] or results
+    return {
+        'cold': cold['seconds'],
+        'warm': statistics.median(r['seconds'] for r in warm),
+        'kb_cold': cold['bytes'] / 1024,
+        'kb_warm': statistics.median(r['bytes'] for r in warm) / 1024,
+        'requests': cold['requests'],
+        'blocked': cold['blocked'],
+        'rss': max(r['rss'] for r in results),
+        'cards': min(r['cards'] for r in results),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--urls', nargs='+', default=DEFAULT_URLS)
+    ap.add_argument('--runs', type=int, default=4, help="заходов на страницу, первый - с пустым кэшем")
+    args = ap.parse_args()
+
+    print(f"{'профиль':<8}{'холодно, с':>11}{'прогрето, с':>12}{'КБ холодно':>11}{'КБ прогрето':>12}"
+          f"{'запросов':>10}{'блок.':>7}{'RSS, МБ':>9}{'карточек':>10}")
+    for url in args.urls:
+        print(url)
+        rows = {}
+        for lean in (False, True):
+            # Отдельный пустой кэш на каждый замер: первый заход действительно холодный
+            with tempfile.TemporaryDirectory() as cache_dir:
+                rows[lean] = summary(measure(url, lean, args.runs, cache_dir if lean else None))
+            r = rows[lean]
+            print(f"{'lean' if lean else 'полный':<8}{r['cold']:>11.2f}{r['warm']:>12.2f}{r['kb_cold']:>11.0f}"
+                  f"{r['kb_warm']:>12.0f}{r['requests']:>10}{r['blocked']:>7}{r['rss']:>9.0f}{r['cards']:>10}")
+        if rows[True]['cards'] < rows[False]['cards']:
+            print(f"  ВНИМАНИЕ: в облегченном профиле меньше карточек ({rows[True]['cards']} из {rows[False]['cards']})")
+
+
+if __name__ == '__main__':
+    main()
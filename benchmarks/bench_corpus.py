@@ -0,0 +1,196 @@
+"""
+Пропускная способность парсеров на корпусе страниц (benchmarks/corpus.py):
+карточек в секунду, пик выделенной памяти по tracemalloc и прирост пикового
+RSS для parse_ggsel, parse_plati и parse_generic на lxml и BeautifulSoup.
+tracemalloc видит только объекты Python: дерево lxml живет в памяти C и
+заметно лишь по RSS.
+
+Каждая пара страница/парсер меряется в отдельном процессе, чтобы RSS не
+накапливался между замерами. Результат сравнивается с базовым замером
+benchmarks/baseline_corpus.json. Регрессия - другое число карточек, падение
+скорости или рост памяти сверх порога; тогда код выхода 1. Сеть не нужна.
+У записанных с сайтов страниц число карточек сверяется и с записанным при
+сохранении - даже пока их нет в базовом замере. Базовый замер в репозитории
+снят только по синтетическим страницам (см. corpus.py).
+
+Скорость сравнивается с поправкой на машину: между повторами разбора
+меряется эталонный цикл на чистом Python, и карточки в секунду делятся на
+его скорость. Так базовый замер с другой машины или под другой нагрузкой не
+дает ложных регрессий. Замер с регрессией повторяется один раз, в зачет идет
+лучший из двух.
+
+Запуск:
+    python benchmarks/bench_corpus.py
+    python benchmarks/bench_corpus.py --pages plati ggsel_10k --parsers lxml
+    python benchmarks/bench_corpus.py --save-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import corpus  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_corpus.json')
+PARSERS = ['lxml', 'bs4']
+SPEED_TOLERANCE = 0.20      # допустимое падение карточек в секунду
+MEMORY_TOLERANCE = 0.25     # допустимый рост памяти
+MEMORY_NOISE_MB = 2.0       # меньшие изменения памяти не считаются
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+CALIBRATION_LOOP = 100000
+
+
+def calibrate():
+    """Время эталонного цикла, сек"""
+    start = time.perf_counter()
+    total = 0
+    for i in range(CALIBRATION_LOOP):
+        total += i % 7
+    return time.perf_counter() - start
+
+
+def create(parser_name):
+    from core import LxmlProductParser, ProductParser
+
+    parser_class = LxmlProductParser if parser_name == 'lxml' else ProductParser
+    return parser_class(max_items=0)
+
+
+def worker(name, parser_name, min_time):
+    url, html = corpus.load(name)
+    parser = create(parser_name)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        base_rss = peak_rss_mb()
+        products = parser.parse_html(html, url)
+        rss = peak_rss_mb() - base_rss
+
+        best = best_calibration = float('inf')
+        started = time.perf_counter()
+        runs = 0
+        while runs < 3 or time.perf_counter() - started < min_time:
+            start = time.perf_counter()
+            parser.parse_html(html, url)
+            best = min(best, time.perf_counter() - start)
+            best_calibration = min(best_calibration, calibrate())
+            runs += 1
+            if time.perf_counter() - started > 10 * min_time:
+                break
+
+        tracemalloc.start()
+        parser.parse_html(html, url)
+        _, alloc_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(json.dumps({'cards': len(products), 'seconds': best, 'cards_per_sec': len(products) / best,
+                      'alloc_mb': alloc_peak / 2**20, 'rss_mb': rss, 'runs': runs,
+                      'machine': CALIBRATION_LOOP / best_calibration}))
+
+
+def measure(name, parser_name, min_time):
+    out = subprocess.run([sys.executable, __file__, '--worker', name, parser_name, str(min_time)],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def relative_speed(result, base):
+    """Отношение скорости к базовой с поправкой на скорость машины"""
+    ratio = result['cards_per_sec'] / base['cards_per_sec']
+    if base.get('machine'):
+        ratio *= base['machine'] / result['machine']
+    return ratio
+
+
+def regressions(result, base, recorded_cards=None):
+    """Список найденных регрессий относительно базового замера и числа карточек при записи"""
+    problems = []
+    if recorded_cards is not None and result['cards'] != recorded_cards:
+        problems.append(f"карточек {result['cards']}, при записи {recorded_cards}")
+    if not base:
+        return problems
+    if result['cards'] != base['cards']:
+        problems.append(f"карточек {result['cards']} вместо {base['cards']}")
+    speed = relative_speed(result, base)
+    if speed < 1 - SPEED_TOLERANCE:
+        problems.append(f"скорость -{100 * (1 - speed):.0f}%")
+    for key, title in (('alloc_mb', "память"), ('rss_mb', "RSS")):
+        grown = result[key] - base[key]
+        if grown > MEMORY_NOISE_MB and grown > base[key] * MEMORY_TOLERANCE:
+            problems.append(f"{title} +{grown:.1f} МБ")
+    return problems
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--pages', nargs='+', default=None, help="страницы корпуса, по умолчанию все")
+    ap.add_argument('--parsers', nargs='+', default=PARSERS, choices=PARSERS)
+    ap.add_argument('--min-time', type=float, default=1.0, help="сколько секунд повторять разбор для замера")
+    ap.add_argument('--baseline', default=BASELINE)
+    ap.add_argument('--save-baseline', action='store_true', help="записать результат как базовый")
+    ap.add_argument('--worker', nargs=3, metavar=('PAGE', 'PARSER', 'MIN_TIME'), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        name, parser_name, min_time = args.worker
+        worker(name, parser_name, float(min_time))
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    pages = args.pages or corpus.names()
+    results = {}
+    failed = 0
+    print(f"{'страница':<16}{'парсер':>7}{'карточек':>10}{'карт./с':>10}{'к базе':>10}"
+          f"{'память, МБ':>12}{'RSS, МБ':>9}  итог")
+    for name in pages:
+        for parser_name in args.parsers:
+            key = f"{name}/{parser_name}"
+            r = measure(name, parser_name, args.min_time)
+            base = baseline.get(key)
+            cards = corpus.recorded_cards(name)
+            problems = regressions(r, base, cards)
+            if problems and base:
+                again = measure(name, parser_name, args.min_time)
+                if relative_speed(again, base) > relative_speed(r, base):
+                    r = again
+                problems = regressions(r, base, cards)
+            results[key] = r
+            failed += bool(problems)
+            status = '; '.join(problems) if problems else ('ok' if base else
+                                                           'нет базы' if cards is None else 'ok, нет базы')
+            base_speed = f"{100 * relative_speed(r, base):.0f}%" if base else '-'
+            print(f"{name:<16}{parser_name:>7}{r['cards']:>10}{r['cards_per_sec']:>10.0f}{base_speed:>10}"
+                  f"{r['alloc_mb']:>12.1f}{r['rss_mb']:>9.1f}  {status}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"Базовый замер записан: {args.baseline}")
+    elif failed:
+        print(f"Регрессий: {failed}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
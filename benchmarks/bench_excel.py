@@ -0,0 +1,121 @@
+"""
+Экспорт отчета Excel: прежний Workbook с автошириной по всем ячейкам против
+потокового ExcelReport (openpyxl write_only).
+
+Каждый замер идет в отдельном процессе, чтобы пик RSS относился только к нему.
+
+Запуск:
+    python benchmarks/bench_excel.py [--sizes 10000 50000 200000] [--skip-legacy]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def legacy_export(filename, products, analytics):
+    """Прежний export_to_excel без диалогов: все ячейки в памяти, ширина - второй проход"""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+
+    def style_header(ws, count, color):
+        for col in range(1, count + 1):
+            ws.cell(1, col).font = Font(bold=True, color="FFFFFF")
+            ws.cell(1, col).fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+            ws.cell(1, col).alignment = Alignment(horizontal='center', vertical='center')
+
+    def auto_width(ws, limit):
+        for col in ws.columns:
+            max_length = 0
+            column = col[0].column_letter
+            for cell in col:
+                if len(str(cell.value)) > max_length:
+                    max_length = len(str(cell.value))
+            ws.column_dimensions[column].width = min(max_length + 2, limit)
+
+    wb = Workbook()
+    ws1 = wb.active
+    ws1.title = "Товары"
+    ws1.append(["Название", "Категория", "Цена", "Продажи", "Оборот", "Ссылка"])
+    style_header(ws1, 6, "667eea")
+    for p in products:
+        ws1.append([p['name'], p.get('category', ''), p['price'], p['sales'], p['price'] * p['sales'], p['link']])
+    auto_width(ws1, 50)
+
+    ws2 = wb.create_sheet("Анализ ниш")
+    ws2.append(["Категория", "Конкуренты", "Ср. цена", "Ср. продажи", "Оборот", "Индекс", "Рекомендация"])
+    style_header(ws2, 7, "667eea")
+    for stat in analytics.get_category_stats():
+        ws2.append([stat['category'], stat['competitors'], round(stat['avg_price'], 2), round(stat['avg_sales'], 0),
+                    round(stat['total_revenue'], 0), round(stat['attractiveness'], 2), stat['recommendation']])
+    auto_width(ws2, 40)
+
+    ws3 = wb.create_sheet("ТОП-10")
+    ws3.append(["Название", "Категория", "Цена", "Продажи", "Оборот"])
+    style_header(ws3, 5, "27ae60")
+    for p in analytics.get_top_products():
+        ws3.append([p['name'], p.get('category', ''), p['price'], p['sales'], p['revenue']])
+    auto_width(ws3, 50)
+    wb.save(filename)
+
+
+def worker(mode, size, path):
+    from core import AnalyticsEngine, ExcelReport
+    from bench_analytics import make_products
+
+    products = make_products(size)
+    analytics = AnalyticsEngine(products)
+    analytics.get_category_stats()
+    analytics.get_top_products()
+    base_rss = peak_rss_mb()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == 'legacy':
+            legacy_export(path, products, analytics)
+        else:
+            ExcelReport.from_analytics(products, analytics).write(path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'seconds': elapsed, 'rss_delta': peak_rss_mb() - base_rss, 'bytes': os.path.getsize(path)}))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 200000])
+    ap.add_argument('--skip-legacy', action='store_true')
+    ap.add_argument('--worker', nargs=3, metavar=('MODE', 'SIZE', 'PATH'), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        mode, size, path = args.worker
+        worker(mode, int(size), path)
+        return
+
+    modes = ['stream'] if args.skip_legacy else ['legacy', 'stream']
+    print(f"{'товаров':>9}{'режим':>9}{'время, с':>10}{'прирост RSS, МБ':>17}{'файл, МБ':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            for mode in modes:
+                path = os.path.join(tmp, f"{mode}_{size}.xlsx")
+                out = subprocess.run([sys.executable, __file__, '--worker', mode, str(size), path],
+                                     capture_output=True, text=True, check=True)
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                print(f"{size:>9}{mode:>9}{r['seconds']:>10.1f}{r['rss_delta']:>17.0f}{r['bytes'] / 2**20:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Машиночитаемая выгрузка ProductExporter (Parquet, Feather, CSV пачками)
+против потокового отчета Excel на тех же товарах.
+
+Каждый замер идет в отдельном процессе, чтобы пик RSS относился только к нему.
+Заодно проверяется, что Parquet и CSV читаются обратно без потерь.
+
+Запуск:
+    python benchmarks/bench_export.py [--sizes 10000 50000 200000]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+FORMATS = ['xlsx', 'parquet', 'feather', 'csv']
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def worker(fmt, size, path):
+    from core import AnalyticsEngine, ExcelReport, ProductExporter
+    from bench_analytics import make_products
+
+    products = make_products(size)
+    analytics = AnalyticsEngine(products)
+    analytics.get_category_stats()
+    base_rss = peak_rss_mb()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if fmt == 'xlsx':
+            ExcelReport.from_analytics(products, analytics).write(path)
+        else:
+            ProductExporter(products, analytics).write_products(path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'seconds': elapsed, 'rss_delta': peak_rss_mb() - base_rss, 'bytes': os.path.getsize(path)}))
+
+
+def check_roundtrip(tmp):
+    import pandas as pd
+    from core import ProductExporter
+    from bench_analytics import make_products
+
+    products = make_products(1000)
+    for ext in ('parquet', 'csv'):
+        path = os.path.join(tmp, f"check.{ext}")
+        ProductExporter(products).write_products(path)
+        frame = pd.read_parquet(path) if ext == 'parquet' else pd.read_csv(path, keep_default_na=False)
+        assert len(frame) == len(products)
+        assert frame['link'].tolist() == [p['link'] for p in products]
+        assert abs(frame['revenue'].sum() - sum(p['price'] * p['sales'] for p in products)) < 1e-3
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 200000])
+    ap.add_argument('--formats', nargs='+', default=FORMATS, choices=FORMATS)
+    ap.add_argument('--worker', nargs=3, metavar=('FORMAT', 'SIZE', 'PATH'), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        fmt, size, path = args.worker
+        worker(fmt, int(size), path)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_roundtrip(tmp)
+        print(f"{'товаров':>9}{'формат':>9}{'время, с':>10}{'прирост RSS, МБ':>17}{'файл, МБ':>10}")
+        for size in args.sizes:
+            for fmt in args.formats:
+                path = os.path.join(tmp, f"{size}.{fmt}")
+                out = subprocess.run([sys.executable, __file__, '--worker', fmt, str(size), path],
+                                     capture_output=True, text=True, check=True)
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                print(f"{size:>9}{fmt:>9}{r['seconds']:>10.2f}{r['rss_delta']:>17.0f}{r['bytes'] / 2**20:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
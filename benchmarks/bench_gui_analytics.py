@@ -0,0 +1,112 @@
+"""
+Показ итогов парсинга в окне: прежний расчет аналитики и отчета в потоке
+интерфейса против AnalyticsTask в пуле потоков.
+
+Перед замером во временную базу пишутся два снимка тех же товаров с
+разницей в сутки, так что расчет включает и скорость продаж по истории.
+Для каждого варианта меряется время до появления аналитики в окне и самая
+долгая блокировка цикла событий (UiBlockMonitor с тиком 5 мс). В пуле
+остается блокировка от сброса модели таблицы товаров на сотни тысяч строк.
+Результаты обоих вариантов сверяются: статистика ниш и HTML отчета должны
+совпасть.
+
+Запуск:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_gui_analytics.py [--sizes 10000 100000 300000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Окно при создании читает историю снимков - замер не трогает базу пользователя
+DB_DIR = tempfile.mkdtemp()
+os.environ['PRODUCT_PARSER_DB'] = os.path.join(DB_DIR, 'history.db')
+
+from gui import QApplication, AnalyticsTask, MainWindow, UiBlockMonitor, get_snapshot_store  # noqa: E402
+from bench_analytics import make_products  # noqa: E402
+
+
+def wait(app, window, settle=0.1):
+    """Обработка событий, пока аналитика не подставлена, и еще settle секунд"""
+    while window.analytics_task is not None:
+        app.processEvents()
+        time.sleep(0.001)
+    end = time.perf_counter()
+    while time.perf_counter() - end < settle:
+        app.processEvents()
+        time.sleep(0.001)
+    return end
+
+
+def with_history(products):
+    """Номер снимка товаров, у которого есть снимок на сутки раньше с меньшими продажами"""
+    store = get_snapshot_store()
+    now = time.time()
+    store.save([dict(p, sales=p['sales'] * 9 // 10) for p in products], 'bench', created_at=now - 86400)
+    return store.save(products, 'bench', created_at=now)
+
+
+def in_gui_thread(app, window, products, snapshot_id):
+    """Прежний порядок: весь расчет прямо в обработчике потока интерфейса"""
+    monitor = UiBlockMonitor(tick_ms=5, warn_ms=10)
+    app.processEvents()
+    start = time.perf_counter()
+    window.products = products
+    window.product_model.set_products(products)
+    window.analytics_generation += 1
+    window.analytics_status = "✅"
+    task = window.analytics_task = AnalyticsTask(products, snapshot_id, window.analytics_generation)
+    task.signals.finished.connect(window.apply_analytics)
+    task.run()
+    end = wait(app, window)
+    monitor.deleteLater()
+    return end - start, monitor.worst
+
+
+def in_pool(app, window, products, snapshot_id):
+    monitor = UiBlockMonitor(tick_ms=5, warn_ms=10)
+    app.processEvents()
+    start = time.perf_counter()
+    window.show_results(products, snapshot_id)
+    end = wait(app, window)
+    monitor.deleteLater()
+    return end - start, monitor.worst
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 300000])
+    args = ap.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            window = MainWindow()
+            window.show()
+        print(f"{'товаров':>9}{'в потоке GUI, с':>17}{'блокировка, мс':>16}{'в пуле, с':>11}{'блокировка, мс':>16}")
+        for n in args.sizes:
+            products = make_products(n)
+            snapshot_id = with_history(products)
+            with contextlib.redirect_stdout(io.StringIO()):
+                sync_time, sync_block = in_gui_thread(app, window, products, snapshot_id)
+                sync_stats = window.category_model.stats
+                sync_html = window.opportunities_text.toHtml()
+                pool_time, pool_block = in_pool(app, window, products, snapshot_id)
+            assert window.category_model.stats == sync_stats, "статистика ниш отличается"
+            assert window.opportunities_text.toHtml() == sync_html, "отчет отличается"
+            print(f"{n:>9}{sync_time:>17.2f}{sync_block:>16.0f}{pool_time:>11.2f}{pool_block:>16.0f}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            window.close()
+    finally:
+        shutil.rmtree(DB_DIR, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""
+Отбор повторов по нормализованной ссылке и группы одного товара на ggsel и
+plati (identity.ProductIdentityIndex).
+
+Синтетический каталог: базовые товары (игра, издание, платформа, регион)
+предлагаются несколькими продавцами на обеих площадках с шумом в названиях -
+регистр, знаки, слова вроде «ключ» и «купить», римские и арабские цифры.
+Рядом лежат похожие, но другие товары: продолжения, издания и версии для
+других платформ той же игры. Изредка в название попадает постороннее слово.
+Часть карточек повторена с другими вариантами ссылки (метки партнерок,
+слайдер, ссылка из API plati).
+
+Проверяется:
+  - повторы по ссылке убираются все, а разные предложения не склеиваются;
+  - на небольшом каталоге группы совпадают с полным перебором всех пар
+    названий с той же мерой Жаккара (LSH ничего не теряет);
+  - точность и полнота групп по парам относительно настоящих товаров;
+  - время построения растет почти линейно с числом предложений.
+При расхождении код выхода 1.
+
+Запуск:
+    python benchmarks/bench_identity.py [--sizes 10000 50000 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from itertools import combinations
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import merge_products  # noqa: E402
+from identity import TITLE_SIMILARITY, ProductIdentityIndex, similar, title_tokens  # noqa: E402
+
+SYLLABLES = ['ka', 'ro', 'mi', 'ten', 'dar', 'vel', 'sho', 'gan', 'lu', 'rex', 'pra', 'zo', 'fin', 'tor', 'el']
+EDITIONS = ['', '', 'Deluxe Edition', 'Gold Edition', 'Ultimate Edition']
+PLATFORMS = ['Steam', 'Steam', 'Xbox', 'PS5', 'EA App']
+REGIONS = {'': [''], 'RU': ['RU', 'РФ', 'Россия'], 'Global': ['Global', 'GLOBAL', 'Worldwide'], 'TR': ['TR', 'Турция']}
+FILLERS = ['ключ', 'Ключ активации', 'купить', '| Key', 'лицензия', 'моментально', 'KEY', 'PC']
+NOISE = ['скидка', 'лучшая цена', 'new', 'бонус']    # слова не из списков identity - из-за них полнота < 1
+ROMAN = {2: 'II', 3: 'III', 4: 'IV', 5: 'V'}
+
+
+def make_games(count, rnd):
+    games = set()
+    while len(games) < count:
+        words = [''.join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 3))).capitalize()
+                 for _ in range(rnd.randint(1, 3))]
+        games.add(' '.join(words))
+    return sorted(games)
+
+
+def base_products(count, rnd):
+    """(название, номер части или None, издание, платформа, регион); продолжения - отдельные товары"""
+    bases = []
+    for game in make_games(count // 3 + 1, rnd):
+        parts = [None] if rnd.random() < 0.6 else [None, 2, 3][:rnd.randint(2, 3)]
+        for part in parts:
+            bases.append((game, part, rnd.choice(EDITIONS), rnd.choice(PLATFORMS), rnd.choice(list(REGIONS))))
+    rnd.shuffle(bases)
+    return bases[:count]
+
+
+def noisy_title(base, rnd):
+    game, part, edition, platform, region = base
+    words = [game.upper() if rnd.random() < 0.2 else game]
+    if part:
+        words.append(ROMAN[part] if rnd.random() < 0.5 else str(part))
+    if edition:
+        words.append(edition)
+    words.append(rnd.choice([platform, f"({platform})", f"[{platform}]"]))
+    if region:
+        words.append(rnd.choice(REGIONS[region]))
+    if rnd.random() < 0.6:
+        words.insert(rnd.choice([0, len(words)]), rnd.choice(FILLERS))
+    if rnd.random() < 0.05:
+        words.append(rnd.choice(NOISE))
+    return ' '.join(words)
+
+
+def make_catalog(offers, seed=11):
+    """(товары, номер базового товара для каждого, число добавленных повторов ссылок)"""
+    rnd = random.Random(seed)
+    bases = base_products(max(offers // 8, 1), rnd)
+    products, truth = [], []
+    for i in range(offers):
+        b = rnd.randrange(len(bases))
+        if i % 2:
+            link = f"https://ggsel.net/catalog/product/{bases[b][0].lower().replace(' ', '-')}-{1000000 + i}"
+        else:
+            link = f"https://plati.market/itm/{bases[b][0].lower().replace(' ', '-')}/{3000000 + i}"
+        products.append({'name': noisy_title(bases[b], rnd), 'price': float(rnd.randint(100, 5000)),
+                         'sales': rnd.randint(0, 500), 'link': link, 'category': ''})
+        truth.append(b)
+
+    # Повторы тех же предложений с другими вариантами ссылки
+    repeats = []
+    for p in rnd.sample(products, len(products) // 10):
+        link = p['link']
+        if 'plati' in link:
+            link = rnd.choice([link + '?ai=123456', f"https://plati.market/itm/{link.rsplit('/', 1)[1]}",
+                               link.replace('plati.market', 'www.plati.market') + '/'])
+        else:
+            link = rnd.choice([link + '?from=slider', link.replace('ggsel.net', 'ggsel.com'), link + '/#reviews'])
+        repeats.append(dict(p, link=link))
+    return products, truth, repeats
+
+
+def pair_counts(labels, truth):
+    """(пар в одной группе, пар одного товара, общих пар)"""
+    def pairs(counts):
+        return int((counts * (counts - 1) // 2).sum())
+
+    labels, truth = np.asarray(labels), np.asarray(truth)
+    joint = labels * (truth.max() + 1) + truth
+    return (pairs(np.unique(labels, return_counts=True)[1]), pairs(np.unique(truth, return_counts=True)[1]),
+            pairs(np.unique(joint, return_counts=True)[1]))
+
+
+def brute_force(products, threshold):
+    """Группы полным перебором пар различных названий"""
+    titles = {}
+    title_of = [titles.setdefault(title_tokens(p['name']), len(titles)) for p in products]
+    sets = list(titles)
+    parent = list(range(len(sets)))
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for i, j in combinations(range(len(sets)), 2):
+        if similar(sets[i], sets[j], threshold):
+            parent[max(find(i), find(j))] = min(find(i), find(j))
+    return [find(t) for t in title_of]
+
+
+def same_partition(a, b):
+    _, a = np.unique(a, return_inverse=True)
+    _, b = np.unique(b, return_inverse=True)
+    return len(np.unique(a * (b.max() + 1) + b)) == len(np.unique(a)) == len(np.unique(b))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 100000], help="предложений в каталоге")
+    ap.add_argument('--exact', type=int, default=3000, help="предложений для сверки с полным перебором")
+    args = ap.parse_args()
+    failed = 0
+
+    products, truth, repeats = make_catalog(args.exact)
+    merged = merge_products([products, repeats])
+    ok = len(merged) == len(products)
+    failed += not ok
+    print(f"Повторы ссылок: {len(repeats)} из {len(products) + len(repeats)} карточек, "
+          f"после отбора {len(merged)}{'' if ok else '  ОШИБКА'}")
+
+    index = ProductIdentityIndex(products)
+    ok = same_partition(index.group_ids, brute_force(products, TITLE_SIMILARITY))
+    failed += not ok
+    print(f"Сверка с полным перебором на {len(products)} предложениях: {'совпадает' if ok else 'ОШИБКА'}")
+    print()
+
+    print(f"{'предложений':>12}{'названий':>10}{'проверено пар':>15}{'время, с':>10}{'мкс/предл.':>12}"
+          f"{'групп':>8}{'точность':>10}{'полнота':>9}{'на 2 площадках':>16}")
+    for n in args.sizes:
+        products, truth, _ = make_catalog(n)
+        start = time.perf_counter()
+        index = ProductIdentityIndex(products)
+        rows = index.cross_site()
+        elapsed = time.perf_counter() - start
+        predicted, actual, common = pair_counts(index.group_ids, truth)
+        precision = common / predicted if predicted else 1.0
+        recall = common / actual if actual else 1.0
+        print(f"{n:>12}{index.titles:>10}{index.candidates:>15}{elapsed:>10.2f}{elapsed / n * 1e6:>12.1f}"
+              f"{index.group_ids.max() + 1:>8}{precision:>10.3f}{recall:>9.3f}{len(rows):>16}")
+
+    if failed:
+        print(f"Ошибок: {failed}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Обход каталогов с большими страницами: разбор в потоках загрузки против
+разбора в пуле процессов ParsePool.
+
+Локальный сервер отдает страницы ggsel на тысячи карточек (мегабайты
+разметки) с небольшой задержкой ответа. При разборе в потоках lxml держит
+GIL, и загрузка следующих страниц ждет; с ParsePool разбор идет в других
+процессах на всех ядрах. Замер для пакетного режима (HttpFetcher в потоках)
+и для асинхронного AsyncCatalogFetcher. Пул процессов создается до замера:
+запуск интерпретаторов методом spawn - разовая цена, не зависящая от обхода.
+Все варианты обязаны вернуть одинаковые товары.
+
+Запуск:
+    python benchmarks/bench_parse_pool.py [--catalogs 8] [--pages 3] [--cards 5000] [--latency 0.05]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from async_http import AsyncCatalogFetcher  # noqa: E402
+from bench_async import start_server  # noqa: E402
+from core import PARSE_PROCESSES, HttpFetcher, ParsePool, create_http_session, create_parser, merge_products  # noqa: E402
+from fixtures import ggsel_page  # noqa: E402
+
+
+def threaded(urls, workers, parse_pool=None):
+    local = threading.local()
+
+    def fetch(url):
+        if not hasattr(local, 'session'):
+            local.session = create_http_session()
+        return HttpFetcher(create_parser(max_items=0), session=local.session, parse_pool=parse_pool).fetch(url)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return merge_products(list(executor.map(fetch, urls)))
+
+
+def run_async(urls, workers, parse_pool=None):
+    results = AsyncCatalogFetcher(max_items=0, per_host=workers, parse_pool=parse_pool).fetch_all(urls)
+    errors = [r for r in results.values() if isinstance(r, Exception)]
+    if errors:
+        raise errors[0]
+    return merge_products(results[url] for url in urls)
+
+
+def warm_up(parse_pool, workers):
+    """
+    Запуск всех процессов пула и импорт core в них до замера. Процессы
+    наследуют stdout на момент запуска - их сообщения о разборе уходят в никуда.
+    """
+    parser = create_parser(max_items=0)
+    page = ggsel_page(2000, seed=1)
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        futures = [parse_pool.submit(parser, page, 'https://ggsel.net/catalog/warm') for _ in range(workers)]
+        for future in futures:
+            future.result()
+    finally:
+        os.dup2(saved, 1)
+        os.close(saved)
+        os.close(devnull)
+    parse_pool.remote = parse_pool.local = parse_pool.bytes_sent = 0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--catalogs', type=int, default=8)
+    ap.add_argument('--pages', type=int, default=3)
+    ap.add_argument('--cards', type=int, default=5000, help="карточек на странице")
+    ap.add_argument('--latency', type=float, default=0.05, help="задержка ответа сервера, сек")
+    ap.add_argument('--workers', type=int, default=4, help="потоков загрузки (запросов к хосту)")
+    ap.add_argument('--processes', type=int, default=PARSE_PROCESSES, help="процессов разбора")
+    args = ap.parse_args()
+
+    server = start_server(args.pages, args.cards, args.latency)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/ggsel/catalog/{i}" for i in range(args.catalogs)]
+
+    print(f"{args.catalogs} каталогов x {args.pages} стр. x {args.cards} карточек, задержка {args.latency * 1000:.0f} мс, "
+          f"потоков {args.workers}, процессов {args.processes} (ядер {os.cpu_count()})")
+    print(f"{'вариант':<26}{'время, с':>10}{'товаров':>9}{'в процессах':>13}{'сжато, МБ':>11}")
+    reference = None
+    with ParsePool(args.processes) as parse_pool:
+        warm_up(parse_pool, args.processes)
+        variants = [
+            ("потоки, разбор в потоке", lambda: threaded(urls, args.workers), None),
+            ("потоки + ParsePool", lambda: threaded(urls, args.workers, parse_pool), parse_pool),
+            ("async, разбор в потоке", lambda: run_async(urls, args.workers), None),
+            ("async + ParsePool", lambda: run_async(urls, args.workers, parse_pool), parse_pool),
+        ]
+        for title, run, pool in variants:
+            parse_pool.remote = parse_pool.bytes_sent = 0
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                products = run()
+            elapsed = time.perf_counter() - start
+            rows = sorted((p['link'], p['name'], p['price'], p['sales']) for p in products)
+            if reference is None:
+                reference = rows
+            assert rows == reference, f"{title}: товары отличаются от разбора в потоке"
+            remote = f"{pool.remote}" if pool else '-'
+            sent = f"{pool.bytes_sent / 2**20:.1f}" if pool else '-'
+            print(f"{title:<26}{elapsed:>10.2f}{len(products):>9}{remote:>13}{sent:>11}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Сравнение скорости разбора карточек: BeautifulSoup (ProductParser) и lxml (LxmlProductParser).
+
+Запуск:
+    python benchmarks/bench_parsers.py                    # синтетические страницы
+    python benchmarks/bench_parsers.py page.html --url https://ggsel.net/catalog/...
+
+Перед замером проверяется, что оба парсера возвращают одинаковые товары.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ProductParser, LxmlProductParser  # noqa: E402
+from fixtures import ggsel_page, plati_page, generic_page  # noqa: E402
+
+
+def timed(parser, html, url, repeat):
+    best = float('inf')
+    products = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            products = parser.parse_html(html, url)
+            best = min(best, time.perf_counter() - start)
+    return best, products
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('files', nargs='*', help='сохраненные HTML-страницы')
+    ap.add_argument('--url', default='', help='адрес, по которому выбирается парсер для файлов')
+    ap.add_argument('--repeat', type=int, default=5)
+    args = ap.parse_args()
+
+    if args.files:
+        cases = []
+        for path in args.files:
+            with open(path, encoding='utf-8') as f:
+                cases.append((os.path.basename(path), args.url or path, f.read()))
+    else:
+        cases = [
+            ('ggsel, 500 карточек', 'https://ggsel.net/catalog/keys', ggsel_page(500)),
+            ('plati, 300 карточек', 'https://plati.market/search/game', plati_page(300)),
+            ('generic, 50 карточек', 'https://shop.example/catalog', generic_page(50)),
+        ]
+
+    print(f"{'страница':<28}{'товаров':>9}{'bs4, мс':>12}{'lxml, мс':>12}{'ускорение':>12}")
+    for name, url, html in cases:
+        bs_time, bs_products = timed(ProductParser(), html, url, args.repeat)
+        lx_time, lx_products = timed(LxmlProductParser(), html, url, args.repeat)
+        if bs_products != lx_products:
+            print(f"{name}: результаты различаются ({len(bs_products)} против {len(lx_products)})")
+            sys.exit(1)
+        print(f"{name:<28}{len(lx_products):>9}{bs_time * 1000:>12.1f}{lx_time * 1000:>12.1f}"
+              f"{bs_time / lx_time:>11.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Скорость хранилища снимков SnapshotStore: запись, загрузка снимка, запросы истории
+и расчет скорости продаж SalesVelocity по всем снимкам.
+
+Запуск:
+    python benchmarks/bench_snapshots.py [--products 100000] [--snapshots 10]
+
+База создается во временном каталоге и удаляется после замера.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import SnapshotStore, SalesVelocity  # noqa: E402
+from bench_analytics import make_products  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--products', type=int, default=100000)
+    ap.add_argument('--snapshots', type=int, default=10)
+    args = ap.parse_args()
+
+    products = make_products(args.products)
+    rnd = random.Random(11)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SnapshotStore(os.path.join(tmp, 'snapshots.db'))
+        day = 24 * 3600
+        start_time = time.time() - args.snapshots * day
+        save_times = []
+        for n in range(args.snapshots):
+            # Между снимками продажи растут, часть цен меняется
+            for p in products:
+                p['sales'] += rnd.randint(0, 3)
+                if rnd.random() < 0.05:
+                    p['price'] = round(p['price'] * rnd.uniform(0.9, 1.1), 2)
+            elapsed, snapshot_id = timed(lambda: store.save(products, ['https://ggsel.net/catalog/bench'], 'Все',
+                                                             created_at=start_time + n * day))
+            save_times.append(elapsed)
+
+        load_time, loaded = timed(lambda: store.load(snapshot_id))
+        assert len(loaded) == len(products) and loaded[0]['link'] == products[0]['link']
+        list_time, snapshots = timed(store.snapshots)
+        links = [p['link'] for p in rnd.sample(products, 100)]
+        history_time, histories = timed(lambda: [store.product_history(link) for link in links])
+        assert all(len(h) == args.snapshots for h in histories)
+        category_time, category = timed(lambda: store.category_history('Ключ'))
+        velocity_time, velocity = timed(lambda: SalesVelocity.from_store(store, snapshot_id, args.snapshots))
+        assert len(velocity) == len(products)
+        size = os.path.getsize(store.path)
+
+    print(f"товаров в снимке: {args.products}, снимков: {args.snapshots}, база: {size / 2**20:.0f} МБ")
+    print(f"запись снимка:            {min(save_times) * 1000:8.0f} мс (лучший), {max(save_times) * 1000:.0f} мс (худший)")
+    print(f"загрузка снимка:          {load_time * 1000:8.0f} мс")
+    print(f"список снимков:           {list_time * 1000:8.2f} мс")
+    print(f"история товара:           {history_time * 1000 / len(links):8.2f} мс на запрос")
+    print(f"история категории:        {category_time * 1000:8.0f} мс ({len(category)} точек)")
+    print(f"скорость продаж:          {velocity_time * 1000:8.0f} мс ({velocity.snapshots} снимков, "
+          f"{args.snapshots * args.products} строк)")
+
+
+if __name__ == '__main__':
+    main()
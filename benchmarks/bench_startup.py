@@ -0,0 +1,74 @@
+"""
+Время холодного запуска: сколько стоит импорт модулей приложения и какие
+тяжелые пакеты при этом загружаются.
+
+Замер по `python -X importtime` (сумма для модуля верхнего уровня) и полное
+время процесса, медиана по нескольким запускам. Для сравнения с прежней
+версией одним файлом передайте его через --baseline:
+
+    git show <коммит>:main.py > /tmp/old_main.py
+    python benchmarks/bench_startup.py --baseline /tmp/old_main.py
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ['PyQt6', 'matplotlib', 'selenium', 'pandas', 'openpyxl', 'xlsxwriter', 'bs4']
+TARGETS = [
+    ('core', "ядро"),
+    ('cli', "командная строка"),
+    ('gui', "окно"),
+]
+
+
+def import_time(module, cwd):
+    """(импорт по importtime в мс, время процесса в мс, загруженные тяжелые пакеты)"""
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))")
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen', PYTHONDONTWRITEBYTECODE='1')
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=cwd, env=env,
+                         capture_output=True, text=True, check=True)
+    wall = (time.perf_counter() - start) * 1000
+    total = 0
+    for line in out.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            total = int(parts[1]) / 1000
+    return total, wall, out.stdout.strip()
+
+
+def measure(module, cwd, runs):
+    results = [import_time(module, cwd) for _ in range(runs)]
+    return (statistics.median(r[0] for r in results), statistics.median(r[1] for r in results), results[-1][2])
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--runs', type=int, default=5)
+    ap.add_argument('--baseline', help="прежний main.py одним файлом")
+    args = ap.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.baseline:
+            shutil.copy(args.baseline, os.path.join(tmp, 'baseline_main.py'))
+            rows.append(("прежний main.py",) + measure('baseline_main', tmp, args.runs))
+        for module, title in TARGETS:
+            rows.append((title,) + measure(module, ROOT, args.runs))
+
+    print(f"{'модуль':<18}{'импорт, мс':>12}{'процесс, мс':>13}  тяжелые пакеты")
+    for title, imported, wall, heavy in rows:
+        print(f"{title:<18}{imported:>12.0f}{wall:>13.0f}  {heavy or '-'}")
+
+
+if __name__ == '__main__':
+    main()
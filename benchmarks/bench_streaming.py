@@ -0,0 +1,95 @@
+"""
+Пропускная способность и пиковая память при разборе категорий разного размера.
+
+Для каждого размера страница пишется во временный файл и разбирается в отдельном
+процессе двумя способами:
+    tree   - parse_html: дерево всей страницы и список всех товаров;
+    stream - iter_products + ProductStream(keep=False): разбор с освобождением
+             пройденных карточек и агрегацией пачками.
+
+Прирост RSS в режиме stream примерно равен размеру самого HTML: libxml2 держит
+входной буфер до конца разбора. Дерево и товары при этом не накапливаются.
+
+Запуск:
+    python benchmarks/bench_streaming.py [--sizes 300 3000 30000] [--site plati|ggsel]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+URLS = {'ggsel': 'https://ggsel.net/catalog/keys', 'plati': 'https://plati.market/search/game'}
+
+
+def peak_rss_mb():
+    # ru_maxrss в Linux - килобайты
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def worker(mode, site, path):
+    """Один замер в чистом процессе; результат - JSON в stdout"""
+    from core import LxmlProductParser, ProductStream
+
+    parser = LxmlProductParser(max_items=0)
+    base_rss = peak_rss_mb()
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == 'tree':
+            with open(path, encoding='utf-8') as f:
+                products = parser.parse_html(f.read(), URLS[site])
+            count = len(products)
+        else:
+            with open(path, 'rb') as f:
+                stream = ProductStream(keep=False).consume(parser.iter_products(f, URLS[site]))
+            count = stream.count
+
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'count': count, 'seconds': elapsed, 'rss_delta': peak_rss_mb() - base_rss}))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--sizes', type=int, nargs='+', default=[300, 3000, 30000])
+    ap.add_argument('--site', choices=list(URLS), default='plati')
+    ap.add_argument('--worker', nargs=3, metavar=('MODE', 'SITE', 'PATH'), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        worker(*args.worker)
+        return
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from fixtures import ggsel_page, plati_page
+    make_page = ggsel_page if args.site == 'ggsel' else plati_page
+
+    print(f"{'карточек':>9}{'размер, МБ':>12}{'режим':>8}{'товаров':>9}{'карт./с':>11}{'прирост RSS, МБ':>17}")
+    for size in args.sizes:
+        with tempfile.NamedTemporaryFile('w', suffix='.html', encoding='utf-8', delete=False) as f:
+            f.write(make_page(size))
+            path = f.name
+        try:
+            mb = os.path.getsize(path) / 1024 / 1024
+            for mode in ('tree', 'stream'):
+                out = subprocess.run([sys.executable, __file__, '--worker', mode, args.site, path],
+                                     capture_output=True, text=True, check=True, cwd=ROOT,
+                                     env={**os.environ, 'QT_QPA_PLATFORM': 'offscreen'})
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                print(f"{size:>9}{mb:>12.1f}{mode:>8}{r['count']:>9}{r['count'] / r['seconds']:>11.0f}"
+                      f"{r['rss_delta']:>17.1f}")
+        finally:
+            os.unlink(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Показ товаров в таблице: прежний QTableWidget с шестью QTableWidgetItem на строку
+против ProductTableModel, которая строит ячейки только для видимых строк.
+
+Запуск:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_table.py [--sizes 1000 10000 100000]
+
+Время включает заполнение и первую отрисовку окна. Прежний вариант для больших
+размеров можно пропустить флагом --skip-widget.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QTableWidget, QTableWidgetItem  # noqa: E402
+from gui import QApplication, QTableView, QHeaderView, QFont, QColor, Qt, ProductTableModel  # noqa: E402
+from bench_analytics import make_products  # noqa: E402
+
+
+def fill_widget(table, products):
+    """Прежнее заполнение: отдельные элементы, шрифты и цвета на каждую ячейку"""
+    table.setRowCount(len(products))
+    for i, product in enumerate(products):
+        revenue = product['price'] * product['sales']
+        cells = [
+            (product['name'], QFont("Arial", 11), None, False),
+            (product.get('category', ''), QFont("Arial", 11), None, True),
+            (f"{product['price']:.2f}", QFont("Arial", 11), None, True),
+            (str(product['sales']), QFont("Arial", 11, QFont.Weight.Bold),
+             QColor("#27ae60" if product['sales'] > 100 else "#f39c12" if product['sales'] > 50 else "#95a5a6"), True),
+            (f"{revenue:,.0f}", QFont("Arial", 11, QFont.Weight.Bold), QColor("#667eea"), True),
+            (product['link'], QFont("Arial", 10), QColor("#3498db"), False),
+        ]
+        for column, (text, font, color, centered) in enumerate(cells):
+            item = QTableWidgetItem(text)
+            item.setFont(font)
+            if color is not None:
+                item.setForeground(color)
+            if centered:
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            table.setItem(i, column, item)
+
+
+def setup_header(view):
+    header = view.horizontalHeader()
+    header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+    for column in range(1, 5):
+        header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+    header.setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
+    view.resize(1400, 800)
+
+
+def show(app, view):
+    view.show()
+    app.processEvents()
+    view.viewport().grab()
+
+
+def bench_widget(app, products):
+    table = QTableWidget()
+    table.setColumnCount(6)
+    setup_header(table)
+    start = time.perf_counter()
+    fill_widget(table, products)
+    show(app, table)
+    elapsed = time.perf_counter() - start
+    table.close()
+    return elapsed
+
+
+def bench_model(app, products):
+    view = QTableView()
+    model = ProductTableModel(view)
+    view.setModel(model)
+    view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    setup_header(view)
+    view.horizontalHeader().setResizeContentsPrecision(100)
+    start = time.perf_counter()
+    model.set_products(products)
+    show(app, view)
+    elapsed = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    model.sort(4, Qt.SortOrder.DescendingOrder)
+    show(app, view)
+    sort_time = time.perf_counter() - start
+    view.close()
+    return elapsed, sort_time
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    ap.add_argument('--skip-widget', action='store_true')
+    args = ap.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{'товаров':>9}{'QTableWidget, мс':>19}{'модель, мс':>13}{'сортировка, мс':>17}")
+    for n in args.sizes:
+        products = make_products(n)
+        widget = '-' if args.skip_widget else f"{bench_widget(app, products) * 1000:.0f}"
+        model_time, sort_time = bench_model(app, products)
+        print(f"{n:>9}{widget:>19}{model_time * 1000:>13.0f}{sort_time * 1000:>17.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Разбор цены и продаж общим токенизатором (parse_price, parse_sales) против
+прежних функций каждого сайта (legacy_numbers.py).
+
+Наносекунд на карточку (цена и продажи) на наборе текстов, как в карточках
+fixtures, для каждого сайта - прежний разбор, общий без кэша и общий с
+кэшем, очищаемым перед каждым проходом. Таблица известных форматов
+проверяется тестами: tests/test_tokenizer.py.
+
+Запуск:
+    python benchmarks/bench_tokenizer.py [--texts 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import parse_price, parse_sales  # noqa: E402
+from legacy_numbers import LEGACY  # noqa: E402
+
+
+def make_texts(n, seed=5):
+    """Тексты цены и продаж по сайтам в тех же форматах, что в fixtures"""
+    rnd = random.Random(seed)
+    texts = {'ggsel': [], 'plati': [], 'generic': []}
+    for i in range(n):
+        price = rnd.randint(49, 9999)
+        texts['ggsel'].append((
+            f"{price}\xa0₽" if i % 7 else f"~ {price + 10} = {price}\xa0₽",
+            rnd.choice([None, f"{rnd.randint(1, 999)} продаж", f"{rnd.randint(1, 99)} 000+ продаж",
+                        f"{rnd.randint(1, 9)}\xa0000 продаж"])))
+        texts['plati'].append((
+            f"{rnd.randint(10, 5000)},{rnd.randint(0, 99):02d} ₽",
+            rnd.choice([f"Продано {rnd.randint(1, 999)}", f"Продано {rnd.randint(1, 9)},{rnd.randint(1, 9)} тыс",
+                        "Продано менее 10", f"Продано {rnd.randint(1, 99)}+"])))
+        texts['generic'].append((f"{rnd.randint(100, 9999)} руб.", f"{rnd.randint(1, 999)} продаж"))
+    return texts
+
+
+def clear_cache():
+    parse_price.cache_clear()
+    parse_sales.cache_clear()
+
+
+def timed(price, sales, pairs, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        clear_cache()
+        start = time.perf_counter()
+        for price_text, sales_text in pairs:
+            price(price_text)
+            sales(sales_text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pairs) * 1e9
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--texts', type=int, default=100000, help="карточек на сайт для замера")
+    args = ap.parse_args()
+
+    print(f"{'сайт':<8}{'прежде, нс':>12}{'без кэша':>10}{'с кэшем':>9}{'ускорение':>11}{'расхождений':>13}")
+    for site, pairs in make_texts(args.texts).items():
+        legacy_price, legacy_sales = LEGACY[site]
+        old = timed(legacy_price, legacy_sales, pairs)
+        uncached = timed(parse_price.__wrapped__, parse_sales.__wrapped__, pairs)
+        new = timed(parse_price, parse_sales, pairs)
+        differ = sum(legacy_price(p) != parse_price(p) or legacy_sales(s) != parse_sales(s) for p, s in pairs)
+        print(f"{site:<8}{old:>12.0f}{uncached:>10.0f}{new:>9.0f}{old / new:>10.1f}x{differ:>13}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Корпус страниц для офлайн-проверки парсеров: синтетические страницы из
+fixtures (в том числе на 10 000+ карточек) и сохраненные с сайтов.
+
+Сохраненная страница - пара файлов в benchmarks/corpus/: <имя>.html и
+<имя>.json с адресом и числом карточек на момент записи. Если сайт сменит
+разметку (например, обфусцированные классы ProductCard_card__zjTV_), разбор
+старой записи не изменится, а свежая запись покажет, что карточек стало 0.
+
+Сейчас в репозитории только синтетические страницы, и baseline_corpus.json
+снят по ним: запись требует доступа к ggsel и plati, которого нет в среде
+сборки. Разметка fixtures повторяет классы и атрибуты, на которые опираются
+парсеры, но не остальную страницу сайта. Записанные страницы подхватываются
+автоматически: bench_corpus.py сверяет их число карточек с записанным при
+сохранении, а --save-baseline добавляет их в базовый замер.
+
+Запись страницы (нужна сеть):
+    python benchmarks/corpus.py record ggsel_steam https://ggsel.net/catalog/steam-keys
+    python benchmarks/bench_corpus.py --pages ggsel_steam --save-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import ggsel_page, plati_page, generic_page  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+# имя -> (адрес для выбора парсера, функция, возвращающая разметку)
+SYNTHETIC = {
+    'ggsel_main': ('https://ggsel.net', lambda: ggsel_page(60, main=True)),
+    'ggsel_category': ('https://ggsel.net/catalog/steam', lambda: ggsel_page(500)),
+    'plati': ('https://plati.market/search/steam', lambda: plati_page(300)),
+    'generic': ('https://shop.example/catalog', lambda: generic_page(50)),
+    'ggsel_10k': ('https://ggsel.net/catalog/steam', lambda: ggsel_page(10000, seed=10)),
+    'plati_10k': ('https://plati.market/search/steam', lambda: plati_page(10000, seed=20)),
+    'generic_10k': ('https://shop.example/catalog', lambda: generic_page(10000, seed=30)),
+}
+
+
+def recorded():
+    """Сохраненные страницы: имя -> (адрес, путь к html, карточек при записи)"""
+    pages = {}
+    if not os.path.isdir(CORPUS_DIR):
+        return pages
+    for filename in sorted(os.listdir(CORPUS_DIR)):
+        if not filename.endswith('.json'):
+            continue
+        name = filename[:-5]
+        with open(os.path.join(CORPUS_DIR, filename), encoding='utf-8') as f:
+            meta = json.load(f)
+        pages[name] = (meta['url'], os.path.join(CORPUS_DIR, name + '.html'), meta.get('cards'))
+    return pages
+
+
+def names():
+    return list(SYNTHETIC) + list(recorded())
+
+
+def recorded_cards(name):
+    """Число карточек, разобранных при записи страницы; None для синтетических"""
+    page = recorded().get(name)
+    return page[2] if page else None
+
+
+def load(name):
+    """(адрес, разметка) страницы корпуса"""
+    if name in SYNTHETIC:
+        url, make = SYNTHETIC[name]
+        return url, make()
+    url, path, _ = recorded()[name]
+    with open(path, encoding='utf-8') as f:
+        return url, f.read()
+
+
+def record(name, url):
+    """Загрузка страницы по HTTP и сохранение в корпус вместе с числом карточек"""
+    from core import create_http_session, create_parser
+
+    resp = create_http_session().get(url, timeout=30)
+    resp.raise_for_status()
+    with contextlib.redirect_stdout(io.StringIO()):
+        cards = len(create_parser(max_items=0).parse_html(resp.text, url))
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    with open(os.path.join(CORPUS_DIR, name + '.html'), 'w', encoding='utf-8') as f:
+        f.write(resp.text)
+    with open(os.path.join(CORPUS_DIR, name + '.json'), 'w', encoding='utf-8') as f:
+        json.dump({'url': url, 'cards': cards}, f, ensure_ascii=False, indent=2)
+    return cards
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = ap.add_subparsers(dest='command', required=True)
+    rec = commands.add_parser('record', help="сохранить страницу с сайта")
+    rec.add_argument('name')
+    rec.add_argument('url')
+    commands.add_parser('list', help="страницы корпуса")
+    args = ap.parse_args()
+
+    if args.command == 'record':
+        print(f"{args.name}: карточек {record(args.name, args.url)}")
+    else:
+        for name in names():
+            url, html = load(name)
+            print(f"{name:<18}{len(html) / 1024:>9.0f} КБ  {url}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Синтетические страницы ggsel, plati и произвольного магазина для бенчмарков"""
+
+import random
+
+CATEGORIES = ["Ключ", "Гифт", "DLC", "Пополнение"]
+GAMES = ["Cyberpunk 2077", "Elden Ring", "Minecraft", "GTA V", "Red Dead Redemption 2",
+         "Baldur's Gate 3", "Hogwarts Legacy", "Steam Wallet", "The Witcher 3", "Hades II"]
+
+
+def _ggsel_card(i, rnd):
+    price = rnd.randint(49, 9999)
+    sales = rnd.choice(["", f"{rnd.randint(1, 999)}", f"{rnd.randint(1, 99)} 000+", f"{rnd.randint(1, 9)}\xa0000"])
+    counter = f'<div data-testid="card-counter">{sales} продаж</div>' if sales else ''
+    price_text = f"{price}\xa0₽" if i % 7 else f"~ {price + 10} = {price}\xa0₽"
+    return (
+        '<div class="ProductCard_card__zjTV_ ProductCard_hover__1a2B3">'
+        f'<a data-testid="card-link" href="/catalog/product/{100000 + i}">'
+        '<div class="ProductCard_image__Qw12e"><img src="/img.webp" alt="">'
+        '<svg width="16" height="16"><path d="M0 0h16v16H0z"></path></svg></div></a>'
+        '<div class="ProductCard_body__Zx98y">'
+        f'<div data-testid="card-category">{CATEGORIES[i % len(CATEGORIES)]}</div>'
+        f'<span class="ProductCard_description__AXXxp">{rnd.choice(GAMES)} #{i}</span>'
+        f'<div data-testid="card-price">{price_text}</div>'
+        f'{counter}'
+        f'<a data-testid="card-button" href="/catalog/product/{100000 + i}"><span>Купить</span></a>'
+        '</div></div>'
+    )
+
+
+def ggsel_page(n, seed=1, main=False, start=0):
+    """
+    Страница каталога ggsel с n карточками и блоком рекомендаций, который парсер пропускает.
+    start - номер первой карточки: разные страницы одного каталога не повторяют ссылки
+    """
+    rnd = random.Random(seed)
+    cards = ''.join(_ggsel_card(start + i, rnd) for i in range(n))
+    recommended = ''.join(_ggsel_card(start + n + i, rnd) for i in range(12))
+    slider = ''
+    if main:
+        slider = ('<div class="swiper"><div class="swiper-wrapper">'
+                  + ''.join(f'<div class="swiper-slide">{_ggsel_card(n + 100 + i, rnd)}</div>' for i in range(20))
+                  + '</div><button class="swiper-button-next" aria-label="Next slide"></button></div>')
+    return (
+        '<!DOCTYPE html><html lang="ru"><head><meta charset="utf-8"><title>GGSEL</title>'
+        '<script>window.__INITIAL__ = {};</script></head><body><div id="__next">'
+        '<header class="Header_header__x1"><nav><a href="/">GGSEL</a></nav></header>'
+        f'<main>{slider}<div class="Catalog_grid__9kL2m">{cards}</div>'
+        '<button data-test="showMore">Показать ещё</button>'
+        f'<div class="BottomGoods_cards__5r9XZ">{recommended}</div></main>'
+        '<footer>© GGSEL</footer></div></body></html>'
+    )
+
+
+def _plati_card(i, rnd, hidden=False):
+    price = f"{rnd.randint(10, 5000)},{rnd.randint(0, 99):02d}"
+    sold = rnd.choice([f"Продано {rnd.randint(1, 999)}", f"Продано {rnd.randint(1, 9)},{rnd.randint(1, 9)} тыс",
+                       "Продано менее 10", f"Продано {rnd.randint(1, 99)}+", "Продано 1,2 млн"])
+    wrapper = 'col d-none' if hidden else 'col'
+    return (
+        f'<div class="{wrapper}"><a class="card card-hover" href="/itm/{rnd.choice(GAMES).lower().replace(" ", "-")}/{3000000 + i}">'
+        '<div class="card-image"><img src="/img.jpg" alt=""></div>'
+        '<div class="card-body">'
+        f'<p class="custom-link"><span class="footnote-medium">{rnd.choice(GAMES)} ключ #{i}</span></p>'
+        f'<span class="title-bold">{price} ₽</span>'
+        f'<span class="footnote-regular">{sold}</span>'
+        '</div></a></div>'
+    )
+
+
+def plati_page(n, seed=2):
+    """Страница поиска plati с n карточками, скрытыми карточками и исключаемыми блоками"""
+    rnd = random.Random(seed)
+    cards = ''.join(_plati_card(i, rnd, hidden=(i % 50 == 49)) for i in range(n))
+    excluded = ''.join(_plati_card(n + i, rnd) for i in range(8))
+    return (
+        '<!DOCTYPE html><html lang="ru"><head><meta charset="utf-8"><title>Plati.market</title></head><body>'
+        f'<section class="suggestion">{excluded}</section>'
+        f'<div class="best-offer-slider">{excluded}</div>'
+        f'<div class="row goods-list">{cards}</div>'
+        f'<div id="rec_wrapper">{excluded}</div>'
+        f'<div id="hist_wrapper">{excluded}</div>'
+        '</body></html>'
+    )
+
+
+def generic_page(n, seed=3):
+    """Страница произвольного магазина с классами product-*"""
+    rnd = random.Random(seed)
+    items = ''.join(
+        '<li class="product-card">'
+        f'<h3 class="product-title">{rnd.choice(GAMES)} #{i}</h3>'
+        f'<span class="price-value">{rnd.randint(100, 9999)} руб.</span>'
+        f'<span>{rnd.randint(1, 500)} продаж</span>'
+        f'<a href="/p/{i}">Подробнее</a>'
+        '</li>'
+        for i in range(n)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Shop</title></head><body>'
+        f'<ul class="catalog">{items}</ul></body></html>'
+    )
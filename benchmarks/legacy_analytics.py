@@ -0,0 +1,200 @@
+"""Исходная реализация аналитики циклами по списку словарей"""
+
+from collections import defaultdict
+
+
+class LegacyAnalyticsEngine:
+    """Прежний AnalyticsEngine на списке словарей - эталон для сравнения результатов и скорости"""
+    
+    def __init__(self, products):
+        self.products = products
+        self.categories = self._group_by_category()
+        
+    def _group_by_category(self):
+        """Группировка товаров по категориям"""
+        categories = defaultdict(list)
+        for p in self.products:
+            cat = p.get('category', 'Без категории')
+            if not cat:
+                cat = 'Без категории'
+            categories[cat].append(p)
+        return dict(categories)
+    
+    def get_category_stats(self):
+        """Статистика по каждой категории"""
+        stats = []
+        
+        for cat_name, items in self.categories.items():
+            if not items:
+                continue
+                
+            prices = [p['price'] for p in items]
+            sales = [p['sales'] for p in items]
+            revenues = [p['price'] * p['sales'] for p in items]
+            
+            avg_price = sum(prices) / len(prices)
+            avg_sales = sum(sales) / len(sales)
+            total_revenue = sum(revenues)
+            competitors = len(items)
+            
+            # Индекс привлекательности: (средние продажи × средняя цена) / конкуренты
+            if competitors > 0:
+                attractiveness = (avg_sales * avg_price) / competitors
+            else:
+                attractiveness = 0
+            
+            # Определение уровня конкуренции
+            if competitors < 20:
+                competition_level = "Низкая"
+                competition_color = "#27ae60"
+            elif competitors < 50:
+                competition_level = "Средняя"
+                competition_color = "#f39c12"
+            else:
+                competition_level = "Высокая"
+                competition_color = "#e74c3c"
+            
+            # Определение спроса
+            if avg_sales > 500:
+                demand_level = "Высокий"
+                demand_color = "#27ae60"
+            elif avg_sales > 100:
+                demand_level = "Средний"
+                demand_color = "#f39c12"
+            else:
+                demand_level = "Низкий"
+                demand_color = "#e74c3c"
+            
+            # Оценка привлекательности (0-10)
+            score = 0
+            # Спрос (+4 балла)
+            if avg_sales > 500:
+                score += 4
+            elif avg_sales > 100:
+                score += 2
+            
+            # Конкуренция (+3 балла за низкую)
+            if competitors < 20:
+                score += 3
+            elif competitors < 50:
+                score += 1.5
+            
+            # Средний чек (+3 балла)
+            if avg_price > 500:
+                score += 3
+            elif avg_price > 200:
+                score += 1.5
+            
+            # Рекомендация
+            if score >= 7:
+                recommendation = "ВХОДИТЬ 🚀"
+                rec_color = "#27ae60"
+            elif score >= 4:
+                recommendation = "ИЗУЧИТЬ 🔍"
+                rec_color = "#f39c12"
+            else:
+                recommendation = "НЕ ВХОДИТЬ ⛔"
+                rec_color = "#e74c3c"
+            
+            stats.append({
+                'category': cat_name,
+                'competitors': competitors,
+                'avg_price': avg_price,
+                'avg_sales': avg_sales,
+                'total_revenue': total_revenue,
+                'attractiveness': attractiveness,
+                'competition_level': competition_level,
+                'competition_color': competition_color,
+                'demand_level': demand_level,
+                'demand_color': demand_color,
+                'score': score,
+                'recommendation': recommendation,
+                'rec_color': rec_color
+            })
+        
+        # Сортировка по индексу привлекательности
+        stats.sort(key=lambda x: x['attractiveness'], reverse=True)
+        return stats
+    
+    def get_price_segments(self):
+        """Анализ ценовых сегментов"""
+        segments = {
+            'Бюджет (<200₽)': [],
+            'Средний (200-500₽)': [],
+            'Премиум (>500₽)': []
+        }
+        
+        for p in self.products:
+            if p['price'] < 200:
+                segments['Бюджет (<200₽)'].append(p)
+            elif p['price'] <= 500:
+                segments['Средний (200-500₽)'].append(p)
+            else:
+                segments['Премиум (>500₽)'].append(p)
+        
+        segment_stats = []
+        for seg_name, items in segments.items():
+            if items:
+                avg_sales = sum(p['sales'] for p in items) / len(items)
+                total_revenue = sum(p['price'] * p['sales'] for p in items)
+                segment_stats.append({
+                    'segment': seg_name,
+                    'count': len(items),
+                    'avg_sales': avg_sales,
+                    'total_revenue': total_revenue
+                })
+        
+        return segment_stats
+    
+    def get_anomalies(self):
+        """Поиск трендов и аномалий"""
+        anomalies = {
+            'premium_demand': [],  # Высокая цена + высокие продажи
+            'low_performance': [],  # Низкая цена + низкие продажи
+            'opportunities': []  # Цена ниже средней в категории
+        }
+        
+        for cat_name, items in self.categories.items():
+            if len(items) < 3:
+                continue
+            
+            avg_price = sum(p['price'] for p in items) / len(items)
+            avg_sales = sum(p['sales'] for p in items) / len(items)
+            
+            for p in items:
+                # Премиум-спрос: цена > среднего * 1.5 И продажи > среднего
+                if p['price'] > avg_price * 1.5 and p['sales'] > avg_sales:
+                    anomalies['premium_demand'].append({
+                        **p,
+                        'reason': f"Премиум-спрос в '{cat_name}'"
+                    })
+                
+                # Низкая эффективность
+                if p['price'] < avg_price * 0.7 and p['sales'] < avg_sales * 0.5:
+                    anomalies['low_performance'].append({
+                        **p,
+                        'reason': f"Низкая эффективность в '{cat_name}'"
+                    })
+                
+                # Возможность: цена ниже средней, но продажи хорошие
+                if p['price'] < avg_price * 0.8 and p['sales'] > avg_sales:
+                    anomalies['opportunities'].append({
+                        **p,
+                        'reason': f"Возможность поднять цену в '{cat_name}'",
+                        'avg_price': avg_price
+                    })
+        
+        return anomalies
+    
+    def get_top_products(self, limit=10):
+        """ТОП товаров по обороту"""
+        products_with_revenue = []
+        for p in self.products:
+            revenue = p['price'] * p['sales']
+            products_with_revenue.append({
+                **p,
+                'revenue': revenue
+            })
+        
+        products_with_revenue.sort(key=lambda x: x['revenue'], reverse=True)
+        return products_with_revenue[:limit]
@@ -0,0 +1,91 @@
+"""Исходный разбор цены и продаж из текстов карточек, отдельно для каждого сайта"""
+
+import re
+
+
+def ggsel_price(price_text):
+    if '=' in price_text:
+        price_text = price_text.split('=')[-1].strip()
+
+    price_clean = price_text.replace('₽', '').replace('\xa0', '').replace(' ', '').strip()
+
+    try:
+        return float(price_clean)
+    except:
+        return None
+
+
+def ggsel_sales(sales_text):
+    sales = 0
+    if sales_text is not None:
+        sales_text = sales_text.replace('\xa0', '').replace(' ', '')
+
+        if '+' in sales_text:
+            sales_match = re.search(r'(\d+)\+', sales_text)
+            if sales_match:
+                sales = int(sales_match.group(1))
+        else:
+            sales_match = re.search(r'(\d+)', sales_text)
+            if sales_match:
+                sales = int(sales_match.group(1))
+    return sales
+
+
+def plati_price(price_text):
+    price_clean = re.sub(r'[^\d.]', '', price_text.replace(',', '.'))
+    try:
+        return float(price_clean)
+    except:
+        return None
+
+
+def plati_sales(sold_text):
+    sales = 0
+    if sold_text is not None:
+        sold_text = sold_text.replace('\xa0', '').replace(' ', '')
+
+        if 'млн' in sold_text:
+            m = re.search(r'(\d+(?:\.\d+)?)', sold_text)
+            if m:
+                sales = int(float(m.group(1)) * 1_000_000)
+        elif 'тыс' in sold_text or 'k' in sold_text.lower():
+            m = re.search(r'(\d+(?:\.\d+)?)', sold_text)
+            if m:
+                sales = int(float(m.group(1)) * 1_000)
+        elif '+' in sold_text:
+            m = re.search(r'(\d+)', sold_text)
+            if m:
+                sales = int(m.group(1))
+        else:
+            m = re.search(r'(\d+)', sold_text)
+            if m:
+                sales = int(m.group(1))
+        if 'менее' in sold_text.lower():
+            sales = 5
+    return sales
+
+
+def generic_price(price_text):
+    price_match = re.search(r'[\d\s]+[.,]?\d*', price_text)
+    if price_match:
+        try:
+            return float(re.sub(r'[^\d.]', '', price_match.group().replace(',', '.')))
+        except ValueError:
+            return None
+    return None
+
+
+def generic_sales(sales_text):
+    sales = 0
+    if sales_text is not None:
+        sales_match = re.search(r'(\d+)', sales_text)
+        if sales_match:
+            sales = int(sales_match.group(1))
+    return sales
+
+
+LEGACY = {
+    'ggsel': (ggsel_price, ggsel_sales),
+    'plati': (plati_price, plati_sales),
+    'generic': (generic_price, generic_sales),
+}
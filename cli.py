@@ -0,0 +1,130 @@
+"""
+Запуск без интерфейса:
+    python main.py scrape --url URL --out data.parquet
+    python main.py monitor add URL --every 60
+    python main.py monitor run
+"""
+
+import argparse
+import signal
+import sys
+import time
+from datetime import datetime
+
+from core import (PRODUCT_TYPES, SORT_OPTIONS, AnalyticsEngine, ChangeDetector, DomainRateLimiter,
+                  ProductExporter, SalesVelocity, get_snapshot_store, scrape_products)
+from monitor import MONITOR_DOMAIN_BURST, MONITOR_DOMAIN_INTERVAL, MONITOR_WORKERS, JobQueue, Monitor
+
+
+def run_cli(argv):
+    """
+    Парсинг без интерфейса для ночных заданий:
+        python main.py scrape --url URL [--url URL2 ...] --out data.parquet [--stats stats.csv] [--compare cmp.csv]
+    """
+    ap = argparse.ArgumentParser(prog='main.py scrape', description="Парсинг каталогов и выгрузка в файл")
+    ap.add_argument('--url', action='append', default=[], help="адрес каталога (можно несколько раз)")
+    ap.add_argument('--url-file', help="файл со списком URL, по одному в строке")
+    ap.add_argument('--out', required=True, help="файл товаров: .parquet, .feather/.arrow или .csv")
+    ap.add_argument('--stats', help="файл статистики категорий (формат по расширению)")
+    ap.add_argument('--compare', help="файл сравнения цен одного товара на ggsel и plati (формат по расширению)")
+    ap.add_argument('--type', default="Все", choices=PRODUCT_TYPES, help="тип товаров")
+    ap.add_argument('--mode', default='auto', choices=['auto', 'http', 'browser'], help="способ загрузки")
+    ap.add_argument('--limit', type=int, default=None, help="лимит карточек на страницу, 0 - без ограничений")
+    ap.add_argument('--sort', default=SORT_OPTIONS[0], choices=SORT_OPTIONS)
+    ap.add_argument('--skip-unchanged', action='store_true', help="брать неизменившиеся страницы из истории")
+    ap.add_argument('--no-history', action='store_true', help="не сохранять результат в историю снимков")
+    args = ap.parse_args(argv)
+    
+    urls = list(args.url)
+    if args.url_file:
+        with open(args.url_file, encoding='utf-8') as f:
+            urls += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        ap.error("укажите --url или --url-file")
+    for path in filter(None, [args.out, args.stats, args.compare]):
+        try:
+            ProductExporter.format_of(path)
+        except ValueError as e:
+            ap.error(str(e))
+    
+    detector = ChangeDetector() if args.skip_unchanged else None
+    started = time.perf_counter()
+    products, snapshot_id = scrape_products(urls, args.sort, args.type, args.mode, args.limit, detector,
+                                            save=not args.no_history)
+    if not products:
+        print("Не удалось извлечь товары", file=sys.stderr)
+        return 1
+    
+    velocity = None
+    if snapshot_id is not None and not args.no_history:
+        velocity = SalesVelocity.from_store(get_snapshot_store(), snapshot_id)
+    
+    exporter = ProductExporter(products, AnalyticsEngine(products, velocity=velocity))
+    exporter.write_products(args.out)
+    print(f"Товаров: {len(products)} -> {args.out} ({time.perf_counter() - started:.1f} с)")
+    if args.stats:
+        print(f"Категорий: {exporter.write_stats(args.stats)} -> {args.stats}")
+    if args.compare:
+        print(f"Товаров на нескольких площадках: {exporter.write_comparison(args.compare)} -> {args.compare}")
+    if detector and detector.report():
+        print(f"Проверка изменений: {detector.report()}")
+    return 0
+
+
+def run_monitor(argv):
+    """Управление заданиями мониторинга и запуск планировщика"""
+    ap = argparse.ArgumentParser(prog='main.py monitor', description="Парсинг каталогов по расписанию")
+    commands = ap.add_subparsers(dest='command', required=True)
+    
+    add = commands.add_parser('add', help="добавить или изменить задание")
+    add.add_argument('url')
+    add.add_argument('--every', type=float, required=True, help="интервал, мин")
+    add.add_argument('--type', default="Все", choices=PRODUCT_TYPES, help="тип товаров")
+    add.add_argument('--mode', default='auto', choices=['auto', 'http', 'browser'], help="способ загрузки")
+    add.add_argument('--limit', type=int, default=None, help="лимит карточек на страницу, 0 - без ограничений")
+    
+    commands.add_parser('list', help="список заданий")
+    
+    remove = commands.add_parser('remove', help="удалить задание")
+    remove.add_argument('job_id', type=int)
+    
+    run = commands.add_parser('run', help="запустить планировщик")
+    run.add_argument('--workers', type=int, default=MONITOR_WORKERS, help="одновременных заданий")
+    run.add_argument('--domain-interval', type=float, default=MONITOR_DOMAIN_INTERVAL,
+                     help="секунд на один запрос к домену в среднем")
+    run.add_argument('--burst', type=int, default=MONITOR_DOMAIN_BURST, help="запросов к домену подряд")
+    run.add_argument('--once', action='store_true', help="выполнить наступившие задания и выйти")
+    run.add_argument('--no-skip-unchanged', action='store_true', help="всегда парсить страницы целиком")
+    args = ap.parse_args(argv)
+    
+    queue = JobQueue()
+    if args.command == 'add':
+        if args.every <= 0:
+            ap.error("интервал должен быть положительным")
+        job_id = queue.add(args.url, args.every * 60, args.type, args.mode, args.limit)
+        print(f"Задание {job_id}: {args.url} каждые {args.every:g} мин")
+    elif args.command == 'remove':
+        if not queue.remove(args.job_id):
+            print(f"Задание {args.job_id} не найдено", file=sys.stderr)
+            return 1
+        print(f"Задание {args.job_id} удалено")
+    elif args.command == 'list':
+        for job in queue.jobs():
+            next_run = datetime.fromtimestamp(job['next_run']).strftime('%d.%m %H:%M')
+            status = job['last_status'] or 'ожидает'
+            if job['last_status'] == 'error':
+                status += f" x{job['attempts']}: {job['last_error']}"
+            elif job['last_status'] == 'ok':
+                status += f", товаров {job['last_count']}"
+            print(f"{job['id']:>4}  {job['interval'] / 60:>6g} мин  след. {next_run}  {job['url']} "
+                  f"[{job['product_type']}, {job['fetch_mode']}]  {status}")
+    else:
+        limiter = DomainRateLimiter(per_domain=1, min_interval=args.domain_interval, burst=args.burst)
+        monitor = Monitor(queue, workers=args.workers, limiter=limiter,
+                          skip_unchanged=not args.no_skip_unchanged)
+        # Остановка по SIGTERM/Ctrl+C дожидается начатых заданий
+        signal.signal(signal.SIGTERM, lambda *_: monitor.stop())
+        signal.signal(signal.SIGINT, lambda *_: monitor.stop())
+        monitor.run(once=args.once)
+    return 0
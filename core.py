@@ -0,0 +1,3317 @@
+"""
+Ядро парсера без интерфейса: загрузка и разбор каталогов, аналитика,
+история снимков и выгрузка.
+
+Selenium, pandas, openpyxl и BeautifulSoup импортируются при первом
+использовании: запуск из командной строки или по расписанию не платит
+за то, что ему не понадобится.
+"""
+
+import os
+import atexit
+import threading
+import queue
+import io
+import json
+import hashlib
+import heapq
+import sqlite3
+import zlib
+import multiprocessing
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlparse, urlunparse, parse_qs, urlencode, unquote
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    etree = None
+    lxml_html = None
+import time
+import re
+from collections import defaultdict
+from collections.abc import Sequence
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import count
+from html import escape
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+
+
+class LazyRecords(Sequence):
+    """Список словарей-результатов, которые создаются только при обращении к ним"""
+
+    def __init__(self, indices, make_record):
+        self.indices = indices
+        self.make_record = make_record
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.make_record(j) for j in self.indices[i]]
+        return self.make_record(self.indices[i])
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+
+class ProductColumns:
+    """Колоночное представление товаров: цена, продажи, оборот и коды категорий в массивах numpy"""
+
+    def __init__(self, products, categories=None):
+        import pandas as pd
+        
+        n = len(products)
+        self.products = products
+        self.price = np.fromiter((p['price'] for p in products), dtype=np.float64, count=n)
+        self.sales = np.fromiter((p['sales'] for p in products), dtype=np.float64, count=n)
+        self.revenue = self.price * self.sales
+        
+        # Коды категорий в порядке первого появления, как при группировке словарем.
+        # Общий словарь categories (название -> код) дает сквозную нумерацию для нескольких пачек
+        codes, names = pd.factorize(
+            pd.Series([p.get('category') or 'Без категории' for p in products], dtype=object))
+        if categories is None:
+            categories = {}
+        remap = np.fromiter((categories.setdefault(name, len(categories)) for name in names),
+                            dtype=np.intp, count=len(names))
+        self.category_codes = remap[codes]
+        self.categories = categories
+        self.category_names = list(categories)
+
+    def __len__(self):
+        return len(self.price)
+
+    def group_sums(self, values):
+        """Сумма значений по каждой категории"""
+        # Для пустого списка bincount возвращает целые, поэтому тип задается явно
+        return np.bincount(self.category_codes, weights=values,
+                           minlength=len(self.category_names)).astype(np.float64, copy=False)
+
+    def group_counts(self):
+        return np.bincount(self.category_codes, minlength=len(self.category_names))
+
+    def group_totals(self, codes, size):
+        """Количество, суммы и суммы квадратов цены и продаж, оборот - строки массива TOTALS x size"""
+        return np.vstack([
+            np.bincount(codes, weights=values, minlength=size).astype(np.float64, copy=False)
+            for values in (None, self.price, self.price ** 2, self.sales, self.sales ** 2, self.revenue)
+        ])
+
+
+class AnalyticsEngine:
+    """
+    Движок аналитики для расчета всех метрик.
+
+    Товары можно добавлять во время парсинга (add/add_batch): суммы по категориям
+    и ценовым сегментам и ТОП по обороту дополняются только новыми товарами,
+    а не пересчитываются по всему списку.
+    """
+    
+    PRICE_SEGMENTS = ['Бюджет (<200₽)', 'Средний (200-500₽)', 'Премиум (>500₽)']
+    TOTALS = ('count', 'price', 'price_sq', 'sales', 'sales_sq', 'revenue')
+    TOP_K = 100  # сколько лидеров по обороту хранится в куче
+
+    def __init__(self, products=None, top_k=TOP_K, velocity=None):
+        self.top_k = top_k
+        self.set_products([] if products is None else products)
+        self.set_velocity(velocity)
+
+    def set_products(self, products):
+        """Новый список товаров (движок пополняет его сам): все суммы и результаты сбрасываются"""
+        self.products = products
+        self.invalidate()
+
+    def invalidate(self):
+        self.categories = {}
+        self.category_totals = np.zeros((len(self.TOTALS), 0))
+        self.segment_totals = np.zeros((len(self.TOTALS), len(self.PRICE_SEGMENTS)))
+        self._top = []          # куча (оборот, -номер товара) из top_k лидеров
+        self._counted = 0       # сколько товаров уже учтено в суммах
+        self._columns = None
+        self._cache = {}
+
+    def set_velocity(self, velocity):
+        """Подключение скорости продаж по истории снимков (SalesVelocity или None)"""
+        self.velocity = velocity if velocity is not None and len(velocity) else None
+        self._cache = {}
+
+    def add(self, product):
+        """Добавление товара; суммы дополняются при следующем запросе статистики"""
+        self.products.append(product)
+
+    def add_batch(self, products):
+        self.products.extend(products)
+
+    def _update(self):
+        """Учет товаров, добавленных после прошлого запроса, одной пачкой"""
+        start = self._counted
+        if start == len(self.products):
+            return
+        if start:
+            batch = ProductColumns(self.products[start:], self.categories)
+        else:
+            # Первая пачка - весь список: ее колонки пригодятся для аномалий
+            batch = self._columns = ProductColumns(self.products, self.categories)
+        
+        size = len(self.categories)
+        grown = np.zeros((len(self.TOTALS), size))
+        grown[:, :self.category_totals.shape[1]] = self.category_totals
+        self.category_totals = grown + batch.group_totals(batch.category_codes, size)
+        
+        segment = np.where(batch.price < 200, 0, np.where(batch.price <= 500, 1, 2))
+        self.segment_totals = self.segment_totals + batch.group_totals(segment, len(self.PRICE_SEGMENTS))
+        
+        # В кучу попадают только кандидаты из пачки - товары не ниже top_k-го по обороту
+        revenue = batch.revenue
+        if 0 < self.top_k < len(revenue):
+            threshold = np.partition(revenue, len(revenue) - self.top_k)[len(revenue) - self.top_k]
+            candidates = np.flatnonzero(revenue >= threshold)
+        else:
+            candidates = np.arange(len(revenue) if self.top_k else 0)
+        for i in candidates:
+            # При равном обороте выше стоит товар, добавленный раньше (как при устойчивой сортировке)
+            item = (float(revenue[i]), -(start + int(i)))
+            if len(self._top) < self.top_k:
+                heapq.heappush(self._top, item)
+            elif item > self._top[0]:
+                heapq.heapreplace(self._top, item)
+        
+        self._counted = len(self.products)
+        self._cache = {}
+
+    @property
+    def columns(self):
+        """Колонки всего списка - нужны для поиска аномалий и ТОПа длиннее top_k"""
+        if self._columns is None or len(self._columns) != len(self.products):
+            self._columns = ProductColumns(self.products, self.categories)
+        return self._columns
+
+    def _cached(self, key, compute):
+        """Результат расчета запоминается до добавления или смены товаров"""
+        self._update()
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @classmethod
+    def _moments(cls, totals):
+        """Количество, средние и стандартные отклонения цены и продаж из накопленных сумм"""
+        count, price, price_sq, sales, sales_sq, revenue = totals
+        present = count > 0
+        avg_price = np.divide(price, count, out=np.zeros_like(price), where=present)
+        avg_sales = np.divide(sales, count, out=np.zeros_like(sales), where=present)
+        price_var = np.divide(price_sq, count, out=np.zeros_like(price), where=present) - avg_price ** 2
+        sales_var = np.divide(sales_sq, count, out=np.zeros_like(sales), where=present) - avg_sales ** 2
+        return {
+            'counts': count,
+            'present': present,
+            'revenue_sums': revenue,
+            'sales_sums': sales,
+            'avg_price': avg_price,
+            'avg_sales': avg_sales,
+            'price_std': np.sqrt(np.maximum(price_var, 0)),
+            'sales_std': np.sqrt(np.maximum(sales_var, 0))
+        }
+
+    def _category_totals(self):
+        """Средние по категориям - общие для статистики и аномалий"""
+        return self._cached('category_totals', lambda: self._moments(self.category_totals))
+
+    def _velocity_columns(self):
+        """Продажи в день и изменение цены по товарам списка (NaN - нет истории)"""
+        return self._cached('velocity_columns', self._compute_velocity_columns)
+
+    def _compute_velocity_columns(self):
+        cols = self.columns
+        links = [p.get('link') or '' for p in self.products]
+        per_day = self.velocity.lookup(links)
+        tracked = ~np.isnan(per_day)
+        return {
+            'sales_per_day': per_day,
+            'price_change': self.velocity.lookup(links, 'price_change'),
+            'tracked': cols.group_sums(tracked.astype(np.float64)),
+            'per_day_sums': cols.group_sums(np.where(tracked, per_day, 0.0))
+        }
+    
+    @staticmethod
+    def _rate_category(competitors, avg_price, avg_sales):
+        """Уровни спроса и конкуренции, балл и рекомендация для категории"""
+        # Определение уровня конкуренции
+        if competitors < 20:
+            competition_level = "Низкая"
+            competition_color = "#27ae60"
+        elif competitors < 50:
+            competition_level = "Средняя"
+            competition_color = "#f39c12"
+        else:
+            competition_level = "Высокая"
+            competition_color = "#e74c3c"
+        
+        # Определение спроса
+        if avg_sales > 500:
+            demand_level = "Высокий"
+            demand_color = "#27ae60"
+        elif avg_sales > 100:
+            demand_level = "Средний"
+            demand_color = "#f39c12"
+        else:
+            demand_level = "Низкий"
+            demand_color = "#e74c3c"
+        
+        # Оценка привлекательности (0-10)
+        score = 0
+        # Спрос (+4 балла)
+        if avg_sales > 500:
+            score += 4
+        elif avg_sales > 100:
+            score += 2
+        
+        # Конкуренция (+3 балла за низкую)
+        if competitors < 20:
+            score += 3
+        elif competitors < 50:
+            score += 1.5
+        
+        # Средний чек (+3 балла)
+        if avg_price > 500:
+            score += 3
+        elif avg_price > 200:
+            score += 1.5
+        
+        # Рекомендация
+        if score >= 7:
+            recommendation = "ВХОДИТЬ 🚀"
+            rec_color = "#27ae60"
+        elif score >= 4:
+            recommendation = "ИЗУЧИТЬ 🔍"
+            rec_color = "#f39c12"
+        else:
+            recommendation = "НЕ ВХОДИТЬ ⛔"
+            rec_color = "#e74c3c"
+        
+        return {
+            'competition_level': competition_level,
+            'competition_color': competition_color,
+            'demand_level': demand_level,
+            'demand_color': demand_color,
+            'score': score,
+            'recommendation': recommendation,
+            'rec_color': rec_color
+        }
+
+    def get_category_stats(self):
+        """Статистика по каждой категории"""
+        return self._cached('category_stats', self._compute_category_stats)
+
+    def _compute_category_stats(self):
+        names = list(self.categories)
+        totals = self._category_totals()
+        counts = totals['counts']
+        present = totals['present']
+        revenue_sums = totals['revenue_sums']
+        avg_price = totals['avg_price']
+        avg_sales = totals['avg_sales']
+        # Индекс привлекательности: (средние продажи × средняя цена) / конкуренты
+        attractiveness = np.divide(avg_sales * avg_price, counts, out=np.zeros_like(avg_price), where=present)
+        
+        velocity = self._velocity_columns() if self.velocity is not None else None
+        
+        stats = []
+        # Сортировка по индексу привлекательности (устойчивая, как list.sort)
+        for i in np.argsort(-attractiveness, kind='stable'):
+            if not present[i]:
+                continue
+            competitors = int(counts[i])
+            # Реальный спрос: прирост продаж в день по товарам, встречавшимся в прошлых снимках
+            tracked = int(velocity['tracked'][i]) if velocity is not None else 0
+            stats.append({
+                'category': names[i],
+                'competitors': competitors,
+                'avg_price': float(avg_price[i]),
+                'avg_sales': float(avg_sales[i]),
+                'total_revenue': float(revenue_sums[i]),
+                'attractiveness': float(attractiveness[i]),
+                'price_std': float(totals['price_std'][i]),
+                'sales_std': float(totals['sales_std'][i]),
+                'tracked': tracked,
+                'sales_per_day': float(velocity['per_day_sums'][i]) if tracked else None,
+                'avg_sales_per_day': float(velocity['per_day_sums'][i] / tracked) if tracked else None,
+                **self._rate_category(competitors, avg_price[i], avg_sales[i])
+            })
+        
+        return stats
+    
+    def get_price_segments(self):
+        """Анализ ценовых сегментов"""
+        return self._cached('price_segments', self._compute_price_segments)
+
+    def _compute_price_segments(self):
+        totals = self._moments(self.segment_totals)
+        counts = totals['counts']
+        
+        segment_stats = []
+        for i, seg_name in enumerate(self.PRICE_SEGMENTS):
+            if counts[i]:
+                segment_stats.append({
+                    'segment': seg_name,
+                    'count': int(counts[i]),
+                    'avg_sales': float(totals['sales_sums'][i] / counts[i]),
+                    'total_revenue': float(totals['revenue_sums'][i]),
+                    'sales_std': float(totals['sales_std'][i])
+                })
+        
+        return segment_stats
+    
+    def get_anomalies(self):
+        """Поиск трендов и аномалий"""
+        return self._cached('anomalies', self._compute_anomalies)
+
+    def _compute_anomalies(self):
+        cols = self.columns
+        totals = self._category_totals()
+        counts = totals['counts']
+        avg_price = totals['avg_price'][cols.category_codes]
+        avg_sales = totals['avg_sales'][cols.category_codes]
+        
+        # Категории меньше чем из трех товаров не анализируются
+        eligible = counts[cols.category_codes] >= 3
+        
+        masks = {
+            # Премиум-спрос: цена > среднего * 1.5 И продажи > среднего
+            'premium_demand': (cols.price > avg_price * 1.5) & (cols.sales > avg_sales),
+            # Низкая эффективность
+            'low_performance': (cols.price < avg_price * 0.7) & (cols.sales < avg_sales * 0.5),
+            # Возможность: цена ниже средней, но продажи хорошие
+            'opportunities': (cols.price < avg_price * 0.8) & (cols.sales > avg_sales)
+        }
+        reasons = {
+            'premium_demand': "Премиум-спрос в '{}'",
+            'low_performance': "Низкая эффективность в '{}'",
+            'opportunities': "Возможность поднять цену в '{}'"
+        }
+        
+        def make_record(kind):
+            def record(i):
+                item = {**self.products[i],
+                        'reason': reasons[kind].format(cols.category_names[cols.category_codes[i]])}
+                if kind == 'opportunities':
+                    item['avg_price'] = float(avg_price[i])
+                return item
+            return record
+        
+        anomalies = {}
+        for kind, mask in masks.items():
+            idx = np.flatnonzero(mask & eligible)
+            # Порядок как при обходе по категориям: сначала категория, затем позиция товара
+            idx = idx[np.argsort(cols.category_codes[idx], kind='stable')]
+            anomalies[kind] = LazyRecords(idx, make_record(kind))
+        
+        return anomalies
+    
+    def get_velocity_leaders(self, limit=10):
+        """ТОП товаров по продажам в день; пусто без истории снимков"""
+        if self.velocity is None:
+            return []
+        return self._cached(('velocity_leaders', limit), lambda: self._compute_velocity_leaders(limit))
+
+    def _compute_velocity_leaders(self, limit):
+        velocity = self._velocity_columns()
+        per_day = velocity['sales_per_day']
+        idx = np.flatnonzero(~np.isnan(per_day))
+        idx = idx[np.argsort(-per_day[idx], kind='stable')][:limit]
+        return [{**self.products[i], 'sales_per_day': float(per_day[i]),
+                 'price_change': float(velocity['price_change'][i])} for i in idx]
+
+    def get_top_products(self, limit=10):
+        """ТОП товаров по обороту"""
+        return self._cached(('top_products', limit), lambda: self._compute_top_products(limit))
+
+    def _compute_top_products(self, limit):
+        if limit <= self.top_k:
+            top = [-i for _, i in sorted(self._top, reverse=True)[:limit]]
+        else:
+            top = self._rank_by_revenue(limit)
+        return [{**self.products[i], 'revenue': self.products[i]['price'] * self.products[i]['sales']}
+                for i in top]
+
+    def _rank_by_revenue(self, limit):
+        """ТОП по всему списку, когда запрошено больше, чем хранится в куче"""
+        cols = self.columns
+        revenue = cols.revenue
+        if 0 < limit < len(revenue):
+            # Кандидаты - все товары с оборотом не ниже limit-го по величине (с учетом равных)
+            threshold = np.partition(revenue, len(revenue) - limit)[len(revenue) - limit]
+            candidates = np.flatnonzero(revenue >= threshold)
+        else:
+            candidates = np.arange(len(revenue))
+        return candidates[np.argsort(-revenue[candidates], kind='stable')][:limit]
+
+
+class PageWaiter:
+    """Адаптивное ожидание подгрузки карточек вместо фиксированных пауз"""
+
+    CARD_SELECTOR = '.ProductCard_card__zjTV_, a.card'
+
+    # Снимок состояния страницы. При первом вызове ставит счетчик
+    # незавершенных fetch/XHR-запросов, чтобы видеть простой сети
+    SNAPSHOT_JS = """
+        if (window.__ppPending === undefined) {
+            window.__ppPending = 0;
+            const origFetch = window.fetch;
+            if (origFetch) {
+                window.fetch = function() {
+                    window.__ppPending++;
+                    return origFetch.apply(this, arguments).finally(function() {
+                        window.__ppPending = Math.max(0, window.__ppPending - 1);
+                    });
+                };
+            }
+            const origSend = XMLHttpRequest.prototype.send;
+            XMLHttpRequest.prototype.send = function() {
+                window.__ppPending++;
+                this.addEventListener('loadend', function() {
+                    window.__ppPending = Math.max(0, window.__ppPending - 1);
+                });
+                return origSend.apply(this, arguments);
+            };
+        }
+        return [
+            document.querySelectorAll(arguments[0]).length,
+            document.body ? document.body.scrollHeight : 0,
+            performance.getEntriesByType('resource').length,
+            window.__ppPending,
+            document.readyState
+        ];
+    """
+
+    EMPTY = (0, 0, 0, 0, 'loading')
+
+    def __init__(self, driver, poll_interval=0.2, idle_time=0.5, quiet_timeout=2.5, max_wait=15, on_wait=None):
+        self.driver = driver
+        self.on_wait = on_wait              # вызывается после каждого ожидания (потоковое извлечение карточек)
+        self.poll_interval = poll_interval
+        self.idle_time = idle_time          # тишина сети, после которой страница считается загруженной
+        self.quiet_timeout = quiet_timeout  # сколько ждать новых карточек, если на странице ничего не меняется
+        self.max_wait = max_wait            # жесткий предел для одного ожидания
+        self.timings = defaultdict(float)
+        self.legacy = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    def snapshot(self):
+        """Карточки, высота страницы, загруженные ресурсы, активные запросы, readyState"""
+        try:
+            return tuple(self.driver.execute_script(self.SNAPSHOT_JS, self.CARD_SELECTOR))
+        except Exception:
+            return self.EMPTY
+
+    def near_bottom(self, margin=1500):
+        """Находится ли окно у нижнего края, где срабатывает подгрузка"""
+        try:
+            return self.driver.execute_script(
+                "return window.pageYOffset + window.innerHeight >= document.body.scrollHeight - arguments[0];",
+                margin)
+        except Exception:
+            return True
+
+    def wait(self, phase, baseline=None, until='cards', legacy=0.0):
+        """
+        Ожидание после действия на странице.
+
+        until='cards' - выход, как только карточек стало больше, чем в baseline;
+        until='idle'  - выход, как только сеть простаивает idle_time секунд.
+        Таймаут quiet_timeout отсчитывается только пока на странице ничего не меняется.
+        legacy - длительность фиксированной паузы, которую заменяет это ожидание.
+        Возвращает True, если появились новые карточки.
+        """
+        start = time.perf_counter()
+        if baseline is None:
+            baseline = self.snapshot()
+        last = baseline
+        last_change = start
+        grew = False
+
+        while True:
+            time.sleep(self.poll_interval)
+            now = time.perf_counter()
+            snap = self.snapshot()
+
+            if snap[0] > baseline[0]:
+                grew = True
+                if until == 'cards':
+                    break
+
+            if snap != last:
+                last = snap
+                last_change = now
+            elif snap[3] <= 0 and snap[4] == 'complete':
+                quiet = now - last_change
+                if until == 'idle' and quiet >= self.idle_time:
+                    break
+                if quiet >= self.quiet_timeout:
+                    break
+
+            if now - start >= self.max_wait:
+                break
+
+        self.timings[phase] += time.perf_counter() - start
+        self.legacy[phase] += legacy
+        self.calls[phase] += 1
+        
+        if self.on_wait:
+            self.on_wait()
+        return grew
+
+    def report(self, site):
+        """Печать и возврат таймингов по фазам"""
+        phases = {}
+        for phase in self.timings:
+            phases[phase] = {
+                'calls': self.calls[phase],
+                'waited': self.timings[phase],
+                'legacy': self.legacy[phase],
+            }
+
+        total = sum(self.timings.values())
+        legacy_total = sum(self.legacy.values())
+        print(f"Ожидания на {site}:")
+        for phase, t in phases.items():
+            print(f"  {phase}: {t['calls']} раз, {t['waited']:.1f}с (фиксированные паузы: {t['legacy']:.1f}с)")
+        print(f"  Итого: {total:.1f}с вместо {legacy_total:.1f}с, сэкономлено {legacy_total - total:.1f}с")
+
+        return {
+            'site': site,
+            'phases': phases,
+            'waited': total,
+            'legacy': legacy_total,
+            'saved': legacy_total - total
+        }
+
+
+# Число в тексте карточки: тысячи через обычный, неразрывный или узкий пробел
+# ("10 000"), дробная часть через точку или запятую ("1,2", "499.90")
+NUMBER_PATTERN = r'(\d{1,3}(?:[ \xa0\u202f]\d{3})+(?!\d)|\d+)(?:[.,](\d+))?'
+PRICE_RE = re.compile(NUMBER_PATTERN)
+PRICE_SYMBOLS = ' \xa0\u202f₽'
+# Продажи: число и множитель после него ("1,2 тыс", "2 млн", "1.5k")
+SALES_RE = re.compile(NUMBER_PATTERN + r'(?:\s*(млн|тыс|[kKкКmM](?!\w)))?')
+SALES_MULTIPLIERS = {'млн': 1_000_000, 'm': 1_000_000, 'M': 1_000_000,
+                     'тыс': 1_000, 'k': 1_000, 'K': 1_000, 'к': 1_000, 'К': 1_000}
+LESS_THAN_RE = re.compile(r'[Мм]енее|[Мм]еньше|[Ll]ess than|<')
+# Тексты цен и продаж на странице сильно повторяются, разобранные запоминаются
+NUMBER_CACHE_SIZE = 8192
+
+
+def _number(whole, fraction):
+    if not whole.isdigit():
+        whole = whole.replace(' ', '').replace('\xa0', '').replace('\u202f', '')
+    return float(whole + '.' + fraction) if fraction else float(whole)
+
+
+@lru_cache(maxsize=NUMBER_CACHE_SIZE)
+def parse_price(text):
+    """
+    Цена из текста карточки или None. При пересчете валют ("~ 510 = 499 ₽")
+    берется сумма после последнего '='.
+    """
+    text = text[text.rfind('=') + 1:].strip(PRICE_SYMBOLS)
+    if text.isdigit():
+        return float(text)
+    m = PRICE_RE.search(text)
+    return _number(m.group(1), m.group(2)) if m else None
+
+
+@lru_cache(maxsize=NUMBER_CACHE_SIZE)
+def parse_sales(text):
+    """Число продаж из текста карточки; 0, если числа нет. "менее N" считается как N/2"""
+    if not text:
+        return 0
+    m = SALES_RE.search(text)
+    if not m:
+        return 0
+    whole, fraction, unit = m.groups()
+    value = _number(whole, fraction)
+    if unit:
+        value *= SALES_MULTIPLIERS[unit]
+    if m.start() and LESS_THAN_RE.search(text, 0, m.start()):
+        value /= 2
+    return int(value)
+
+
+DEFAULT_MAX_ITEMS = {'ggsel': 500, 'plati': 300, 'generic': 50}   # карточек на страницу по умолчанию
+DEFAULT_MAX_SCROLLS = 30    # прокруток или нажатий "Показать ещё" при лимитах по умолчанию
+
+
+class ProductParser:
+    """Разбор карточек товаров из HTML для ggsel, plati и прочих сайтов"""
+
+    # Шаблоны классов для неизвестных сайтов
+    GENERIC_PATTERNS = [
+        {'container': re.compile(r'product|item|card|goods|offer'), 
+         'title': re.compile(r'title|name|product|heading'),
+         'price': re.compile(r'price|cost|sum|rub'),
+         'sales': re.compile(r'sold|sales|продаж|купили')},
+    ]
+    GENERIC_SALES_TEXT = re.compile(r'\d+\s*(продаж|sold|sales)', re.I)
+
+    def __init__(self, product_type="Все", max_items=None):
+        self.product_type = product_type
+        self.max_items = max_items  # None - лимиты сайтов по умолчанию, 0 - без ограничений
+
+    @staticmethod
+    def site(url):
+        """Площадка страницы для лимитов: ggsel, plati или generic"""
+        if 'ggsel' in url:
+            return 'ggsel'
+        return 'plati' if 'plati' in url else 'generic'
+
+    def limit(self, site):
+        """Сколько карточек разбирать на сайте; 0 - без ограничений"""
+        if self.max_items is None:
+            return DEFAULT_MAX_ITEMS[site]
+        return self.max_items
+
+    def _limited(self, items, site):
+        limit = self.limit(site)
+        return items[:limit] if limit else items
+
+    def iter_products(self, source, url, encoding='utf-8'):
+        """Товары страницы по одному; source - строка, байты или файл"""
+        if hasattr(source, 'read'):
+            source = source.read()
+        if isinstance(source, bytes):
+            source = source.decode(encoding, errors='replace')
+        yield from self.parse_html(source, url)
+
+    def parse_html(self, html, url):
+        """Выбор парсера по адресу страницы"""
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        if 'ggsel' in url:
+            return self.parse_ggsel(soup, url)
+        elif 'plati' in url:
+            return self.parse_plati(soup, url)
+        else:
+            return self.parse_generic(soup, url)
+
+    def _ggsel_product(self, category, title, price_text, sales_text, href):
+        """Товар ggsel из текстов полей карточки; None, если цена не разобрана"""
+        price = parse_price(price_text)
+        if price is None:
+            return None
+        sales = parse_sales(sales_text)
+        
+        link = ''
+        if href:
+            link = href
+            if not link.startswith('http'):
+                link = 'https://ggsel.net' + link
+        
+        return {
+            'name': title,
+            'price': price,
+            'sales': sales,
+            'link': link,
+            'category': category
+        }
+
+    def _plati_product(self, title, price_text, sold_text, href):
+        """Товар plati из текстов полей карточки; None, если цена не разобрана"""
+        price = parse_price(price_text)
+        if price is None:
+            return None
+        sales = parse_sales(sold_text)
+
+        link = href or ''
+        if link and not link.startswith('http'):
+            link = 'https://plati.market' + link
+        
+        return {
+            'name': title,
+            'price': price,
+            'sales': sales,
+            'link': link,
+            'category': ''
+        }
+
+    def _generic_product(self, base_url, title, price_text, sales_text, href):
+        """Товар произвольного сайта; None, если цена не найдена"""
+        price = parse_price(price_text)
+        if price is None:
+            return None
+        sales = parse_sales(sales_text)
+        
+        link = href or ''
+        if link and not link.startswith('http'):
+            if link.startswith('/'):
+                link = base_url.split('/')[0] + '//' + base_url.split('/')[2] + link
+            else:
+                link = base_url.rsplit('/', 1)[0] + '/' + link
+        
+        return {
+            'name': title[:100],
+            'price': price,
+            'sales': sales,
+            'link': link,
+            'category': ''
+        }
+
+    def parse_ggsel(self, soup, base_url):
+        products = []
+        
+        # Исключаем блок "Рекомендовано вам" по классу BottomGoods_cards__5r9XZ
+        bottom_goods = soup.find('div', class_='BottomGoods_cards__5r9XZ')
+        if bottom_goods:
+            bottom_goods.decompose()
+        
+        # Теперь ищем все карточки товаров
+        items = soup.find_all('div', {'class': 'ProductCard_card__zjTV_'})
+        
+        print(f"Найдено карточек товаров на ggsel: {len(items)}")
+        
+        for item in self._limited(items, 'ggsel'):
+            try:
+                category_elem = item.find('div', {'data-testid': 'card-category'})
+                category = category_elem.get_text(strip=True) if category_elem else ''
+
+                if self.product_type != "Все":
+                    if category != self.product_type:
+                        continue
+
+                name_elem = item.find('span', {'class': 'ProductCard_description__AXXxp'})
+                if not name_elem:
+                    name_elem = item.find('div', {'data-testid': 'card-description'})
+
+                price_elem = item.find('div', {'data-testid': 'card-price'})
+                if not price_elem:
+                    price_elem = item.find('span', {'class': 'ProductCard_price__k1Ahq'})
+
+                sales_elem = item.find('div', {'data-testid': 'card-counter'})
+                link_elem = item.find('a', {'data-testid': 'card-link'})
+                if not link_elem:
+                    link_elem = item.find('a', {'data-testid': 'card-button'})
+                
+                if name_elem and price_elem:
+                    product = self._ggsel_product(
+                        category,
+                        name_elem.get_text(strip=True),
+                        price_elem.get_text(strip=True),
+                        sales_elem.get_text(strip=True) if sales_elem else None,
+                        link_elem.get('href') if link_elem else None
+                    )
+                    if product:
+                        products.append(product)
+            except Exception:
+                continue
+        
+        print(f"Успешно распарсено товаров ggsel: {len(products)}")
+        return products
+
+    def parse_plati(self, soup, base_url):
+        products = []
+
+        # Удаляем блоки, которые не нужно парсить:
+        # 1. "Рекомендуем" (id="rec_wrapper")
+        # 2. "Вы смотрели" (id="hist_wrapper")
+        # 3. "Лучшее предложение" (class="suggestion" или "best-offer-slider")
+        
+        blocks_to_remove = [
+            soup.find('div', id='rec_wrapper'),
+            soup.find('div', id='hist_wrapper'),
+            soup.find('section', class_='suggestion'),
+            soup.find('div', class_='best-offer-slider')
+        ]
+        
+        for block in blocks_to_remove:
+            if block:
+                block.decompose()
+        
+        # Теперь ищем все карточки товаров
+        cards = soup.find_all('a', class_='card')
+        
+        print(f"Найдено карточек товаров на plati (после фильтрации): {len(cards)}")
+        
+        for card in self._limited(cards, 'plati'):
+            try:
+                if 'd-none' in card.parent.get('class', []):
+                    continue
+
+                title_span = card.find('span', class_='footnote-medium')
+                if not title_span:
+                    title_p = card.find('p', class_='custom-link')
+                    if title_p:
+                        title_span = title_p.find('span', class_='footnote-medium')
+                title = title_span.get_text(strip=True) if title_span else ''
+                if not title:
+                    continue
+
+                price_span = card.find('span', class_='title-bold')
+                if not price_span:
+                    continue
+                
+                sold_span = card.find('span', class_='footnote-regular')
+                product = self._plati_product(
+                    title,
+                    price_span.get_text(strip=True),
+                    sold_span.get_text(strip=True) if sold_span else None,
+                    card.get('href', '')
+                )
+                if product:
+                    products.append(product)
+                
+            except Exception:
+                continue
+        
+        print(f"Успешно распарсено товаров plati: {len(products)}")
+        return products
+
+    def parse_generic(self, soup, base_url):
+        products = []
+        
+        for pattern in self.GENERIC_PATTERNS:
+            items = soup.find_all(['div', 'article', 'li', 'section'], class_=pattern['container'])
+            
+            for item in self._limited(items, 'generic'):
+                try:
+                    title_elem = item.find(['h1', 'h2', 'h3', 'h4', 'a', 'span', 'div'], 
+                                          class_=pattern['title'])
+                    price_elem = item.find(['span', 'div', 'p', 'strong'], 
+                                          class_=pattern['price'])
+                    sales_elem = item.find(['span', 'div'], text=self.GENERIC_SALES_TEXT)
+                    link_elem = item.find('a', href=True)
+                    
+                    if title_elem and price_elem:
+                        product = self._generic_product(
+                            base_url,
+                            title_elem.get_text(strip=True),
+                            price_elem.get_text(strip=True),
+                            sales_elem.get_text(strip=True) if sales_elem else None,
+                            link_elem['href'] if link_elem else ''
+                        )
+                        if product:
+                            products.append(product)
+                except:
+                    continue
+            
+            if products:
+                break
+        
+        return products
+
+
+def _has_class(name):
+    """XPath-условие на наличие класса в атрибуте class"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlProductParser(ProductParser):
+    """
+    Быстрый разбор на lxml с заранее скомпилированными XPath.
+
+    Исключенные блоки отсекаются прямо в выражении для карточек, а все поля
+    карточки собираются за один обход ее потомков. Результат совпадает с ProductParser.
+    """
+
+    if etree is not None:
+        GGSEL_CARDS = etree.XPath(
+            f"//div[{_has_class('ProductCard_card__zjTV_')}]"
+            f"[not(ancestor::div[{_has_class('BottomGoods_cards__5r9XZ')}])]")
+        PLATI_CARDS = etree.XPath(
+            f"//a[{_has_class('card')}]"
+            "[not(ancestor::div[@id='rec_wrapper' or @id='hist_wrapper'])]"
+            f"[not(ancestor::section[{_has_class('suggestion')}])]"
+            f"[not(ancestor::div[{_has_class('best-offer-slider')}])]")
+
+    GENERIC_CONTAINER_TAGS = frozenset(['div', 'article', 'li', 'section'])
+    GENERIC_TITLE_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'a', 'span', 'div'])
+    GENERIC_PRICE_TAGS = frozenset(['span', 'div', 'p', 'strong'])
+
+    def parse_html(self, html, url):
+        try:
+            tree = lxml_html.document_fromstring(html)
+        except ValueError:
+            # Строки с XML-объявлением кодировки lxml принимает только как байты
+            tree = lxml_html.document_fromstring(html.encode('utf-8'))
+        
+        if 'ggsel' in url:
+            return self.parse_ggsel(tree, url)
+        elif 'plati' in url:
+            return self.parse_plati(tree, url)
+        else:
+            return self.parse_generic(tree, url)
+
+    @staticmethod
+    def _text(elem):
+        """Аналог get_text(strip=True) из BeautifulSoup"""
+        return ''.join(s.strip() for s in elem.itertext())
+
+    def _ggsel_card(self, item):
+        """Товар из карточки ggsel за один обход ее потомков"""
+        category_elem = name_elem = name_alt = price_elem = price_alt = None
+        sales_elem = link_elem = link_alt = None
+        
+        for el in item.iterdescendants():
+            tag = el.tag
+            testid = el.get('data-testid')
+            if tag == 'div':
+                if testid == 'card-category':
+                    category_elem = category_elem if category_elem is not None else el
+                elif testid == 'card-description':
+                    name_alt = name_alt if name_alt is not None else el
+                elif testid == 'card-price':
+                    price_elem = price_elem if price_elem is not None else el
+                elif testid == 'card-counter':
+                    sales_elem = sales_elem if sales_elem is not None else el
+            elif tag == 'span':
+                classes = el.get('class', '').split()
+                if 'ProductCard_description__AXXxp' in classes and name_elem is None:
+                    name_elem = el
+                elif 'ProductCard_price__k1Ahq' in classes and price_alt is None:
+                    price_alt = el
+            elif tag == 'a':
+                if testid == 'card-link' and link_elem is None:
+                    link_elem = el
+                elif testid == 'card-button' and link_alt is None:
+                    link_alt = el
+        
+        category = self._text(category_elem) if category_elem is not None else ''
+        if self.product_type != "Все":
+            if category != self.product_type:
+                return None
+        
+        name_elem = name_elem if name_elem is not None else name_alt
+        price_elem = price_elem if price_elem is not None else price_alt
+        link_elem = link_elem if link_elem is not None else link_alt
+        
+        if name_elem is None or price_elem is None:
+            return None
+        
+        return self._ggsel_product(
+            category,
+            self._text(name_elem),
+            self._text(price_elem),
+            self._text(sales_elem) if sales_elem is not None else None,
+            link_elem.get('href') if link_elem is not None else None
+        )
+
+    def _plati_card(self, card):
+        """Товар из карточки plati за один обход ее потомков"""
+        parent = card.getparent()
+        if parent is not None and 'd-none' in parent.get('class', '').split():
+            return None
+        
+        title_span = price_span = sold_span = None
+        for el in card.iterdescendants('span'):
+            classes = el.get('class', '').split()
+            if title_span is None and 'footnote-medium' in classes:
+                title_span = el
+            if price_span is None and 'title-bold' in classes:
+                price_span = el
+            if sold_span is None and 'footnote-regular' in classes:
+                sold_span = el
+        
+        title = self._text(title_span) if title_span is not None else ''
+        if not title or price_span is None:
+            return None
+        
+        return self._plati_product(
+            title,
+            self._text(price_span),
+            self._text(sold_span) if sold_span is not None else None,
+            card.get('href', '')
+        )
+
+    def parse_ggsel(self, tree, base_url):
+        products = []
+        items = self.GGSEL_CARDS(tree)
+        
+        print(f"Найдено карточек товаров на ggsel: {len(items)}")
+        
+        for item in self._limited(items, 'ggsel'):
+            try:
+                product = self._ggsel_card(item)
+                if product:
+                    products.append(product)
+            except Exception:
+                continue
+        
+        print(f"Успешно распарсено товаров ggsel: {len(products)}")
+        return products
+
+    def parse_plati(self, tree, base_url):
+        products = []
+        cards = self.PLATI_CARDS(tree)
+        
+        print(f"Найдено карточек товаров на plati (после фильтрации): {len(cards)}")
+        
+        for card in self._limited(cards, 'plati'):
+            try:
+                product = self._plati_card(card)
+                if product:
+                    products.append(product)
+            except Exception:
+                continue
+        
+        print(f"Успешно распарсено товаров plati: {len(products)}")
+        return products
+
+    def iter_products(self, source, url, encoding='utf-8'):
+        """
+        Потоковый разбор ggsel и plati через iterparse.
+
+        Каждая карточка разбирается сразу после закрывающего тега, после чего
+        она и все уже пройденные узлы удаляются из дерева. Память не растет с
+        размером страницы, особенно если source - открытый файл или поток ответа.
+        """
+        if 'ggsel' in url:
+            site, tag, card_class, parse_card = 'ggsel', 'div', 'ProductCard_card__zjTV_', self._ggsel_card
+            excluded = lambda el: el.tag == 'div' and 'BottomGoods_cards__5r9XZ' in el.get('class', '').split()
+        elif 'plati' in url:
+            site, tag, card_class, parse_card = 'plati', 'a', 'card', self._plati_card
+            excluded = lambda el: (
+                (el.tag == 'div' and (el.get('id') in ('rec_wrapper', 'hist_wrapper')
+                                      or 'best-offer-slider' in el.get('class', '').split()))
+                or (el.tag == 'section' and 'suggestion' in el.get('class', '').split()))
+        else:
+            yield from super().iter_products(source, url, encoding)
+            return
+        
+        if isinstance(source, str):
+            source = io.BytesIO(source.encode('utf-8'))
+        elif isinstance(source, bytes):
+            source = io.BytesIO(source)
+        
+        limit = self.limit(site)
+        cards = 0
+        parsed = 0
+        
+        for _, el in etree.iterparse(source, events=('end',), tag=tag, html=True,
+                                      encoding=encoding, huge_tree=True):
+            if card_class not in el.get('class', '').split():
+                continue
+            ancestors = list(el.iterancestors())
+            if any(excluded(a) for a in ancestors):
+                continue
+            
+            if not limit or cards < limit:
+                cards += 1
+                try:
+                    product = parse_card(el)
+                except Exception:
+                    product = None
+                if product:
+                    parsed += 1
+                    yield product
+            
+            # Освобождаем разобранную карточку и все узлы перед ней
+            el.clear(keep_tail=True)
+            for node in [el] + ancestors[:-1]:
+                parent = node.getparent()
+                while node.getprevious() is not None:
+                    del parent[0]
+        
+        print(f"Потоково распарсено товаров {site}: {parsed} из {cards} карточек")
+
+
+    def _matches(self, el, tags, pattern):
+        if el.tag not in tags:
+            return False
+        return any(pattern.search(c) for c in el.get('class', '').split())
+
+    def parse_generic(self, tree, base_url):
+        products = []
+        
+        for pattern in self.GENERIC_PATTERNS:
+            items = [el for el in tree.iter()
+                     if self._matches(el, self.GENERIC_CONTAINER_TAGS, pattern['container'])]
+            
+            for item in self._limited(items, 'generic'):
+                try:
+                    title_elem = price_elem = sales_elem = link_elem = None
+                    
+                    for el in item.iterdescendants():
+                        if not isinstance(el.tag, str):
+                            continue
+                        if title_elem is None and self._matches(el, self.GENERIC_TITLE_TAGS, pattern['title']):
+                            title_elem = el
+                        if price_elem is None and self._matches(el, self.GENERIC_PRICE_TAGS, pattern['price']):
+                            price_elem = el
+                        if (sales_elem is None and el.tag in ('span', 'div') and len(el) == 0
+                                and el.text and self.GENERIC_SALES_TEXT.search(el.text)):
+                            sales_elem = el
+                        if link_elem is None and el.tag == 'a' and el.get('href') is not None:
+                            link_elem = el
+                    
+                    if title_elem is not None and price_elem is not None:
+                        product = self._generic_product(
+                            base_url,
+                            self._text(title_elem),
+                            self._text(price_elem),
+                            self._text(sales_elem) if sales_elem is not None else None,
+                            link_elem.get('href') if link_elem is not None else ''
+                        )
+                        if product:
+                            products.append(product)
+                except:
+                    continue
+            
+            if products:
+                break
+        
+        return products
+
+
+def create_parser(product_type="Все", max_items=None):
+    """Парсер на lxml, если он установлен, иначе на BeautifulSoup"""
+    if lxml_html is not None:
+        return LxmlProductParser(product_type, max_items)
+    return ProductParser(product_type, max_items)
+
+
+PARSE_PROCESSES = os.cpu_count() or 1     # процессов разбора в пакетном режиме
+PARSE_POOL_MIN_BYTES = 256 * 1024         # страницы меньше разбираются в своем потоке
+PARSE_COMPRESS_LEVEL = 1                  # zlib: разметка сжимается в ~20 раз за ~3 мс на МБ
+
+
+def parse_document(parser, data, url):
+    """Разбор сжатой разметки в процессе пула; функция модуля, чтобы ее можно было передать в процесс"""
+    return list(parser.iter_products(zlib.decompress(data), url))
+
+
+class ParsePool:
+    """
+    Разбор страниц в пуле процессов: разбор упирается в процессор и под GIL
+    останавливает загрузку в соседних потоках, а в отдельных процессах идет
+    параллельно с ней на всех ядрах.
+
+    Разметка передается сжатой zlib: очередь ждущих разбора страниц занимает
+    в памяти в десятки раз меньше, а сжатие в десятки раз быстрее разбора.
+    Маленькие страницы разбираются на месте - пересылка им дороже разбора.
+    Процессы запускаются методом spawn (fork из процесса с потоками Qt и
+    Selenium небезопасен) и создаются по мере надобности. Если пул сломался,
+    разбор продолжается в вызывающем потоке.
+    """
+
+    def __init__(self, workers=PARSE_PROCESSES, min_bytes=PARSE_POOL_MIN_BYTES):
+        self.workers = workers
+        self.min_bytes = min_bytes
+        self.remote = 0         # страниц разобрано в процессах
+        self.local = 0          # страниц разобрано на месте
+        self.bytes_sent = 0     # сжатых байт отправлено в процессы
+        self._executor = None
+        self._broken = False
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def _parse_here(self, parser, text, url):
+        with self._lock:
+            self.local += 1
+        future = Future()
+        try:
+            future.set_result(list(parser.iter_products(text, url)))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def submit(self, parser, text, url):
+        """Future со списком товаров страницы"""
+        data = text.encode('utf-8') if isinstance(text, str) else text
+        if self._broken or len(data) < self.min_bytes:
+            return self._parse_here(parser, text, url)
+        data = zlib.compress(data, PARSE_COMPRESS_LEVEL)
+        try:
+            future = self._pool().submit(parse_document, parser, data, url)
+        except (BrokenProcessPool, RuntimeError) as e:
+            print(f"Пул разбора недоступен ({e}), разбор в потоке")
+            self._broken = True
+            return self._parse_here(parser, text, url)
+        with self._lock:
+            self.remote += 1
+            self.bytes_sent += len(data)
+        return future
+
+    def parse(self, parser, text, url):
+        """Товары страницы; вызывающий поток ждет результат, не занимая GIL"""
+        try:
+            return self.submit(parser, text, url).result()
+        except BrokenProcessPool as e:
+            print(f"Процесс разбора упал ({e}), разбор в потоке")
+            self._broken = True
+            return list(parser.iter_products(text, url))
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/json;q=0.9,*/*;q=0.8',
+    'Accept-Encoding': 'gzip, deflate',
+    'Accept-Language': 'ru-RU,ru;q=0.9',
+    'Connection': 'keep-alive',
+}
+
+_http_session = None
+
+
+def create_http_session():
+    """Сессия requests с пулом keep-alive соединений и повторами"""
+    session = requests.Session()
+    session.headers.update(HTTP_HEADERS)
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_http_session():
+    """Общая сессия для одиночных запусков"""
+    global _http_session
+    if _http_session is None:
+        _http_session = create_http_session()
+    return _http_session
+
+
+def full_url(url, params=None):
+    """URL вместе с параметрами запроса"""
+    if not params:
+        return url
+    parts = urlparse(url)
+    query = parse_qs(parts.query)
+    query.update({k: [str(v)] for k, v in params.items()})
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+
+class RecordedResponse:
+    """Ответ, сохраненный на диск RecordedSession"""
+
+    def __init__(self, url, status_code, text, headers):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode('utf-8')
+        self.headers = headers
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} для {self.url}")
+
+
+class RecordedSession:
+    """
+    Запись и воспроизведение HTTP-ответов для офлайн-проверки HttpFetcher.
+
+    С session=None работает только с диска, иначе делает реальные запросы
+    через session и сохраняет каждый ответ в directory.
+    """
+
+    def __init__(self, directory, session=None):
+        self.directory = directory
+        self.session = session
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url, params=None, **kwargs):
+        url = full_url(url, params)
+        path = self._path(url)
+        
+        if self.session is None:
+            if not os.path.exists(path):
+                return RecordedResponse(url, 404, '', {})
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            return RecordedResponse(url, data['status_code'], data['text'], data['headers'])
+        
+        resp = self.session.get(url, **kwargs)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'url': url,
+                'status_code': resp.status_code,
+                'text': resp.text,
+                'headers': dict(resp.headers)
+            }, f, ensure_ascii=False)
+        return resp
+
+
+class HttpFetcher:
+    """Загрузка каталогов ggsel и plati по HTTP без запуска браузера"""
+
+    PLATI_SEARCH_API = 'https://plati.io/api/search.ashx'
+
+    def __init__(self, parser, session=None, max_pages=None, page_size=500, timeout=15, rate_limiter=None,
+                 on_products=None, max_items=None, validators=None, check_first_page=None, parse_pool=None):
+        self.parser = parser
+        self.parse_pool = parse_pool                # ParsePool: разбор страниц в отдельных процессах
+        self.max_items = max_items                  # None - лимит парсера для площадки, 0 - без ограничений
+        self.validators = validators or {}          # ETag/Last-Modified прошлого парсинга
+        self.check_first_page = check_first_page    # (ответ, товары) -> True, если страница не изменилась
+        self.unchanged = False
+        self.session = session or get_http_session()
+        self.rate_limiter = rate_limiter
+        self.on_products = on_products
+        self.max_pages = max_pages                  # None - до первой страницы без новых товаров
+        self.page_size = page_size
+        self.timeout = timeout
+        self.bytes_received = 0
+
+    @staticmethod
+    def supports(url):
+        return 'ggsel' in url or 'plati' in url
+
+    @staticmethod
+    def plati_query(url):
+        """Строка поиска из адреса plati вида /search/<запрос> или None"""
+        parts = urlparse(url)
+        if 'plati' in parts.netloc and parts.path.startswith('/search/'):
+            return unquote(parts.path[len('/search/'):].strip('/')) or None
+        return None
+
+    @staticmethod
+    def plati_params(query, page, page_size):
+        return {'query': query, 'pagesize': page_size, 'pagenum': page, 'visibleOnly': 'true',
+                'response': 'json'}
+
+    def fetch(self, url):
+        """Товары со всех страниц каталога в формате ProductParser"""
+        query = self.plati_query(url)
+        if query:
+            return self.fetch_plati_search(query)
+        return self.fetch_pages(url)
+
+    def _get(self, url, params=None, headers=None):
+        if self.rate_limiter:
+            with self.rate_limiter.slot(url):
+                resp = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        else:
+            resp = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        resp.raise_for_status()
+        self.bytes_received += len(resp.content)
+        return resp
+
+    def _item_limit(self, site):
+        """Общий лимит товаров каталога; 0 - без ограничений"""
+        return self.parser.limit(site) if self.max_items is None else self.max_items
+
+    def _pages(self):
+        return count(1) if self.max_pages is None else range(1, self.max_pages + 1)
+
+    def _parse(self, text, url):
+        if self.parse_pool:
+            return self.parse_pool.parse(self.parser, text, url)
+        return self.parser.iter_products(text, url)
+
+    def _conditional_headers(self):
+        """Условный запрос первой страницы: 304 вместо тела, если сервер поддерживает валидаторы"""
+        headers = {}
+        if self.validators.get('etag'):
+            headers['If-None-Match'] = self.validators['etag']
+        if self.validators.get('last_modified'):
+            headers['If-Modified-Since'] = self.validators['last_modified']
+        return headers or None
+
+    def _first_page_unchanged(self, resp, products):
+        """Проверка первой страницы; при совпадении с прошлым парсингом обход прекращается"""
+        if self.check_first_page and self.check_first_page(resp, products):
+            self.unchanged = True
+        return self.unchanged
+
+    def fetch_pages(self, url):
+        """
+        Постраничная загрузка серверной разметки каталога.
+
+        Карточки разбираются теми же parse_ggsel/parse_plati, что и в браузерном
+        режиме. Обход останавливается, когда очередная страница не дает новых товаров.
+        """
+        products = []
+        seen = set()
+        limit = self._item_limit(self.parser.site(url))
+        is_main = url.rstrip('/') == 'https://ggsel.net'
+        
+        for page in range(1, 2) if is_main else self._pages():
+            page_url = url if page == 1 else full_url(url, {'page': page})
+            resp = self._get(page_url, headers=self._conditional_headers() if page == 1 else None)
+            if page == 1 and resp.status_code == 304:
+                self._first_page_unchanged(resp, [])
+                return []
+            
+            new_products = []
+            for p in self._parse(resp.text, url):
+                key = product_key(p)
+                if key not in seen:
+                    seen.add(key)
+                    new_products.append(p)
+            
+            if page == 1 and self._first_page_unchanged(resp, new_products):
+                return []
+            if not new_products:
+                break
+            products.extend(new_products)
+            if self.on_products:
+                self.on_products(new_products)
+            print(f"HTTP: страница {page}, новых товаров {len(new_products)}")
+            if limit and len(products) >= limit:
+                break
+        
+        return products
+
+    @staticmethod
+    def plati_products(items):
+        """Товары из ответа API поиска plati.io"""
+        products = []
+        for item in items:
+            try:
+                price = float(str(item.get('price_rur', '')).replace(',', '.'))
+            except ValueError:
+                continue
+            
+            link = item.get('url') or ''
+            if not link and item.get('id'):
+                link = f"https://plati.market/itm/{item['id']}"
+            
+            products.append({
+                'name': item.get('name', ''),
+                'price': price,
+                'sales': int(item.get('numsold') or 0),
+                'link': link,
+                'category': ''
+            })
+        return products
+
+    def fetch_plati_search(self, query):
+        """Поиск plati через JSON API plati.io; повторы между страницами отбрасываются, как в fetch_pages"""
+        products = []
+        seen = set()
+        limit = self._item_limit('plati')
+        
+        for page in self._pages():
+            resp = self._get(self.PLATI_SEARCH_API, params=self.plati_params(query, page, self.page_size),
+                             headers=self._conditional_headers() if page == 1 else None)
+            if page == 1 and resp.status_code == 304:
+                self._first_page_unchanged(resp, [])
+                return []
+            data = resp.json()
+            
+            items = data.get('items') or []
+            new_products = []
+            for p in self.plati_products(items):
+                key = product_key(p)
+                if key not in seen:
+                    seen.add(key)
+                    new_products.append(p)
+            
+            if page == 1 and self._first_page_unchanged(resp, new_products):
+                return []
+            if not new_products:
+                break
+            products.extend(new_products)
+            if self.on_products:
+                self.on_products(new_products)
+            
+            total_pages = int(data.get('Totalpages') or data.get('totalpages') or 1)
+            print(f"HTTP: plati.io страница {page}/{total_pages}, новых товаров {len(new_products)}")
+            if page >= total_pages:
+                break
+            if limit and len(products) >= limit:
+                break
+        
+        return products
+
+
+DRIVER_POOL_SIZE = 2        # сколько браузеров держать запущенными одновременно
+DRIVER_MAX_PAGES = 20       # после стольких страниц браузер пересоздается
+BROWSER_LEAN = True         # облегченный профиль: без картинок, шрифтов, медиа и счетчиков
+BROWSER_CACHE_DIR = os.environ.get('PRODUCT_PARSER_CACHE',
+                                   os.path.join(os.path.expanduser('~'), '.product_parser', 'browser_cache'))
+BROWSER_CACHE_SIZE = 200 * 2**20
+BROWSER_CACHE_SLOTS = 16    # каталогов кэша на все пулы и процессы; при нехватке браузер работает без кэша
+
+# Запросы, ненужные для чтения текста карточек. Шаблоны Network.setBlockedURLs: * - любая подстрока
+BLOCKED_EXTENSIONS = ['png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp',
+                      'woff', 'woff2', 'ttf', 'otf', 'eot',
+                      'mp4', 'webm', 'mp3', 'ogg', 'm3u8']
+BLOCKED_HOSTS = ['google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+                 'mc.yandex.ru', 'an.yandex.ru', 'yandex.ru/ads', 'top-fwz1.mail.ru', 'vk.com/rtrg',
+                 'connect.facebook.net', 'hotjar.com', 'criteo.com', 'adriver.ru', 'jivosite.com',
+                 'code.jivo.ru', 'cdn.carrotquest.io']
+BLOCKED_URLS = ([f"*.{ext}" for ext in BLOCKED_EXTENSIONS] + [f"*.{ext}?*" for ext in BLOCKED_EXTENSIONS]
+                + [f"*{host}*" for host in BLOCKED_HOSTS])
+
+
+class DriverPool:
+    """
+    Пул долгоживущих Chrome WebDriver, переиспользуемых между запусками парсера.
+
+    В облегченном профиле (lean) браузер не грузит картинки, шрифты, медиа и
+    сторонние счетчики, а дисковый кэш хранится между запусками. Chrome не
+    делит кэш между процессами, поэтому каждый браузер занимает свой каталог
+    под файловой блокировкой <номер>.lock: ее видят и другие пулы, и другие
+    процессы (окно, командная строка, мониторинг), а после падения процесса
+    система снимает ее сама.
+    """
+
+    def __init__(self, size=DRIVER_POOL_SIZE, max_pages=DRIVER_MAX_PAGES, lean=BROWSER_LEAN,
+                 cache_dir=BROWSER_CACHE_DIR):
+        self.size = size
+        self.max_pages = max_pages
+        self.lean = lean
+        self.cache_dir = cache_dir
+        self._idle = []
+        self._pages = {}
+        self._origins = {}
+        self._caches = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._service_path = None
+
+    def _options(self, cache=None):
+        from selenium.webdriver.chrome.options import Options
+        
+        options = Options()
+        options.add_argument('--headless')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--window-size=1920,1080')
+        options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+        
+        if self.lean:
+            options.add_argument('--disable-extensions')
+            options.add_argument('--disable-component-extensions-with-background-pages')
+            options.add_argument('--disable-background-networking')
+            options.add_argument('--disable-component-update')
+            options.add_argument('--disable-default-apps')
+            options.add_argument('--disable-sync')
+            options.add_argument('--disable-features=Translate,MediaRouter,OptimizationHints')
+            options.add_argument('--no-first-run')
+            options.add_argument('--mute-audio')
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+            if cache is not None:
+                options.add_argument(f'--disk-cache-dir={cache}')
+                options.add_argument(f'--disk-cache-size={BROWSER_CACHE_SIZE}')
+        return options
+
+    def _create(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        
+        cache, lock = self._lock_cache() if self.lean and self.cache_dir else (None, None)
+        options = self._options(cache)
+        
+        try:
+            if self._service_path is None:
+                try:
+                    driver = webdriver.Chrome(options=options)
+                except Exception:
+                    # Драйвер скачивается один раз, дальше используется сохраненный путь
+                    from webdriver_manager.chrome import ChromeDriverManager
+                    self._service_path = ChromeDriverManager().install()
+                    driver = webdriver.Chrome(service=Service(self._service_path), options=options)
+            else:
+                driver = webdriver.Chrome(service=Service(self._service_path), options=options)
+        except Exception:
+            self._free_cache(lock)
+            raise
+        
+        self._caches[id(driver)] = lock
+        if self.lean:
+            self._block_resources(driver)
+        return driver
+
+    def _lock_cache(self):
+        """(каталог кэша, открытый файл блокировки) первого свободного слота или (None, None)"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError:
+            return None, None
+        for slot in range(BROWSER_CACHE_SLOTS):
+            try:
+                lock = open(os.path.join(self.cache_dir, f'{slot}.lock'), 'a+')
+            except OSError:
+                return None, None
+            try:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                elif msvcrt:
+                    lock.seek(0)
+                    msvcrt.locking(lock.fileno(), msvcrt.LK_NBLCK, 1)
+            except OSError:
+                lock.close()
+                continue
+            cache = os.path.join(self.cache_dir, str(slot))
+            os.makedirs(cache, exist_ok=True)
+            return cache, lock
+        return None, None
+
+    @staticmethod
+    def _free_cache(lock):
+        """Закрытие файла снимает блокировку слота"""
+        if lock is not None:
+            lock.close()
+
+    @staticmethod
+    def _block_resources(driver):
+        """Блокировка ненужных запросов через CDP: действует на вкладку до закрытия браузера"""
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URLS})
+        except Exception as e:
+            print(f"Не удалось включить блокировку запросов: {e}")
+
+    def _healthy(self, driver):
+        try:
+            return driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def _quit(self, driver):
+        self._pages.pop(id(driver), None)
+        self._origins.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        # Каталог кэша освобождается только после выхода браузера
+        self._free_cache(self._caches.pop(id(driver), None))
+
+    def _reset(self, driver):
+        """Очистка cookies и хранилищ после задания, чтобы следующее начиналось с чистой сессии"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        
+        origin = self._origins.pop(id(driver), None)
+        driver.delete_all_cookies()
+        if origin:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': origin,
+                'storageTypes': 'local_storage,session_storage,indexeddb,service_workers'
+            })
+        driver.get('about:blank')
+
+    def acquire(self):
+        """Свободный браузер из пула; новый запускается только при отсутствии живых"""
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    driver = self._idle.pop() if self._idle else None
+                if driver is None:
+                    driver = self._create()
+                    self._pages[id(driver)] = 0
+                    return driver
+                if self._healthy(driver):
+                    return driver
+                print("Браузер из пула не отвечает, перезапуск...")
+                self._quit(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, pages=1):
+        """Возврат браузера в пул после задания"""
+        try:
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + pages
+            try:
+                parts = urlparse(driver.current_url)
+                if parts.scheme.startswith('http'):
+                    self._origins[id(driver)] = f"{parts.scheme}://{parts.netloc}"
+            except Exception:
+                pass
+            
+            if self._pages[id(driver)] >= self.max_pages:
+                print(f"Браузер обработал {self._pages[id(driver)]} страниц, пересоздание")
+                self._quit(driver)
+                return
+            
+            try:
+                self._reset(driver)
+            except Exception:
+                self._quit(driver)
+                return
+            
+            with self._lock:
+                self._idle.append(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def shutdown(self):
+        """Закрытие всех простаивающих браузеров"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+
+
+driver_pool = DriverPool()
+atexit.register(driver_pool.shutdown)
+
+BATCH_WORKERS = 4           # потоков в пакетном режиме
+DOMAIN_CONCURRENCY = 2      # одновременных загрузок с одного домена
+DOMAIN_MIN_INTERVAL = 1.0   # минимальный интервал между запросами к домену, сек
+DOMAIN_BURST = 1            # запросов к домену подряд без паузы после простоя
+
+
+SORT_OPTIONS = ["Продажи (убывание)", "Оборот (убывание)", "Цена (возрастание)", "Цена (убывание)"]
+PRODUCT_TYPES = ["Все", "Ключ", "Гифт", "DLC", "Пополнение"]
+
+
+def sort_products(products, sort_by):
+    """Сортировка товаров по выбранному в интерфейсе критерию"""
+    if sort_by == "Продажи (убывание)":
+        products.sort(key=lambda x: x['sales'], reverse=True)
+    elif sort_by == "Цена (возрастание)":
+        products.sort(key=lambda x: x['price'])
+    elif sort_by == "Цена (убывание)":
+        products.sort(key=lambda x: x['price'], reverse=True)
+    elif sort_by == "Оборот (убывание)":
+        products.sort(key=lambda x: x['price'] * x['sales'], reverse=True)
+    return products
+
+
+SITE_HOSTS = {'ggsel.net': 'ggsel', 'ggsel.com': 'ggsel',
+              'plati.market': 'plati', 'plati.io': 'plati', 'plati.ru': 'plati'}
+OFFER_PATHS = {
+    'ggsel': re.compile(r'/catalog/product/(?:[^/]*\D)?(\d+)'),     # /catalog/product/elden-ring-key-3051213
+    'plati': re.compile(r'/itm/(?:[^/]+/)?(\d+)'),                   # /itm/elden-ring/3051213, /itm/3051213
+}
+LINK_RE = re.compile(r'(?:[A-Za-z][A-Za-z0-9+.-]*:)?(?://([^/?#]*))?([^?#]*)(?:\?([^#]*))?')   # хост, путь, параметры
+TRACKING_PARAMS = {'ai', 'ref', 'from', 'gclid', 'yclid', 'fbclid'}   # метки партнерок и рекламы (и utm_*), не товара
+LINK_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=LINK_CACHE_SIZE)
+def link_key(link):
+    """
+    Нормализованная ссылка товара: (сайт, id предложения) для ggsel и plati,
+    иначе (хост, путь, параметры) без схемы, www, якоря и меток партнерок.
+    Одно предложение из слайдера и сетки или из HTML и API plati дает один ключ.
+    """
+    host, path, query = LINK_RE.match(link).groups()
+    host = (host or '').lower().removeprefix('www.')
+    path = unquote(path).rstrip('/')
+    site = SITE_HOSTS.get(host)
+    if site:
+        m = OFFER_PATHS[site].fullmatch(path)
+        if m:
+            return site, m.group(1)
+    params = []
+    for param in (query or '').split('&'):
+        name = param.split('=', 1)[0].lower()
+        if param and name not in TRACKING_PARAMS and not name.startswith('utm_'):
+            params.append(param)
+    return host, path, '&'.join(sorted(params))
+
+
+def product_key(product):
+    """Ключ для отбора повторов: нормализованная ссылка, без нее - название и цена"""
+    link = product.get('link')
+    return link_key(link) if link else (product['name'], product['price'])
+
+
+def merge_products(product_lists):
+    """Объединение результатов нескольких страниц без повторов по ссылке"""
+    merged = []
+    seen = set()
+    for products in product_lists:
+        for p in products:
+            key = product_key(p)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(p)
+    return merged
+
+
+class UniqueBatches:
+    """
+    Потребитель пачек товаров из нескольких каталогов и потоков: каждый товар
+    передается в on_products один раз, как и в итоговом merge_products.
+    """
+
+    def __init__(self, on_products):
+        self.on_products = on_products
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, products):
+        fresh = []
+        with self._lock:
+            for p in products:
+                key = product_key(p)
+                if key not in self._seen:
+                    self._seen.add(key)
+                    fresh.append(p)
+        if fresh:
+            self.on_products(fresh)
+
+
+class DomainRateLimiter:
+    """
+    Ограничение параллельности и частоты обращений к одному домену.
+
+    Частота - корзина токенов на домен: токен добавляется раз в min_interval
+    секунд, накапливается до burst. При burst=1 запросы просто разносятся
+    на min_interval; больший burst разрешает короткий всплеск после простоя.
+    """
+
+    def __init__(self, per_domain=DOMAIN_CONCURRENCY, min_interval=DOMAIN_MIN_INTERVAL, burst=DOMAIN_BURST):
+        self.per_domain = per_domain
+        self.min_interval = min_interval
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._buckets = {}
+
+    def reserve(self, domain):
+        """Списание токена; возвращает, сколько секунд ждать до его появления"""
+        if self.min_interval <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(domain, (self.burst, now))
+            # Отрицательный остаток - токены, уже обещанные ожидающим потокам
+            tokens = min(self.burst, tokens + (now - updated) / self.min_interval) - 1
+            self._buckets[domain] = (tokens, now)
+        return -tokens * self.min_interval if tokens < 0 else 0.0
+
+    @contextmanager
+    def slot(self, url):
+        domain = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.setdefault(domain, threading.Semaphore(self.per_domain))
+        
+        with semaphore:
+            delay = self.reserve(domain)
+            if delay > 0:
+                time.sleep(delay)
+            yield
+
+
+class CardExtractor:
+    """
+    Потоковое извлечение карточек прямо в браузере.
+
+    После каждой прокрутки или нажатия "Показать ещё" скрипт возвращает только
+    появившиеся с прошлого вызова карточки в виде коротких списков строк и
+    помечает их атрибутом data-pp-seen. Полный page_source при этом не нужен.
+    """
+
+    TEXT_JS = """
+        function txt(el) {
+            if (!el) return null;
+            const parts = [];
+            const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+            while (walker.nextNode()) {
+                const t = walker.currentNode.nodeValue.trim();
+                if (t) parts.push(t);
+            }
+            return parts.join('');
+        }
+    """
+
+    GGSEL_JS = TEXT_JS + """
+        const out = [];
+        for (const card of document.querySelectorAll('div.ProductCard_card__zjTV_:not([data-pp-seen])')) {
+            if (card.closest('div.BottomGoods_cards__5r9XZ')) {
+                card.setAttribute('data-pp-seen', '1');
+                continue;
+            }
+            const q = s => card.querySelector(s);
+            const name = q('span.ProductCard_description__AXXxp') || q('div[data-testid="card-description"]');
+            const price = q('div[data-testid="card-price"]') || q('span.ProductCard_price__k1Ahq');
+            // Карточки-заглушки без цены не помечаем: они дорисуются к следующему вызову
+            if (!name || !price) continue;
+            const link = q('a[data-testid="card-link"]') || q('a[data-testid="card-button"]');
+            card.setAttribute('data-pp-seen', '1');
+            out.push([
+                txt(q('div[data-testid="card-category"]')) || '',
+                txt(name),
+                txt(price),
+                txt(q('div[data-testid="card-counter"]')),
+                link ? link.getAttribute('href') : null
+            ]);
+        }
+        return out;
+    """
+
+    PLATI_JS = TEXT_JS + """
+        const out = [];
+        for (const card of document.querySelectorAll('a.card:not([data-pp-seen])')) {
+            if (card.closest('div#rec_wrapper, div#hist_wrapper, section.suggestion, div.best-offer-slider')) {
+                card.setAttribute('data-pp-seen', '1');
+                continue;
+            }
+            if (card.parentElement && card.parentElement.classList.contains('d-none')) continue;
+            const title = txt(card.querySelector('span.footnote-medium'));
+            const price = card.querySelector('span.title-bold');
+            if (!title || !price) continue;
+            card.setAttribute('data-pp-seen', '1');
+            out.push([
+                title,
+                txt(price),
+                txt(card.querySelector('span.footnote-regular')),
+                card.getAttribute('href') || ''
+            ]);
+        }
+        return out;
+    """
+
+    def __init__(self, parser, url):
+        self.parser = parser
+        self.is_ggsel = 'ggsel' in url
+        self.script = self.GGSEL_JS if self.is_ggsel else self.PLATI_JS
+        self.max_items = parser.limit('ggsel' if self.is_ggsel else 'plati')
+        self.count = 0
+        self.seen = set()
+
+    @staticmethod
+    def supports(url):
+        return 'ggsel' in url or 'plati' in url
+
+    @property
+    def full(self):
+        return bool(self.max_items) and self.count >= self.max_items
+
+    def collect(self, driver):
+        """Товары, появившиеся на странице с прошлого вызова"""
+        if self.full:
+            return []
+        
+        try:
+            rows = driver.execute_script(self.script) or []
+        except Exception as e:
+            print(f"Ошибка потокового извлечения карточек: {e}")
+            return []
+        
+        new_products = []
+        for row in rows:
+            if self.is_ggsel:
+                category, title, price_text, sales_text, href = row
+                if self.parser.product_type != "Все" and category != self.parser.product_type:
+                    continue
+                product = self.parser._ggsel_product(category, title, price_text, sales_text, href)
+            else:
+                product = self.parser._plati_product(*row)
+            
+            if not product:
+                continue
+            key = hash(product_key(product))
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+            new_products.append(product)
+            self.count += 1
+            if self.full:
+                break
+        
+        return new_products
+
+
+def stream_products(scraper, url):
+    """Генератор пачек товаров по мере их появления на странице"""
+    batches = queue.Queue()
+    done = object()
+    
+    def worker():
+        try:
+            scraper.fetch_products(url)
+        except Exception as e:
+            batches.put(e)
+        finally:
+            batches.put(done)
+    
+    scraper.on_products = batches.put
+    threading.Thread(target=worker, daemon=True).start()
+    
+    while True:
+        batch = batches.get()
+        if batch is done:
+            return
+        if isinstance(batch, Exception):
+            raise batch
+        yield batch
+
+
+class ProductStream:
+    """
+    Потоковая обработка товаров пачками: отбор повторов, ограничение количества
+    и агрегаты по категориям.
+
+    С keep=False сами товары не накапливаются, а только передаются в on_chunk,
+    поэтому память не зависит от числа карточек в категории.
+    """
+
+    def __init__(self, chunk_size=1000, max_items=0, keep=True, on_chunk=None):
+        self.chunk_size = chunk_size
+        self.max_items = max_items
+        self.keep = keep
+        self.on_chunk = on_chunk
+        self.products = []
+        self.count = 0
+        self.duplicates = 0
+        self.categories = defaultdict(lambda: [0, 0.0, 0, 0.0])  # товаров, сумма цен, сумма продаж, оборот
+        self._chunk = []
+        self._seen = set()
+
+    @property
+    def full(self):
+        return bool(self.max_items) and self.count >= self.max_items
+
+    def add(self, product):
+        """Добавление товара; False для повторов и после достижения лимита"""
+        if self.full:
+            return False
+        key = hash(product_key(product))
+        if key in self._seen:
+            self.duplicates += 1
+            return False
+        self._seen.add(key)
+        self.count += 1
+        self._chunk.append(product)
+        if len(self._chunk) >= self.chunk_size:
+            self.flush()
+        return True
+
+    def flush(self):
+        """Агрегация и передача накопленной пачки"""
+        chunk, self._chunk = self._chunk, []
+        if not chunk:
+            return
+        for p in chunk:
+            agg = self.categories[p.get('category') or 'Без категории']
+            agg[0] += 1
+            agg[1] += p['price']
+            agg[2] += p['sales']
+            agg[3] += p['price'] * p['sales']
+        if self.keep:
+            self.products.extend(chunk)
+        if self.on_chunk:
+            self.on_chunk(chunk)
+
+    def consume(self, products):
+        """Прием пачки или итератора товаров; хвост передается сразу"""
+        for p in products:
+            if self.full:
+                break
+            self.add(p)
+        self.flush()
+        return self
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'duplicates': self.duplicates,
+            'categories': {
+                cat: {
+                    'count': n,
+                    'avg_price': price_sum / n,
+                    'avg_sales': sales_sum / n,
+                    'total_revenue': revenue
+                }
+                for cat, (n, price_sum, sales_sum, revenue) in self.categories.items()
+            }
+        }
+
+
+SNAPSHOT_DB = os.environ.get('PRODUCT_PARSER_DB',
+                             os.path.join(os.path.expanduser('~'), '.product_parser', 'snapshots.db'))
+
+
+class SnapshotStore:
+    """
+    История парсинга в SQLite: каждый результат - снимок со всеми товарами.
+
+    Журнал WAL позволяет читать историю из интерфейса во время записи нового снимка,
+    товары вставляются одной транзакцией. Индексы по ссылке и категории вместе
+    со временем снимка обслуживают запросы истории без просмотра всей таблицы.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id INTEGER PRIMARY KEY,
+            created_at REAL NOT NULL,
+            source TEXT NOT NULL,
+            product_type TEXT,
+            count INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_snapshots_created ON snapshots(created_at);
+        CREATE TABLE IF NOT EXISTS products (
+            snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+            scraped_at REAL NOT NULL,
+            link TEXT NOT NULL,
+            name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            price REAL NOT NULL,
+            sales INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_products_snapshot ON products(snapshot_id);
+        CREATE INDEX IF NOT EXISTS idx_products_link ON products(link, scraped_at);
+        CREATE INDEX IF NOT EXISTS idx_products_category ON products(category, scraped_at);
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            key TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+            fetch_seconds REAL NOT NULL,
+            fetch_bytes INTEGER NOT NULL,
+            checked_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path=SNAPSHOT_DB):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _connection(self):
+        # Отдельное соединение на операцию: запись идет из потока парсинга, чтение - из интерфейса
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save(self, products, urls, product_type=None, created_at=None):
+        """Запись снимка; возвращает его номер"""
+        created_at = time.time() if created_at is None else created_at
+        source = ' '.join(urls) if isinstance(urls, (list, tuple)) else urls
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO snapshots (created_at, source, product_type, count) VALUES (?, ?, ?, ?)",
+                (created_at, source, product_type, len(products)))
+            snapshot_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO products (snapshot_id, scraped_at, link, name, category, price, sales) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((snapshot_id, created_at, p.get('link') or '', p['name'], p.get('category') or '',
+                  p['price'], p['sales']) for p in products))
+        return snapshot_id
+
+    def snapshots(self, limit=100):
+        """Последние снимки, новые первыми"""
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT id, created_at, source, product_type, count FROM snapshots "
+                "ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [{'id': r[0], 'created_at': r[1], 'source': r[2], 'product_type': r[3], 'count': r[4]}
+                for r in rows]
+
+    def load(self, snapshot_id):
+        """Товары снимка в том порядке, в каком они были сохранены"""
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT name, price, sales, link, category FROM products "
+                "WHERE snapshot_id = ? ORDER BY rowid", (snapshot_id,)).fetchall()
+        return [{'name': name, 'price': price, 'sales': sales, 'link': link, 'category': category}
+                for name, price, sales, link, category in rows]
+
+    def product_history(self, link):
+        """Цена и продажи товара по всем снимкам: [(время, цена, продажи), ...]"""
+        with self._connection() as conn:
+            return conn.execute(
+                "SELECT scraped_at, price, sales FROM products WHERE link = ? ORDER BY scraped_at",
+                (link,)).fetchall()
+
+    def category_history(self, category):
+        """Сводка категории по снимкам: время, товаров, средние цена и продажи, оборот"""
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT scraped_at, COUNT(*), AVG(price), AVG(sales), SUM(price * sales) FROM products "
+                "WHERE category = ? GROUP BY snapshot_id ORDER BY scraped_at",
+                ('' if category == 'Без категории' else category,)).fetchall()
+        return [{'created_at': r[0], 'count': r[1], 'avg_price': r[2], 'avg_sales': r[3], 'total_revenue': r[4]}
+                for r in rows]
+
+    def related(self, snapshot_id, limit=5):
+        """Номера снимков того же источника не позже данного, новые первыми"""
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT s.id FROM snapshots s JOIN snapshots cur ON cur.id = ? "
+                "WHERE s.source = cur.source AND s.created_at <= cur.created_at "
+                "ORDER BY s.created_at DESC LIMIT ?", (snapshot_id, limit)).fetchall()
+        return [r[0] for r in rows]
+
+    def frame(self, snapshot_ids):
+        """Ссылка, время, цена и продажи товаров нескольких снимков одной таблицей"""
+        import pandas as pd
+        
+        snapshot_ids = list(snapshot_ids)
+        placeholders = ','.join('?' * len(snapshot_ids))
+        with self._connection() as conn:
+            return pd.read_sql_query(
+                f"SELECT link, scraped_at, price, sales FROM products WHERE snapshot_id IN ({placeholders})",
+                conn, params=snapshot_ids)
+
+    def get_fingerprint(self, key):
+        """Отпечаток страницы с прошлого полного парсинга или None"""
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM fingerprints WHERE key = ?", (key,)).fetchone()
+        return dict(row) if row else None
+
+    def put_fingerprint(self, key, fingerprint, snapshot_id, fetch_seconds, fetch_bytes,
+                        etag=None, last_modified=None):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (key, fingerprint, etag, last_modified, snapshot_id, "
+                "fetch_seconds, fetch_bytes, checked_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, fingerprint, etag, last_modified, snapshot_id, fetch_seconds, fetch_bytes, time.time()))
+
+    def touch_fingerprint(self, key, etag=None, last_modified=None):
+        """Отметка проверки; новые валидаторы сервера заменяют старые"""
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE fingerprints SET checked_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (time.time(), etag, last_modified, key))
+
+    def delete(self, snapshot_id):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM snapshots WHERE id = ?", (snapshot_id,))
+
+
+_snapshot_store = None
+_snapshot_store_lock = threading.Lock()
+
+
+def get_snapshot_store():
+    """Общее хранилище снимков (база создается при первом обращении)"""
+    global _snapshot_store
+    with _snapshot_store_lock:
+        if _snapshot_store is None:
+            _snapshot_store = SnapshotStore()
+        return _snapshot_store
+
+
+def save_snapshot(products, urls, product_type=None):
+    """Сохранение результата в историю; сбой базы не должен терять сам результат"""
+    try:
+        return get_snapshot_store().save(products, urls, product_type)
+    except Exception as e:
+        print(f"Не удалось сохранить снимок: {e}")
+        return None
+
+
+VELOCITY_SNAPSHOTS = 5  # сколько последних снимков источника берется для скорости продаж
+
+
+class SalesVelocity:
+    """
+    Реальный спрос по нескольким снимкам: сайты показывают накопленные продажи,
+    поэтому спрос - это прирост счетчика за время между первым и последним снимком.
+
+    Снимки соединяются по ссылке группировкой по хешу (pandas groupby), без
+    попарного сравнения списков.
+    """
+
+    MIN_DAYS = 1 / 24  # за интервал меньше часа прирост не показателен
+
+    def __init__(self, frame):
+        import pandas as pd
+        
+        frame = frame[frame['link'] != ''].sort_values('scraped_at', kind='stable')
+        grouped = frame.groupby('link', sort=False)
+        first = grouped.first()
+        last = grouped.last()
+        seen = grouped.size()
+        
+        days = (last['scraped_at'] - first['scraped_at']) / 86400
+        tracked = (seen >= 2) & (days >= self.MIN_DAYS)
+        # Счетчик мог уменьшиться (пересоздание товара, округление "1,2 тыс") - это не отрицательный спрос
+        delta = (last['sales'] - first['sales']).clip(lower=0)
+        
+        self.table = pd.DataFrame({
+            'snapshots': seen,
+            'days': days,
+            'sales_delta': delta,
+            'sales_per_day': delta / days.where(tracked),
+            'price_first': first['price'],
+            'price_last': last['price'],
+            'price_change': last['price'] - first['price']
+        })[tracked]
+        self.snapshots = frame['scraped_at'].nunique()
+        self.period_days = float(days.max()) if len(days) else 0.0
+
+    @classmethod
+    def from_snapshots(cls, snapshots):
+        """Скорость по спискам товаров в памяти: [(время, товары), ...]"""
+        import pandas as pd
+        
+        products = [p for _, batch in snapshots for p in batch]
+        return cls(pd.DataFrame({
+            'link': [p.get('link') or '' for p in products],
+            'scraped_at': np.repeat([t for t, _ in snapshots], [len(batch) for _, batch in snapshots]),
+            'price': np.fromiter((p['price'] for p in products), dtype=np.float64, count=len(products)),
+            'sales': np.fromiter((p['sales'] for p in products), dtype=np.float64, count=len(products))
+        }))
+
+    @classmethod
+    def from_store(cls, store, snapshot_id, limit=VELOCITY_SNAPSHOTS):
+        """Скорость для снимка по предыдущим снимкам того же источника; None, если снимок один"""
+        snapshot_ids = store.related(snapshot_id, limit)
+        if len(snapshot_ids) < 2:
+            return None
+        return cls(store.frame(snapshot_ids))
+
+    def __len__(self):
+        return len(self.table)
+
+    def lookup(self, links, column='sales_per_day'):
+        """Значения для списка ссылок; NaN для товаров без истории"""
+        return self.table[column].reindex(links).to_numpy(dtype=np.float64)
+
+
+class ChangeDetector:
+    """
+    Пропуск неизменившихся страниц при повторном парсинге.
+
+    Для каждого URL хранится отпечаток первой страницы (число карточек и хеш первых
+    карточек, для HTTP еще ETag/Last-Modified) и снимок с полным результатом. Если при
+    следующем парсинге первая страница совпадает, прокрутка и остальные страницы
+    не загружаются, а товары берутся из снимка.
+    """
+
+    CARDS = 20  # сколько первых карточек входит в хеш
+
+    def __init__(self, store=None):
+        self.store = store or get_snapshot_store()
+        self.stats = defaultdict(float)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url, product_type, max_items):
+        # Результат зависит от фильтра и лимита - у каждого сочетания свой отпечаток
+        return f"{url}|{product_type}|{max_items}"
+
+    @classmethod
+    def fingerprint(cls, mode, products):
+        head = '\n'.join(f"{p['link']}|{p['name']}|{p['price']}|{p['sales']}" for p in products[:cls.CARDS])
+        return f"{mode}:{len(products)}:{hashlib.sha1(head.encode('utf-8')).hexdigest()}"
+
+    def known(self, key):
+        try:
+            return self.store.get_fingerprint(key)
+        except Exception as e:
+            print(f"Отпечаток страницы недоступен: {e}")
+            return None
+
+    def remember(self, key, url, product_type, fingerprint, products, seconds, bytes_received, validators=None):
+        """Сохранение полного результата страницы и ее отпечатка; возвращает номер снимка"""
+        validators = validators or {}
+        snapshot_id = self.store.save(products, [url], product_type)
+        self.store.put_fingerprint(key, fingerprint, snapshot_id, seconds, bytes_received,
+                                   validators.get('etag'), validators.get('last_modified'))
+        with self._lock:
+            self.stats['checked'] += 1
+        return snapshot_id
+
+    def served(self, key, known, seconds, bytes_received, validators=None):
+        """Учет страницы, отданной из снимка: экономия относительно прошлого полного парсинга"""
+        validators = validators or {}
+        self.store.touch_fingerprint(key, validators.get('etag'), validators.get('last_modified'))
+        with self._lock:
+            self.stats['checked'] += 1
+            self.stats['unchanged'] += 1
+            self.stats['seconds_saved'] += max(known['fetch_seconds'] - seconds, 0)
+            self.stats['bytes_saved'] += max(known['fetch_bytes'] - bytes_received, 0)
+
+    def report(self):
+        stats = self.stats
+        if not stats['unchanged']:
+            return ""
+        return (f"без изменений {stats['unchanged']:.0f} из {stats['checked']:.0f} стр., "
+                f"сэкономлено ~{stats['seconds_saved']:.0f} с и {stats['bytes_saved'] / 1024:.0f} КБ")
+
+
+class PageScraper:
+    """Загрузка страницы и разбор товаров без привязки к Qt"""
+
+    def __init__(self, product_type="Все", fetch_mode='auto', pool=None, session=None, rate_limiter=None,
+                 stream=True, on_products=None, max_items=None, max_scrolls=None, detector=None, parse_pool=None):
+        self.parser = create_parser(product_type, max_items)
+        self.parse_pool = parse_pool    # ParsePool: разбор больших страниц в отдельных процессах
+        self.product_type = product_type
+        self.fetch_mode = fetch_mode
+        self.pool = pool or driver_pool
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.stream = stream            # извлекать карточки в браузере по мере подгрузки
+        self.on_products = on_products  # вызывается с каждой новой пачкой товаров
+        self.max_items = max_items      # None - лимиты сайтов по умолчанию, 0 - без ограничений
+        if max_scrolls is None:
+            # При заданном лимите прокрутка идет до его достижения или до конца страницы
+            max_scrolls = DEFAULT_MAX_SCROLLS if max_items is None else 0
+        self.max_scrolls = max_scrolls
+        self.pipeline = ProductStream()
+        self.wait_timings = {}
+        self.detector = detector        # ChangeDetector: неизменившиеся страницы берутся из снимка
+        self.snapshot_id = None         # снимок с результатом страницы (при включенном detector)
+        self.unchanged = False
+        self._known = None
+        self._fingerprint = None
+        self._validators = {}
+
+    def _emit(self, products):
+        """Передача новой пачки потребителю без повторов между HTTP- и браузерным режимом"""
+        self.pipeline.consume(products)
+
+    def fetch_products(self, url):
+        """HTTP-режим для ggsel и plati, браузер - как запасной вариант"""
+        # Общий лимит тот же, что у браузерного режима: заданный или по умолчанию для площадки
+        limit = self.parser.limit(self.parser.site(url))
+        self.pipeline = ProductStream(max_items=limit, on_chunk=self.on_products)
+        self.snapshot_id = None
+        self.unchanged = False
+        self._fingerprint = None
+        self._validators = {}
+        key = ChangeDetector.key(url, self.product_type, self.max_items) if self.detector else None
+        self._known = self.detector.known(key) if self.detector else None
+        started = time.perf_counter()
+        
+        if self.fetch_mode in ('auto', 'http') and HttpFetcher.supports(url):
+            try:
+                fetcher = HttpFetcher(self.parser, session=self.session, rate_limiter=self.rate_limiter,
+                                      on_products=self._emit, max_items=limit,
+                                      validators=self._known,
+                                      check_first_page=self._check_http_page if self.detector else None,
+                                      parse_pool=self.parse_pool)
+                fetcher.fetch(url)
+                if self.unchanged:
+                    return self._serve_snapshot(key, started, fetcher.bytes_received)
+                print(f"HTTP: получено {fetcher.bytes_received / 1024:.0f} КБ, товаров {self.pipeline.count}")
+                if self.pipeline.count or self.fetch_mode == 'http':
+                    self._remember(key, url, started, fetcher.bytes_received)
+                    return self.pipeline.products
+                print("HTTP-режим не вернул товаров, переключение на браузер...")
+            except Exception as e:
+                if self.fetch_mode == 'http':
+                    raise
+                print(f"HTTP-режим не сработал ({e}), переключение на браузер...")
+        
+        self._fingerprint = None
+        self._validators = {}
+        self.parse_page(url)
+        if self.unchanged:
+            return self._serve_snapshot(key, started, 0)
+        self._remember(key, url, started, 0)
+        return self.pipeline.products
+
+    def _check_unchanged(self, mode, products):
+        """Отпечаток первой страницы и сравнение с прошлым парсингом"""
+        self._fingerprint = ChangeDetector.fingerprint(mode, products)
+        self.unchanged = (self._known is not None and bool(products)
+                          and self._fingerprint == self._known['fingerprint'])
+        return self.unchanged
+
+    def _check_http_page(self, resp, products):
+        headers = {k.lower(): v for k, v in resp.headers.items()}
+        self._validators = {'etag': headers.get('etag'), 'last_modified': headers.get('last-modified')}
+        if resp.status_code == 304 and self._known is not None:
+            self.unchanged = True
+            return True
+        return self._check_unchanged('http', products)
+
+    def _serve_snapshot(self, key, started, bytes_received):
+        """Товары неизменившейся страницы из снимка прошлого парсинга"""
+        known = self._known
+        self._emit(self.detector.store.load(known['snapshot_id']))
+        self.snapshot_id = known['snapshot_id']
+        self.detector.served(key, known, time.perf_counter() - started, bytes_received, self._validators)
+        print(f"Страница не изменилась с прошлого парсинга, товаров из снимка: {self.pipeline.count}")
+        return self.pipeline.products
+
+    def _remember(self, key, url, started, bytes_received):
+        if not self.detector or not self._fingerprint or not self.pipeline.products:
+            return
+        try:
+            self.snapshot_id = self.detector.remember(
+                key, url, self.product_type, self._fingerprint, self.pipeline.products,
+                time.perf_counter() - started, bytes_received, self._validators)
+        except Exception as e:
+            print(f"Не удалось сохранить отпечаток страницы: {e}")
+
+    def _scrolling(self, attempts, extractor):
+        """Продолжать ли прокрутку: лимит прокруток и заполненность лимита товаров"""
+        if extractor and extractor.full:
+            return False
+        return not self.max_scrolls or attempts < self.max_scrolls
+
+    def parse_page(self, url):
+        if self.rate_limiter:
+            with self.rate_limiter.slot(url):
+                html = self._load_page(url)
+        else:
+            html = self._load_page(url)
+        # Итоговая разметка разбирается, когда браузер уже вернулся в пул, а слот домена свободен
+        if html is not None:
+            if self.parse_pool:
+                self._emit(self.parse_pool.parse(self.parser, html, url))
+            else:
+                self._emit(self.parser.iter_products(html, url))
+
+    def _load_page(self, url):
+        """Загрузка и прокрутка страницы в браузере; итоговая разметка или None, если товары уже извлечены"""
+        from selenium.webdriver.common.by import By
+        
+        try:
+            driver = self.pool.acquire()
+        except Exception:
+            raise RuntimeError("Не удалось инициализировать Chrome WebDriver. Установите ChromeDriver вручную.")
+        
+        try:
+            driver.get(url)
+            
+            is_ggsel = 'ggsel' in url
+            is_plati = 'plati' in url
+            is_ggsel_main = url.rstrip('/') == 'https://ggsel.net'
+            
+            extractor = None
+            if self.stream and CardExtractor.supports(url):
+                extractor = CardExtractor(self.parser, url)
+            
+            def collect_new_cards():
+                self._emit(extractor.collect(driver))
+            
+            waiter = PageWaiter(driver, on_wait=collect_new_cards if extractor else None)
+            
+            # Ждем первые карточки вместо фиксированной паузы
+            if is_ggsel or is_plati:
+                waiter.wait('load', baseline=PageWaiter.EMPTY, legacy=5 if is_ggsel_main else 3)
+            else:
+                waiter.wait('load', baseline=PageWaiter.EMPTY, until='idle', legacy=3)
+            
+            # Первые карточки совпали с прошлым парсингом - прокрутка не нужна
+            if self.detector:
+                if extractor:
+                    loaded = list(self.pipeline.products)
+                else:
+                    loaded = list(self.parser.iter_products(driver.page_source, url))
+                if self._check_unchanged('browser', loaded):
+                    self.wait_timings = waiter.report(url)
+                    return None
+            
+            # Логика для ggsel.net (главная страница - слайдер)
+            if is_ggsel_main:
+                try:
+                    # Сначала прокручиваем слайдер
+                    next_buttons = driver.find_elements(By.CSS_SELECTOR, 
+                        'button[aria-label="Next slide"], button.swiper-button-next, button[class*="next"]')
+                    
+                    if next_buttons:
+                        max_clicks = 15
+                        clicks_done = 0
+                        
+                        for i in range(max_clicks):
+                            try:
+                                active_next = None
+                                for btn in next_buttons:
+                                    try:
+                                        if btn.is_displayed() and btn.is_enabled():
+                                            classes = btn.get_attribute('class') or ''
+                                            if 'disabled' not in classes.lower():
+                                                active_next = btn
+                                                break
+                                    except:
+                                        continue
+                                
+                                if not active_next:
+                                    break
+
+                                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", active_next)
+                                time.sleep(0.3)
+                                driver.execute_script("arguments[0].click();", active_next)
+                                clicks_done += 1
+                                time.sleep(0.5)
+
+                                next_buttons = driver.find_elements(By.CSS_SELECTOR, 
+                                    'button[aria-label="Next slide"], button.swiper-button-next, button[class*="next"]')
+                                
+                            except Exception:
+                                break
+                        
+                        waiter.wait('slider', until='idle', legacy=2)
+                    
+                    # ТЕПЕРЬ прокручиваем всю страницу вниз для подгрузки товаров
+                    print("Прокрутка главной страницы ggsel.net для загрузки всех товаров...")
+                    
+                    last_height = driver.execute_script("return document.body.scrollHeight")
+                    scroll_attempts = 0
+                    no_change_count = 0
+                    
+                    while self._scrolling(scroll_attempts, extractor):
+                        # Прокрутка вниз порциями
+                        current_position = driver.execute_script("return window.pageYOffset;")
+                        scroll_step = 800
+                        
+                        before = waiter.snapshot()
+                        driver.execute_script(f"window.scrollTo(0, {current_position + scroll_step});")
+                        # Подгрузка срабатывает только у нижнего края, в середине страницы ждем лишь простоя сети
+                        until = 'cards' if waiter.near_bottom() else 'idle'
+                        grew = waiter.wait('scroll', baseline=before, until=until,
+                                           legacy=4 if (scroll_attempts + 1) % 3 == 0 else 2.5)
+                        
+                        # Проверяем изменение высоты страницы
+                        new_height = driver.execute_script("return document.body.scrollHeight")
+                        
+                        if new_height == last_height and not grew:
+                            no_change_count += 1
+                            # Если высота не менялась 3 раза подряд - достигли конца
+                            if no_change_count >= 3:
+                                print(f"Достигнут конец главной страницы ({scroll_attempts} прокруток)")
+                                break
+                                
+                            # Еще одна попытка докрутить до самого низа
+                            before = waiter.snapshot()
+                            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                            waiter.wait('scroll_bottom', baseline=before, legacy=2)
+                        else:
+                            no_change_count = 0
+                        
+                        last_height = new_height
+                        scroll_attempts += 1
+                    
+                    # Финальная прокрутка
+                    before = waiter.snapshot()
+                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    waiter.wait('final', baseline=before, legacy=3)
+                    
+                    print(f"Прокрутка главной страницы завершена. Выполнено {scroll_attempts} прокруток")
+                    
+                except Exception as e:
+                    print(f"Ошибка при обработке главной страницы: {e}")
+            
+            # Логика для ggsel.net (категории - кнопка "Показать ещё")
+            elif is_ggsel:
+                try:
+                    print("Загрузка товаров ggsel.net через кнопку 'Показать ещё'...")
+                    
+                    attempts = 0
+                    
+                    while self._scrolling(attempts, extractor):
+                        try:
+                            # Прокрутка вниз
+                            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                            waiter.wait('scroll', until='idle', legacy=2)
+                            
+                            # Поиск кнопки по data-test атрибуту (самый надежный селектор)
+                            try:
+                                button = driver.find_element(By.CSS_SELECTOR, 'button[data-test="showMore"]')
+                            except:
+                                # Альтернативный поиск по тексту
+                                try:
+                                    button = driver.find_element(By.XPATH, 
+                                        "//button[contains(., 'Показать ещё') or contains(., 'Показать еще')]")
+                                except:
+                                    print(f"Кнопка 'Показать ещё' не найдена. Все товары загружены ({attempts} нажатий)")
+                                    break
+                            
+                            # Проверка видимости
+                            if not button.is_displayed():
+                                break
+                            
+                            # Прокрутка к кнопке
+                            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
+                            
+                            # Клик через JavaScript
+                            before = waiter.snapshot()
+                            driver.execute_script("arguments[0].click();", button)
+                            attempts += 1
+                            print(f"Нажатие на 'Показать ещё' #{attempts}")
+                            
+                            # Ожидание загрузки: выходим, как только появились новые карточки
+                            waiter.wait('show_more', baseline=before, legacy=4)
+                            
+                        except Exception as e:
+                            print(f"Ошибка при нажатии кнопки: {e}")
+                            break
+                    
+                    # Финальная прокрутка
+                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    waiter.wait('final', until='idle', legacy=2)
+                    
+                    print(f"Загрузка завершена. Выполнено {attempts} нажатий на 'Показать ещё'")
+                    
+                except Exception as e:
+                    print(f"Ошибка при загрузке товаров ggsel: {e}")
+            
+            # Логика для plati.market (динамическая подгрузка при скролле)
+            elif is_plati:
+                try:
+                    print("Постепенная прокрутка страницы plati.market...")
+                    
+                    last_height = driver.execute_script("return document.body.scrollHeight")
+                    scroll_attempts = 0
+                    no_change_count = 0  # Счетчик для отслеживания отсутствия изменений
+                    
+                    while self._scrolling(scroll_attempts, extractor):
+                        # Плавная прокрутка по частям
+                        current_position = driver.execute_script("return window.pageYOffset;")
+                        scroll_step = 500  # Уменьшено с 800 до 500px для более плавной прокрутки
+                        
+                        before = waiter.snapshot()
+                        driver.execute_script(f"window.scrollTo(0, {current_position + scroll_step});")
+                        until = 'cards' if waiter.near_bottom() else 'idle'
+                        grew = waiter.wait('scroll', baseline=before, until=until,
+                                           legacy=3.5 if (scroll_attempts + 1) % 3 == 0 else 2)
+                        
+                        # Проверка достижения конца страницы
+                        new_height = driver.execute_script("return document.body.scrollHeight")
+                        
+                        if new_height == last_height and not grew:
+                            no_change_count += 1
+                            # Если высота не менялась 3 раза подряд - достигли конца
+                            if no_change_count >= 3:
+                                print(f"Достигнут конец страницы plati.market ({scroll_attempts} прокруток)")
+                                break
+                                
+                            # Попытка прокрутки в самый низ
+                            before = waiter.snapshot()
+                            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                            waiter.wait('scroll_bottom', baseline=before, legacy=2)
+                        else:
+                            no_change_count = 0  # Сброс счетчика при изменении высоты
+                        
+                        last_height = new_height
+                        scroll_attempts += 1
+                    
+                    # Финальная прокрутка вниз
+                    before = waiter.snapshot()
+                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    waiter.wait('final', baseline=before, legacy=3)
+                    
+                    print(f"Прокрутка завершена. Выполнено {scroll_attempts} прокруток")
+                    
+                except Exception as e:
+                    print(f"Ошибка при прокрутке plati: {e}")
+            
+            # Для остальных сайтов - стандартная прокрутка
+            else:
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
+                waiter.wait('scroll', until='idle', legacy=1)
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                waiter.wait('final', until='idle', legacy=2)
+            
+            site = 'ggsel.net' if is_ggsel else 'plati.market' if is_plati else url
+            self.wait_timings = waiter.report(site)
+            
+            if extractor:
+                collect_new_cards()
+                print(f"Потоковое извлечение: {extractor.count} товаров")
+                return None
+            
+            return driver.page_source
+        finally:
+            self.pool.release(driver)
+
+
+class OpportunitiesReport:
+    """
+    HTML-отчет вкладки "Возможности": ТОП по обороту, реальный спрос,
+    аномалии и ценовые сегменты. Собирается из уже посчитанной аналитики
+    списком частей и одним join, поэтому его можно строить в фоновом потоке
+    и отдавать интерфейсу готовым документом.
+    """
+
+    TABLE = "<table style='width: 100%; border-collapse: collapse;'>"
+    HEADER_ROW = "<tr style='background: #f8f9fa; font-weight: bold;'>"
+    ROW = "<tr style='border-bottom: 1px solid #e9ecef;'>"
+    CELL = "<td style='padding: 8px; text-align: center;'>"
+    NAME_LENGTH = 60
+
+    def __init__(self, top_products, anomalies, segment_stats, velocity_leaders=None, velocity=None):
+        self.top_products = top_products
+        self.anomalies = anomalies
+        self.segment_stats = segment_stats
+        self.velocity_leaders = velocity_leaders or []
+        self.velocity = velocity
+
+    @classmethod
+    def from_analytics(cls, analytics):
+        return cls(analytics.get_top_products(), analytics.get_anomalies(), analytics.get_price_segments(),
+                   analytics.get_velocity_leaders(), analytics.velocity)
+
+    @classmethod
+    def _name(cls, item):
+        return escape(item['name'][:cls.NAME_LENGTH], quote=False)
+
+    def _header(self, parts, titles, first_left=True):
+        parts.append(self.TABLE)
+        parts.append(self.HEADER_ROW)
+        for i, title in enumerate(titles):
+            align = " text-align: left;" if first_left and i == 0 else ""
+            parts.append(f"<th style='padding: 10px;{align}'>{title}</th>")
+        parts.append("</tr>")
+
+    def _anomalies(self, parts, key, title, color, item_html):
+        items = self.anomalies[key]
+        if not items:
+            return
+        parts.append(f"<h2 style='color: {color};'>{title}</h2><ul>")
+        parts.extend(item_html(item) for item in items[:5])
+        parts.append("</ul><br>")
+
+    def html(self):
+        parts = ["<html><body style='font-family: Segoe UI; padding: 20px;'>"]
+
+        # ТОП-10 товаров
+        parts.append("<h2 style='color: #667eea;'>🏆 ТОП-10 товаров по обороту</h2>")
+        self._header(parts, ["Товар", "Цена", "Продажи", "Оборот"])
+        for p in self.top_products:
+            parts.append(
+                f"{self.ROW}<td style='padding: 8px;'>{self._name(p)}</td>"
+                f"{self.CELL}{p['price']:.2f} ₽</td>{self.CELL}{p['sales']}</td>"
+                f"<td style='padding: 8px; text-align: center; color: #667eea; font-weight: bold;'>"
+                f"{p['revenue']:,.0f} ₽</td></tr>")
+        parts.append("</table><br><br>")
+
+        # Реальный спрос по истории снимков
+        if self.velocity_leaders:
+            parts.append("<h2 style='color: #27ae60;'>🔥 Реальный спрос (продаж в день)</h2>")
+            parts.append(f"<p style='color: #666;'>Прирост счетчика продаж по {self.velocity.snapshots} снимкам "
+                         f"за {self.velocity.period_days:.1f} дн.</p>")
+            self._header(parts, ["Товар", "Цена", "Изменение цены", "Продаж в день"])
+            for p in self.velocity_leaders:
+                change = p['price_change']
+                change_color = "#e74c3c" if change > 0 else "#27ae60" if change < 0 else "#666"
+                parts.append(
+                    f"{self.ROW}<td style='padding: 8px;'>{self._name(p)}</td>"
+                    f"{self.CELL}{p['price']:.2f} ₽</td>"
+                    f"<td style='padding: 8px; text-align: center; color: {change_color};'>{change:+.2f} ₽</td>"
+                    f"<td style='padding: 8px; text-align: center; color: #27ae60; font-weight: bold;'>"
+                    f"{p['sales_per_day']:.1f}</td></tr>")
+            parts.append("</table><br><br>")
+
+        self._anomalies(
+            parts, 'premium_demand', "💎 Премиум-спрос (высокая цена + высокие продажи)", "#27ae60",
+            lambda item: (f"<li><b>{self._name(item)}</b> - {item['price']:.2f} ₽, продажи: {item['sales']}<br>"
+                          f"<i style='color: #666;'>{escape(item['reason'])}</i></li>"))
+        self._anomalies(
+            parts, 'opportunities', "💡 Возможности (можно поднять цену)", "#f39c12",
+            lambda item: (f"<li><b>{self._name(item)}</b><br>"
+                          f"Текущая цена: {item['price']:.2f} ₽ | Средняя в категории: {item['avg_price']:.2f} ₽<br>"
+                          f"<span style='color: #27ae60; font-weight: bold;'>Потенциал "
+                          f"+{(item['avg_price'] - item['price']) * item['sales']:,.0f} ₽</span><br>"
+                          f"<i style='color: #666;'>{escape(item['reason'])}</i></li>"))
+        self._anomalies(
+            parts, 'low_performance', "⚠️ Низкая эффективность (требуется улучшение)", "#e74c3c",
+            lambda item: (f"<li><b>{self._name(item)}</b> - {item['price']:.2f} ₽, продажи: {item['sales']}<br>"
+                          f"<i style='color: #666;'>{escape(item['reason'])}</i></li>"))
+
+        # Анализ сегментов
+        parts.append("<h2 style='color: #667eea;'>💰 Анализ ценовых сегментов</h2>")
+        self._header(parts, ["Сегмент", "Товаров", "Ср. продажи", "Оборот"], first_left=False)
+        for seg in self.segment_stats:
+            parts.append(
+                f"{self.ROW}{self.CELL}{seg['segment']}</td>{self.CELL}{seg['count']}</td>"
+                f"{self.CELL}{seg['avg_sales']:.0f}</td>"
+                f"<td style='padding: 8px; text-align: center; font-weight: bold;'>"
+                f"{seg['total_revenue']:,.0f} ₽</td></tr>")
+        parts.append("</table></body></html>")
+        return ''.join(parts)
+
+
+class ExcelReport:
+    """
+    Отчет xlsx в потоковом режиме: строки сразу пишутся во временный файл и не
+    хранятся объектами ячеек, поэтому память не растет с числом товаров. Ширина
+    колонок считается по длинам значений до записи.
+
+    Пишет через xlsxwriter (constant_memory), если он установлен, иначе через
+    openpyxl в режиме write_only.
+    """
+
+    PROGRESS_STEP = 5000  # строк между сообщениями о прогрессе
+
+    def __init__(self, products, category_stats, top_products):
+        self.products = products
+        self.category_stats = category_stats
+        self.top_products = top_products
+
+    @classmethod
+    def from_analytics(cls, products, analytics):
+        return cls(products, analytics.get_category_stats(), analytics.get_top_products())
+
+    def sheets(self):
+        """(название, заголовки, цвет заголовка, строки, предел ширины) для каждого листа"""
+        return [
+            ("Товары", ["Название", "Категория", "Цена", "Продажи", "Оборот", "Ссылка"], "667eea",
+             lambda: ((p['name'], p.get('category', ''), p['price'], p['sales'], p['price'] * p['sales'], p['link'])
+                      for p in self.products), len(self.products), 50),
+            ("Анализ ниш", ["Категория", "Конкуренты", "Ср. цена", "Ср. продажи", "Продаж в день", "Оборот",
+                            "Индекс", "Рекомендация"], "667eea",
+             lambda: ((stat['category'],
+                       stat['competitors'],
+                       round(stat['avg_price'], 2),
+                       round(stat['avg_sales'], 0),
+                       None if stat['sales_per_day'] is None else round(stat['sales_per_day'], 1),
+                       round(stat['total_revenue'], 0),
+                       round(stat['attractiveness'], 2),
+                       stat['recommendation']) for stat in self.category_stats), len(self.category_stats), 40),
+            ("ТОП-10", ["Название", "Категория", "Цена", "Продажи", "Оборот"], "27ae60",
+             lambda: ((p['name'], p.get('category', ''), p['price'], p['sales'], p['revenue'])
+                      for p in self.top_products), len(self.top_products), 50),
+        ]
+
+    @staticmethod
+    def column_widths(headers, rows, limit):
+        """Ширина по самому длинному значению колонки (с заголовком), не больше limit"""
+        lengths = [len(str(h)) for h in headers]
+        for row in rows:
+            for i, value in enumerate(row):
+                if value is not None:
+                    n = len(str(value))
+                    if n > lengths[i]:
+                        lengths[i] = n
+        return [min(n + 2, limit) for n in lengths]
+
+    def write(self, filename, on_progress=None):
+        sheets = self.sheets()
+        total = max(sum(count for _, _, _, _, count, _ in sheets), 1)
+        
+        def report(written):
+            if on_progress and written % self.PROGRESS_STEP == 0:
+                on_progress(int(95 * written / total))
+        
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+        if xlsxwriter is not None:
+            self._write_xlsxwriter(xlsxwriter, filename, sheets, report)
+        else:
+            self._write_openpyxl(filename, sheets, report)
+        if on_progress:
+            on_progress(100)
+
+    def _write_xlsxwriter(self, xlsxwriter, filename, sheets, report):
+        # Строки пишутся как есть: без распознавания ссылок и формул (как и в openpyxl)
+        wb = xlsxwriter.Workbook(filename, {'constant_memory': True, 'strings_to_urls': False,
+                                            'strings_to_formulas': False})
+        written = 0
+        try:
+            for title, headers, color, rows, _, limit in sheets:
+                ws = wb.add_worksheet(title)
+                for i, width in enumerate(self.column_widths(headers, rows(), limit)):
+                    ws.set_column(i, i, width)
+                
+                header_format = wb.add_format({'bold': True, 'font_color': '#FFFFFF', 'bg_color': f"#{color}",
+                                               'align': 'center', 'valign': 'vcenter'})
+                ws.write_row(0, 0, headers, header_format)
+                # Типизированная запись дешевле универсальной write_row с разбором каждого значения
+                write_string = ws.write_string
+                write_number = ws.write_number
+                for r, row in enumerate(rows(), 1):
+                    for c, value in enumerate(row):
+                        if isinstance(value, str):
+                            if value:
+                                write_string(r, c, value)
+                        elif value is not None:
+                            write_number(r, c, value)
+                    written += 1
+                    report(written)
+        finally:
+            wb.close()
+
+    def _write_openpyxl(self, filename, sheets, report):
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
+        
+        wb = Workbook(write_only=True)
+        written = 0
+        
+        for title, headers, color, rows, _, limit in sheets:
+            ws = wb.create_sheet(title)
+            # В потоковом режиме размеры колонок задаются до первой строки
+            for i, width in enumerate(self.column_widths(headers, rows(), limit), 1):
+                ws.column_dimensions[get_column_letter(i)].width = width
+            
+            header_cells = []
+            for header in headers:
+                cell = WriteOnlyCell(ws, value=header)
+                cell.font = Font(bold=True, color="FFFFFF")
+                cell.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+                cell.alignment = Alignment(horizontal='center', vertical='center')
+                header_cells.append(cell)
+            ws.append(header_cells)
+            
+            for row in rows():
+                ws.append(row)
+                written += 1
+                report(written)
+        
+        wb.save(filename)
+
+
+class ProductExporter:
+    """
+    Машиночитаемая выгрузка товаров и статистики категорий: Parquet, Arrow/Feather
+    и CSV. Формат выбирается по расширению файла.
+
+    CSV пишется пачками по CSV_CHUNK строк, без таблицы всего списка в памяти.
+    Parquet и Feather требуют pyarrow.
+    """
+
+    FORMATS = {'.parquet': 'parquet', '.pq': 'parquet', '.feather': 'feather', '.arrow': 'feather', '.csv': 'csv'}
+    PRODUCT_COLUMNS = ['name', 'category', 'price', 'sales', 'revenue', 'link']
+    STAT_COLUMNS = ['category', 'competitors', 'avg_price', 'avg_sales', 'price_std', 'sales_std', 'total_revenue',
+                    'attractiveness', 'tracked', 'sales_per_day', 'avg_sales_per_day', 'demand_level',
+                    'competition_level', 'score', 'recommendation']
+    CSV_CHUNK = 50000
+
+    def __init__(self, products, analytics=None):
+        self.products = products
+        self.analytics = analytics
+
+    @classmethod
+    def format_of(cls, path):
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in cls.FORMATS:
+            raise ValueError(f"Неизвестный формат '{ext}', поддерживаются: {', '.join(sorted(cls.FORMATS))}")
+        return cls.FORMATS[ext]
+
+    def _product_rows(self, products):
+        return {
+            'name': [p['name'] for p in products],
+            'category': [p.get('category') or '' for p in products],
+            'price': np.fromiter((p['price'] for p in products), dtype=np.float64, count=len(products)),
+            'sales': np.fromiter((p['sales'] for p in products), dtype=np.int64, count=len(products)),
+            'revenue': np.fromiter((p['price'] * p['sales'] for p in products), dtype=np.float64, count=len(products)),
+            'link': [p['link'] for p in products]
+        }
+
+    def product_frame(self, products=None):
+        import pandas as pd
+        
+        products = self.products if products is None else products
+        frame = pd.DataFrame(self._product_rows(products), columns=self.PRODUCT_COLUMNS)
+        if self.analytics is not None and self.analytics.velocity is not None:
+            frame['sales_per_day'] = self.analytics.velocity.lookup(frame['link'].tolist())
+        return frame
+
+    def stats_frame(self):
+        import pandas as pd
+        
+        stats = self.analytics.get_category_stats() if self.analytics is not None else []
+        return pd.DataFrame([{key: stat[key] for key in self.STAT_COLUMNS} for stat in stats],
+                            columns=self.STAT_COLUMNS)
+
+    def write_products(self, path):
+        """Выгрузка товаров; возвращает число строк"""
+        fmt = self.format_of(path)
+        if fmt == 'csv':
+            return self._write_csv_chunks(path)
+        self._write_frame(self.product_frame(), path, fmt)
+        return len(self.products)
+
+    def comparison_frame(self):
+        """Цены одного товара на разных площадках (identity.ProductIdentityIndex)"""
+        import pandas as pd
+        from identity import ProductIdentityIndex
+        
+        return pd.DataFrame(ProductIdentityIndex(self.products).cross_site(),
+                            columns=ProductIdentityIndex.COMPARE_COLUMNS)
+
+    def write_stats(self, path):
+        return self._write_table(self.stats_frame(), path)
+
+    def write_comparison(self, path):
+        return self._write_table(self.comparison_frame(), path)
+
+    def _write_table(self, frame, path):
+        fmt = self.format_of(path)
+        if fmt == 'csv':
+            frame.to_csv(path, index=False, encoding='utf-8')
+        else:
+            self._write_frame(frame, path, fmt)
+        return len(frame)
+
+    def _write_csv_chunks(self, path):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            for start in range(0, max(len(self.products), 1), self.CSV_CHUNK):
+                chunk = self.product_frame(self.products[start:start + self.CSV_CHUNK])
+                chunk.to_csv(f, index=False, header=start == 0)
+        return len(self.products)
+
+    @staticmethod
+    def _write_frame(frame, path, fmt):
+        try:
+            if fmt == 'parquet':
+                frame.to_parquet(path, index=False)
+            else:
+                frame.to_feather(path)
+        except ImportError as e:
+            raise RuntimeError(f"Для формата {fmt} нужен pyarrow (pip install pyarrow): {e}")
+
+
+class BatchScraper:
+    """Параллельный парсинг списка URL с объединением результатов (без привязки к Qt)"""
+
+    def __init__(self, urls, product_type="Все", fetch_mode='auto', max_workers=BATCH_WORKERS, max_items=None,
+                 detector=None, on_products=None, on_url_progress=None, on_progress=None,
+                 parse_processes=PARSE_PROCESSES):
+        self.urls = urls
+        self.parse_processes = parse_processes  # 0 - разбор в потоках загрузки
+        self.product_type = product_type
+        self.fetch_mode = fetch_mode
+        self.max_items = max_items
+        self.max_workers = min(max_workers, len(urls))
+        self.detector = detector
+        # Каталоги пересекаются: в потребителя попадают только товары, которых еще не было ни в одном
+        self.on_products = UniqueBatches(on_products) if on_products else None
+        self.on_url_progress = on_url_progress or (lambda index, status: None)
+        self.on_progress = on_progress or (lambda value: None)
+
+    def run(self):
+        """Объединенный список товаров без повторов; ошибки отдельных URL не прерывают обход"""
+        # У каждого потока свой браузер из отдельного пула и своя HTTP-сессия, разбор - в общем пуле
+        # процессов: пока один каталог разбирается, потоки продолжают загрузку остальных
+        pool = DriverPool(size=self.max_workers)
+        parse_pool = ParsePool(self.parse_processes) if self.parse_processes else None
+        limiter = DomainRateLimiter()
+        local = threading.local()
+        
+        def scrape(index, url):
+            if not hasattr(local, 'scraper'):
+                local.scraper = PageScraper(self.product_type, self.fetch_mode, pool=pool,
+                                            session=create_http_session(), rate_limiter=limiter,
+                                            on_products=self.on_products, max_items=self.max_items,
+                                            detector=self.detector, parse_pool=parse_pool)
+            self.on_url_progress(index, "загрузка...")
+            return local.scraper.fetch_products(url)
+        
+        try:
+            self.on_progress(5)
+            results = []
+            done = 0
+            
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(scrape, i, url): i for i, url in enumerate(self.urls)}
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        products = future.result()
+                        results.append(products)
+                        self.on_url_progress(index, f"готово, товаров: {len(products)}")
+                    except Exception as e:
+                        self.on_url_progress(index, f"ошибка: {e}")
+                    done += 1
+                    self.on_progress(5 + int(85 * done / len(self.urls)))
+            
+            products = merge_products(results)
+            print(f"Пакетный парсинг: {len(self.urls)} URL, уникальных товаров {len(products)}")
+            if parse_pool and parse_pool.remote:
+                print(f"Разбор в процессах: {parse_pool.remote} стр., {parse_pool.bytes_sent / 2**20:.1f} МБ сжатой "
+                      f"разметки; на месте: {parse_pool.local} стр.")
+            return products
+        finally:
+            pool.shutdown()
+            if parse_pool:
+                parse_pool.shutdown()
+
+
+def scrape_products(urls, sort_by=SORT_OPTIONS[0], product_type="Все", fetch_mode='auto', max_items=None,
+                    detector=None, save=True, on_products=None, on_url_progress=None, on_progress=None):
+    """
+    Парсинг одного или нескольких URL: загрузка, сортировка и сохранение снимка в историю.
+    Возвращает (товары, id снимка); общий путь для интерфейса и командной строки.
+    """
+    on_progress = on_progress or (lambda value: None)
+    snapshot_id = None
+    
+    if len(urls) > 1 and fetch_mode == 'http' and detector is None and all(map(HttpFetcher.supports, urls)):
+        # Много каталогов без браузера: один асинхронный обход с общим пулом соединений
+        from async_http import AsyncCatalogFetcher
+        
+        on_progress(5)
+        with ParsePool() as parse_pool:
+            results = AsyncCatalogFetcher(product_type, max_items,
+                                          on_products=UniqueBatches(on_products) if on_products else None,
+                                          parse_pool=parse_pool).fetch_all(urls)
+        product_lists = []
+        for index, url in enumerate(urls):
+            result = results[url]
+            if isinstance(result, Exception):
+                if on_url_progress:
+                    on_url_progress(index, f"ошибка: {result}")
+            else:
+                product_lists.append(result)
+                if on_url_progress:
+                    on_url_progress(index, f"готово, товаров: {len(result)}")
+        products = merge_products(product_lists)
+        on_progress(90)
+    elif len(urls) == 1:
+        scraper = PageScraper(product_type, fetch_mode, on_products=on_products, max_items=max_items,
+                              detector=detector)
+        on_progress(10)
+        products = scraper.fetch_products(urls[0])
+        on_progress(80)
+        # При проверке изменений снимок страницы уже сохранен (или взят из истории)
+        snapshot_id = scraper.snapshot_id
+    else:
+        products = BatchScraper(urls, product_type, fetch_mode, max_items=max_items, detector=detector,
+                                on_products=on_products, on_url_progress=on_url_progress,
+                                on_progress=on_progress).run()
+    
+    if products:
+        sort_products(products, sort_by)
+        if save:
+            snapshot_id = snapshot_id or save_snapshot(products, urls, product_type)
+    return products, snapshot_id
@@ -0,0 +1,1293 @@
+"""Графический интерфейс на PyQt6: окно парсера, таблицы, графики и фоновые потоки"""
+
+import importlib
+import re
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
+                             QHBoxLayout, QLineEdit, QPushButton, QTableView, QLabel, QProgressBar,
+                             QMessageBox, QHeaderView, QComboBox, QTabWidget, QTextEdit, QFileDialog,
+                             QCheckBox)
+from PyQt6.QtCore import (Qt, QThread, QThreadPool, QRunnable, QObject, QTimer, pyqtSignal, QAbstractTableModel,
+                          QAbstractItemModel, QModelIndex)
+from PyQt6.QtGui import QFont, QPalette, QColor
+from datetime import datetime
+import matplotlib
+matplotlib.use('Qt5Agg')
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+import matplotlib.pyplot as plt
+import numpy as np
+from core import (PRODUCT_TYPES, SORT_OPTIONS, AnalyticsEngine, ChangeDetector, ExcelReport, OpportunitiesReport,
+                  SalesVelocity, get_snapshot_store, scrape_products)
+
+UI_TICK_MS = 20             # период проверки, не занят ли поток интерфейса
+UI_BLOCK_WARN_MS = 100      # блокировки длиннее этого печатаются
+
+
+class ParserThread(QThread):
+    progress = pyqtSignal(int)
+    url_progress = pyqtSignal(int, str)
+    batch = pyqtSignal(list)
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+    def __init__(self, urls, sort_by, product_type, fetch_mode='auto', max_items=None, skip_unchanged=False):
+        super().__init__()
+        self.urls = urls
+        self.sort_by = sort_by
+        self.product_type = product_type
+        self.fetch_mode = fetch_mode
+        self.max_items = max_items
+        self.snapshot_id = None
+        self.detector = ChangeDetector() if skip_unchanged else None
+
+    def run(self):
+        try:
+            products, self.snapshot_id = scrape_products(
+                self.urls, self.sort_by, self.product_type, self.fetch_mode, self.max_items, self.detector,
+                on_products=self.batch.emit, on_url_progress=self.url_progress.emit,
+                on_progress=self.progress.emit)
+            
+            if products:
+                self.progress.emit(100)
+                self.finished.emit(products)
+            elif len(self.urls) > 1:
+                self.error.emit("Не удалось извлечь товары ни с одной страницы")
+            else:
+                self.error.emit("Не удалось извлечь товары с данной страницы")
+        except Exception as e:
+            self.error.emit(f"Ошибка парсинга: {str(e)}")
+
+
+class ExportThread(QThread):
+    """Запись отчета Excel вне потока интерфейса"""
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+    def __init__(self, report, filename):
+        super().__init__()
+        self.report = report
+        self.filename = filename
+
+    def run(self):
+        try:
+            self.report.write(self.filename, on_progress=self.progress.emit)
+            self.finished.emit(self.filename)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+def load_velocity(snapshot_id):
+    """Скорость продаж по прошлым снимкам того же источника"""
+    if snapshot_id is None:
+        return None
+    try:
+        return SalesVelocity.from_store(get_snapshot_store(), snapshot_id)
+    except Exception as e:
+        print(f"Не удалось посчитать скорость продаж: {e}")
+        return None
+
+
+class AnalyticsResult:
+    """Посчитанная в фоне аналитика: движок, строки таблицы ниш и готовый HTML возможностей"""
+
+    def __init__(self, generation, analytics, category_stats, opportunities_html, seconds):
+        self.generation = generation
+        self.analytics = analytics
+        self.category_stats = category_stats
+        self.opportunities_html = opportunities_html
+        self.seconds = seconds
+
+
+class AnalyticsSignals(QObject):
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+
+class AnalyticsTask(QRunnable):
+    """
+    Расчет аналитики и отчета в пуле потоков: история снимков, AnalyticsEngine,
+    статистика ниш, сегменты и HTML. Поток интерфейса только подставляет результат.
+
+    С engine - пачка товаров во время парсинга: она добавляется в движок и
+    считается только статистика ниш, без истории и отчета. Движок при этом
+    трогает одна задача за раз.
+    """
+
+    def __init__(self, products, snapshot_id=None, generation=0, engine=None):
+        super().__init__()
+        self.products = products
+        self.snapshot_id = snapshot_id
+        self.generation = generation
+        self.engine = engine
+        self.signals = AnalyticsSignals()
+
+    def run(self):
+        try:
+            start = time.perf_counter()
+            if self.engine is None:
+                analytics = AnalyticsEngine(self.products, velocity=load_velocity(self.snapshot_id))
+            else:
+                if not self.products:
+                    # Пустая пачка в начале парсинга: pandas загружается, пока идет загрузка первой страницы
+                    importlib.import_module('pandas')
+                analytics = self.engine
+                analytics.add_batch(self.products)
+            category_stats = analytics.get_category_stats()
+            opportunities_html = OpportunitiesReport.from_analytics(analytics).html() if self.engine is None else None
+            self.signals.finished.emit(AnalyticsResult(
+                self.generation, analytics, category_stats, opportunities_html, time.perf_counter() - start))
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
+
+class UiBlockMonitor(QObject):
+    """
+    Замер блокировок потока интерфейса. Таймер тикает каждые UI_TICK_MS; если
+    тик опоздал, значит цикл событий был занят. Обработчики в потоке интерфейса
+    оборачиваются в section(), чтобы было видно, кто именно его занимал.
+    """
+
+    def __init__(self, tick_ms=UI_TICK_MS, warn_ms=UI_BLOCK_WARN_MS, parent=None):
+        super().__init__(parent)
+        self.tick_ms = tick_ms
+        self.warn_ms = warn_ms
+        self.stalls = 0
+        self.blocked = 0.0
+        self.worst = 0.0
+        self.sections = {}
+        self._last = time.perf_counter()
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._tick)
+        self._timer.start(tick_ms)
+
+    def _tick(self):
+        now = time.perf_counter()
+        late = (now - self._last) * 1000 - self.tick_ms
+        self._last = now
+        if late > self.warn_ms:
+            self.stalls += 1
+            self.blocked += late
+            self.worst = max(self.worst, late)
+
+    @contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            calls, total, worst = self.sections.get(name, (0, 0.0, 0.0))
+            self.sections[name] = (calls + 1, total + ms, max(worst, ms))
+            if ms > self.warn_ms:
+                print(f"Интерфейс занят {ms:.0f} мс: {name}")
+
+    def report(self):
+        """Печать и возврат сводки блокировок"""
+        print(f"Блокировки интерфейса дольше {self.warn_ms} мс: {self.stalls}, всего {self.blocked:.0f} мс, "
+              f"самая долгая {self.worst:.0f} мс")
+        for name, (calls, total, worst) in sorted(self.sections.items(), key=lambda kv: -kv[1][1]):
+            print(f"  {name}: {calls} раз, {total:.0f} мс, максимум {worst:.0f} мс")
+        return {
+            'stalls': self.stalls,
+            'blocked_ms': self.blocked,
+            'worst_ms': self.worst,
+            'sections': {name: {'calls': c, 'total_ms': t, 'worst_ms': w} for name, (c, t, w) in self.sections.items()}
+        }
+
+
+class ProductTableModel(QAbstractTableModel):
+    """
+    Модель таблицы товаров: ячейки не хранятся, а строятся при отрисовке видимых строк.
+    Шрифты и цвета общие для всех строк, сортировка - перестановкой номеров в модели.
+    """
+
+    HEADERS = ["Название товара", "Категория", "Цена (₽)", "Продажи", "Оборот (₽)", "Ссылка"]
+    CENTERED = (1, 2, 3, 4)
+    TEXT_KEYS = {0: 'name', 1: 'category', 5: 'link'}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.products = []
+        self._order = None  # номера товаров в порядке строк; None - порядок списка
+        self.fonts = {
+            'normal': QFont("Arial", 11),
+            'bold': QFont("Arial", 11, QFont.Weight.Bold),
+            'link': QFont("Arial", 10)
+        }
+        self.colors = {
+            'high': QColor("#27ae60"),
+            'medium': QColor("#f39c12"),
+            'low': QColor("#95a5a6"),
+            'revenue': QColor("#667eea"),
+            'link': QColor("#3498db")
+        }
+        self.center = Qt.AlignmentFlag.AlignCenter
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.products)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def product(self, row):
+        return self.products[row if self._order is None else self._order[row]]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        product = self.product(index.row())
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return product['name']
+            if column == 1:
+                return product.get('category', '')
+            if column == 2:
+                return f"{product['price']:.2f}"
+            if column == 3:
+                return str(product['sales'])
+            if column == 4:
+                return f"{product['price'] * product['sales']:,.0f}"
+            return product['link']
+        if role == Qt.ItemDataRole.FontRole:
+            if column in (3, 4):
+                return self.fonts['bold']
+            return self.fonts['link'] if column == 5 else self.fonts['normal']
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if column == 3:
+                if product['sales'] > 100:
+                    return self.colors['high']
+                if product['sales'] > 50:
+                    return self.colors['medium']
+                return self.colors['low']
+            if column == 4:
+                return self.colors['revenue']
+            if column == 5:
+                return self.colors['link']
+            return None
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in self.CENTERED:
+            return self.center
+        return None
+
+    def set_products(self, products):
+        """Замена всего списка (итог парсинга)"""
+        self.beginResetModel()
+        self.products = products
+        self._order = None
+        self.endResetModel()
+
+    def clear(self):
+        self.set_products([])
+
+    def append(self, products):
+        """Добавление пачки в конец таблицы без перерисовки уже показанных строк"""
+        if not products:
+            return
+        start = len(self.products)
+        self.beginInsertRows(QModelIndex(), start, start + len(products) - 1)
+        self.products.extend(products)
+        if self._order is not None:
+            self._order = np.concatenate([self._order, np.arange(start, len(self.products))])
+        self.endInsertRows()
+
+    def _sort_order(self, column, descending):
+        """Номера товаров, упорядоченные по колонке (устойчиво)"""
+        products = self.products
+        if column in self.TEXT_KEYS:
+            key = self.TEXT_KEYS[column]
+            return np.array(sorted(range(len(products)), key=lambda i: (products[i].get(key) or '').lower(),
+                                   reverse=descending), dtype=np.intp)
+        price = np.fromiter((p['price'] for p in products), dtype=np.float64, count=len(products))
+        sales = np.fromiter((p['sales'] for p in products), dtype=np.float64, count=len(products))
+        values = {2: price, 3: sales, 4: price * sales}[column]
+        return np.argsort(-values if descending else values, kind='stable')
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if not self.products:
+            return
+        self.layoutAboutToBeChanged.emit([], QAbstractItemModel.LayoutChangeHint.VerticalSortHint)
+        persistent = self.persistentIndexList()
+        tracked = [(self._order[i.row()] if self._order is not None else i.row(), i.column()) for i in persistent]
+        
+        if column < 0:
+            self._order = None
+        else:
+            self._order = self._sort_order(column, order == Qt.SortOrder.DescendingOrder)
+        
+        # Выделение и прочие сохраненные индексы следуют за своими товарами
+        if persistent:
+            rows = np.arange(len(self.products)) if self._order is None else np.argsort(self._order)
+            self.changePersistentIndexList(persistent, [self.index(int(rows[p]), c) for p, c in tracked])
+        self.layoutChanged.emit([], QAbstractItemModel.LayoutChangeHint.VerticalSortHint)
+
+
+class CategoryStatsModel(QAbstractTableModel):
+    """Модель таблицы "Анализ ниш" над готовым списком статистики категорий"""
+
+    HEADERS = ["Категория", "Конкурентов", "Ср. цена (₽)", "Ср. продажи", "Продаж/день",
+               "Оборот (₽)", "Спрос", "Конкуренция", "Рекомендация"]
+    # колонка -> ключ цвета в статистике
+    COLORED = {6: 'demand_color', 7: 'competition_color', 8: 'rec_color'}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.stats = []
+        self.fonts = {
+            'bold': QFont("Arial", 11, QFont.Weight.Bold),
+            'recommendation': QFont("Arial", 12, QFont.Weight.Bold)
+        }
+        self.colors = {
+            'revenue': QColor("#667eea"),
+            'velocity': QColor("#27ae60")
+        }
+        self._stat_colors = {}
+        self.center = Qt.AlignmentFlag.AlignCenter
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.stats)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def _color(self, name):
+        color = self._stat_colors.get(name)
+        if color is None:
+            color = self._stat_colors[name] = QColor(name)
+        return color
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        stat = self.stats[index.row()]
+        column = index.column()
+        tracked = stat['sales_per_day'] is not None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return stat['category']
+            if column == 1:
+                return str(stat['competitors'])
+            if column == 2:
+                return f"{stat['avg_price']:.2f}"
+            if column == 3:
+                return f"{stat['avg_sales']:.0f}"
+            if column == 4:
+                return f"{stat['sales_per_day']:,.1f}" if tracked else "—"
+            if column == 5:
+                return f"{stat['total_revenue']:,.0f}"
+            return stat[('demand_level', 'competition_level', 'recommendation')[column - 6]]
+        if role == Qt.ItemDataRole.FontRole:
+            if column == 8:
+                return self.fonts['recommendation']
+            if column in (0, 5, 6, 7) or (column == 4 and tracked):
+                return self.fonts['bold']
+            return None
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if column in self.COLORED:
+                return self._color(stat[self.COLORED[column]])
+            if column == 5:
+                return self.colors['revenue']
+            if column == 4 and tracked:
+                return self.colors['velocity']
+            return None
+        if role == Qt.ItemDataRole.ToolTipRole and column == 4 and tracked:
+            return (f"По {stat['tracked']} товарам из прошлых снимков, "
+                    f"в среднем {stat['avg_sales_per_day']:.2f} на товар")
+        if role == Qt.ItemDataRole.TextAlignmentRole and column > 0:
+            return self.center
+        return None
+
+    def set_stats(self, stats):
+        """Подстановка готовой статистики категорий"""
+        self.beginResetModel()
+        self.stats = stats
+        self.endResetModel()
+
+    def clear(self):
+        self.set_stats([])
+
+
+class ChartWidget(QWidget):
+    """Виджет для отображения графиков"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.figure = Figure(figsize=(12, 8))
+        self.canvas = FigureCanvas(self.figure)
+        
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.canvas)
+    
+    def plot_price_vs_sales(self, products):
+        """График цена vs продажи"""
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        
+        # Группировка по категориям для цветов
+        categories = {}
+        for p in products:
+            cat = p.get('category', 'Без категории')
+            if cat not in categories:
+                categories[cat] = []
+            categories[cat].append(p)
+        
+        colors = plt.cm.tab10(range(len(categories)))
+        
+        for idx, (cat_name, items) in enumerate(categories.items()):
+            prices = [p['price'] for p in items]
+            sales = [p['sales'] for p in items]
+            ax.scatter(prices, sales, label=cat_name, alpha=0.6, s=100, color=colors[idx])
+        
+        ax.set_xlabel('Цена (₽)', fontsize=12)
+        ax.set_ylabel('Продажи', fontsize=12)
+        ax.set_title('Распределение: Цена vs Продажи', fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+        ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        
+        self.figure.tight_layout()
+        self.canvas.draw()
+    
+    def plot_category_pie(self, category_stats):
+        """Круговая диаграмма категорий"""
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        
+        labels = [s['category'] for s in category_stats]
+        revenues = [s['total_revenue'] for s in category_stats]
+        
+        ax.pie(revenues, labels=labels, autopct='%1.1f%%', startangle=90)
+        ax.set_title('Доли категорий по обороту', fontsize=14, fontweight='bold')
+        
+        self.figure.tight_layout()
+        self.canvas.draw()
+    
+    def plot_top_niches(self, category_stats):
+        """ТОП-10 ниш"""
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        
+        top_10 = category_stats[:10]
+        categories = [s['category'][:20] for s in top_10]
+        attractiveness = [s['attractiveness'] for s in top_10]
+        
+        bars = ax.barh(categories, attractiveness, color='#667eea')
+        ax.set_xlabel('Индекс привлекательности', fontsize=12)
+        ax.set_title('ТОП-10 самых привлекательных ниш', fontsize=14, fontweight='bold')
+        ax.invert_yaxis()
+        
+        # Добавление значений на бары
+        for bar in bars:
+            width = bar.get_width()
+            ax.text(width, bar.get_y() + bar.get_height()/2, 
+                   f'{width:.0f}', ha='left', va='center', fontsize=9)
+        
+        self.figure.tight_layout()
+        self.canvas.draw()
+    
+    def plot_price_segments(self, segment_stats):
+        """Анализ ценовых сегментов"""
+        self.figure.clear()
+        
+        # Два подграфика
+        ax1 = self.figure.add_subplot(121)
+        ax2 = self.figure.add_subplot(122)
+        
+        segments = [s['segment'] for s in segment_stats]
+        counts = [s['count'] for s in segment_stats]
+        avg_sales = [s['avg_sales'] for s in segment_stats]
+        
+        # График 1: Количество товаров
+        ax1.bar(segments, counts, color=['#3498db', '#f39c12', '#9b59b6'])
+        ax1.set_ylabel('Количество товаров', fontsize=11)
+        ax1.set_title('Товары по сегментам', fontsize=12, fontweight='bold')
+        ax1.tick_params(axis='x', rotation=15)
+        
+        # График 2: Средние продажи
+        ax2.bar(segments, avg_sales, color=['#3498db', '#f39c12', '#9b59b6'])
+        ax2.set_ylabel('Средние продажи', fontsize=11)
+        ax2.set_title('Эффективность сегментов', fontsize=12, fontweight='bold')
+        ax2.tick_params(axis='x', rotation=15)
+        
+        self.figure.tight_layout()
+        self.canvas.draw()
+
+
+class MainWindow(QMainWindow):
+    # Способ загрузки страницы: HTTP с откатом на браузер, только HTTP, только браузер
+    FETCH_MODES = {
+        "Авто (HTTP → браузер)": 'auto',
+        "HTTP": 'http',
+        "Браузер": 'browser'
+    }
+
+    # Лимит карточек на страницу: None - значения сайтов по умолчанию, 0 - без ограничений
+    ITEM_LIMITS = {
+        "По умолчанию": None,
+        "1 000": 1000,
+        "5 000": 5000,
+        "30 000": 30000,
+        "Без ограничений": 0
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Анализатор популярности товаров")
+        self.setGeometry(50, 50, 1800, 1000)
+        
+        self.products = []
+        self.analytics = None
+        self.analytics_generation = 0    # номер последнего запущенного расчета: устаревшие результаты отбрасываются
+        self.analytics_task = None
+        self.analytics_status = None
+        self.live_analytics = None      # движок статистики ниш во время парсинга, его дополняют задачи пула
+        self.live_task = None           # задача пула с очередной пачкой; следующая ждет ее окончания
+        self.live_pending = []          # товары, пришедшие, пока задача считалась
+        self.ui_monitor = UiBlockMonitor(parent=self)
+        
+        self.setup_ui()
+        self.refresh_snapshots()
+        
+    def setup_ui(self):
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+
+        main_widget.setStyleSheet("""
+            QWidget {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                    stop:0 #f8f9fa, stop:1 #e9ecef);
+            }
+        """)
+        
+        layout = QVBoxLayout(main_widget)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(20)
+        
+        # Заголовок
+        title_container = QWidget()
+        title_container.setStyleSheet("""
+            QWidget {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #667eea, stop:1 #764ba2);
+                border-radius: 12px;
+                padding: 20px;
+            }
+        """)
+        title_layout = QVBoxLayout(title_container)
+        
+        title = QLabel("📊 Анализатор популярности товаров")
+        title.setFont(QFont("Segoe UI", 24, QFont.Weight.Bold))
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title.setStyleSheet("color: white; background: transparent;")
+        title_layout.addWidget(title)
+        
+        layout.addWidget(title_container)
+
+        # URL
+        url_container = QWidget()
+        url_container.setStyleSheet("""
+            QWidget {
+                background-color: white;
+                border-radius: 12px;
+                padding: 15px;
+            }
+        """)
+        url_layout = QHBoxLayout(url_container)
+        url_layout.setSpacing(10)
+        
+        url_label = QLabel("🔗 URL:")
+        url_label.setFont(QFont("Segoe UI", 13, QFont.Weight.Bold))
+        url_label.setStyleSheet("color: #495057; background: transparent;")
+        url_layout.addWidget(url_label)
+        
+        self.url_input = QLineEdit()
+        self.url_input.setPlaceholderText("Введите ссылку на страницу с товарами (например: https://ggsel.net), "
+                                          "несколько ссылок - через пробел")
+        self.url_input.setFont(QFont("Segoe UI", 11))
+        self.url_input.setStyleSheet("""
+            QLineEdit {
+                padding: 12px 15px;
+                border: 2px solid #dee2e6;
+                border-radius: 8px;
+                background-color: #f8f9fa;
+                color: #212529;
+            }
+            QLineEdit:focus {
+                border: 2px solid #667eea;
+                background-color: white;
+            }
+        """)
+        self.url_input.setMinimumHeight(45)
+        url_layout.addWidget(self.url_input)
+        
+        self.url_file_button = QPushButton("📂 Список URL")
+        self.url_file_button.setStyleSheet(self._get_button_style())
+        self.url_file_button.setMinimumHeight(45)
+        self.url_file_button.clicked.connect(self.load_url_list)
+        url_layout.addWidget(self.url_file_button)
+        
+        layout.addWidget(url_container)
+
+        # Контролы
+        controls_container = QWidget()
+        controls_container.setStyleSheet("""
+            QWidget {
+                background-color: white;
+                border-radius: 12px;
+                padding: 15px;
+            }
+        """)
+        controls_layout = QHBoxLayout(controls_container)
+        controls_layout.setSpacing(15)
+ 
+        sort_label = QLabel("📋 Сортировка:")
+        sort_label.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
+        sort_label.setStyleSheet("color: #495057; background: transparent;")
+        controls_layout.addWidget(sort_label)
+        
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems(SORT_OPTIONS)
+        self.sort_combo.setFont(QFont("Segoe UI", 11))
+        self.sort_combo.setStyleSheet(self._get_combo_style())
+        self.sort_combo.setMinimumHeight(45)
+        controls_layout.addWidget(self.sort_combo)
+
+        type_label = QLabel("🏷️ Тип:")
+        type_label.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
+        type_label.setStyleSheet("color: #495057; background: transparent;")
+        controls_layout.addWidget(type_label)
+        
+        self.type_combo = QComboBox()
+        self.type_combo.addItems(PRODUCT_TYPES)
+        self.type_combo.setFont(QFont("Segoe UI", 11))
+        self.type_combo.setStyleSheet(self._get_combo_style())
+        self.type_combo.setMinimumHeight(45)
+        controls_layout.addWidget(self.type_combo)
+
+        mode_label = QLabel("⚙️ Режим:")
+        mode_label.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
+        mode_label.setStyleSheet("color: #495057; background: transparent;")
+        controls_layout.addWidget(mode_label)
+        
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(list(self.FETCH_MODES))
+        self.mode_combo.setFont(QFont("Segoe UI", 11))
+        self.mode_combo.setStyleSheet(self._get_combo_style())
+        self.mode_combo.setMinimumHeight(45)
+        controls_layout.addWidget(self.mode_combo)
+
+        limit_label = QLabel("🔢 Лимит:")
+        limit_label.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
+        limit_label.setStyleSheet("color: #495057; background: transparent;")
+        controls_layout.addWidget(limit_label)
+        
+        self.limit_combo = QComboBox()
+        self.limit_combo.addItems(list(self.ITEM_LIMITS))
+        self.limit_combo.setFont(QFont("Segoe UI", 11))
+        self.limit_combo.setStyleSheet(self._get_combo_style())
+        self.limit_combo.setMinimumHeight(45)
+        controls_layout.addWidget(self.limit_combo)
+        
+        self.skip_unchanged_check = QCheckBox("♻️ Не перекачивать неизменившиеся")
+        self.skip_unchanged_check.setFont(QFont("Segoe UI", 11))
+        self.skip_unchanged_check.setStyleSheet("color: #495057; background: transparent;")
+        self.skip_unchanged_check.setToolTip(
+            "Если первые карточки страницы совпадают с прошлым парсингом, товары берутся из сохраненного снимка")
+        controls_layout.addWidget(self.skip_unchanged_check)
+        
+        controls_layout.addStretch()
+
+        self.parse_button = QPushButton("🚀 НАЧАТЬ АНАЛИЗ")
+        self.parse_button.setFont(QFont("Segoe UI", 13, QFont.Weight.Bold))
+        self.parse_button.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #667eea, stop:1 #764ba2);
+                color: white;
+                padding: 12px 30px;
+                border: none;
+                border-radius: 10px;
+                min-width: 200px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #5568d3, stop:1 #6a3f8f);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #4a5ab8, stop:1 #5d3679);
+            }
+            QPushButton:disabled {
+                background: #adb5bd;
+            }
+        """)
+        self.parse_button.setMinimumHeight(50)
+        self.parse_button.clicked.connect(self.start_parsing)
+        controls_layout.addWidget(self.parse_button)
+        
+        # Кнопка экспорта
+        self.export_button = QPushButton("📥 Экспорт в Excel")
+        self.export_button.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
+        self.export_button.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #27ae60, stop:1 #229954);
+                color: white;
+                padding: 12px 25px;
+                border: none;
+                border-radius: 10px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #229954, stop:1 #1e8449);
+            }
+            QPushButton:disabled {
+                background: #adb5bd;
+            }
+        """)
+        self.export_button.setMinimumHeight(50)
+        self.export_button.clicked.connect(self.export_to_excel)
+        self.export_button.setEnabled(False)
+        controls_layout.addWidget(self.export_button)
+        
+        layout.addWidget(controls_container)
+
+        # Прогресс-бар
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setStyleSheet("""
+            QProgressBar {
+                border: none;
+                border-radius: 8px;
+                text-align: center;
+                background-color: #e9ecef;
+                color: #495057;
+                font-weight: bold;
+                font-size: 12px;
+            }
+            QProgressBar::chunk {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #667eea, stop:1 #764ba2);
+                border-radius: 8px;
+            }
+        """)
+        self.progress_bar.setMinimumHeight(30)
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel("✅ Готов к работе")
+        self.status_label.setFont(QFont("Segoe UI", 11))
+        self.status_label.setStyleSheet("color: #495057; padding: 5px; background: transparent;")
+        layout.addWidget(self.status_label)
+
+        # Вкладки
+        self.tabs = QTabWidget()
+        self.tabs.setStyleSheet("""
+            QTabWidget::pane {
+                border: none;
+                background: white;
+                border-radius: 12px;
+            }
+            QTabBar::tab {
+                background: #e9ecef;
+                color: #495057;
+                padding: 12px 24px;
+                margin-right: 4px;
+                border-top-left-radius: 8px;
+                border-top-right-radius: 8px;
+                font-size: 13px;
+                font-weight: bold;
+            }
+            QTabBar::tab:selected {
+                background: white;
+                color: #667eea;
+            }
+            QTabBar::tab:hover {
+                background: #dee2e6;
+            }
+        """)
+        
+        # Вкладка 1: Таблица товаров
+        self.products_tab = QWidget()
+        products_layout = QVBoxLayout(self.products_tab)
+        
+        self.product_model = ProductTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.product_model)
+        self.table.setFont(QFont("Segoe UI", 10))
+        # Одинаковая высота строк - вид не опрашивает размеры каждой строки
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(36)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
+        # Ширина по содержимому оценивается по первым строкам, а не по всем товарам
+        header.setResizeContentsPrecision(100)
+        
+        self.table.setStyleSheet("""
+            QTableView {
+                border: none;
+                border-radius: 12px;
+                background-color: white;
+                gridline-color: #e9ecef;
+            }
+            QTableView::item {
+                padding: 10px;
+                color: #212529;
+            }
+            QTableView::item:selected {
+                background-color: #667eea;
+                color: white;
+            }
+            QHeaderView::section {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #495057, stop:1 #343a40);
+                color: white;
+                padding: 12px;
+                border: none;
+                font-weight: bold;
+            }
+        """)
+        
+        self.table.setAlternatingRowColors(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        
+        products_layout.addWidget(self.table)
+        
+        self.results_label = QLabel("📦 Результатов: 0")
+        self.results_label.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
+        self.results_label.setStyleSheet("color: #495057; padding: 10px; background: transparent;")
+        products_layout.addWidget(self.results_label)
+        
+        self.tabs.addTab(self.products_tab, "📦 Все товары")
+        
+        # Вкладка 2: Анализ категорий
+        self.analytics_tab = QWidget()
+        analytics_layout = QVBoxLayout(self.analytics_tab)
+        
+        # История: любой сохраненный снимок открывается без повторного парсинга
+        history_layout = QHBoxLayout()
+        history_label = QLabel("🕘 Снимок:")
+        history_label.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        history_label.setStyleSheet("color: #495057; background: transparent;")
+        history_layout.addWidget(history_label)
+        
+        self.snapshot_combo = QComboBox()
+        self.snapshot_combo.setFont(QFont("Segoe UI", 11))
+        self.snapshot_combo.setStyleSheet(self._get_combo_style())
+        self.snapshot_combo.setMinimumHeight(40)
+        history_layout.addWidget(self.snapshot_combo, 1)
+        
+        self.snapshot_button = QPushButton("📂 Открыть снимок")
+        self.snapshot_button.setStyleSheet(self._get_button_style())
+        self.snapshot_button.setMinimumHeight(40)
+        self.snapshot_button.clicked.connect(self.load_snapshot)
+        history_layout.addWidget(self.snapshot_button)
+        analytics_layout.addLayout(history_layout)
+        
+        self.category_model = CategoryStatsModel(self)
+        self.analytics_table = QTableView()
+        self.analytics_table.setModel(self.category_model)
+        self.analytics_table.setFont(QFont("Segoe UI", 10))
+        self.analytics_table.setStyleSheet(self.table.styleSheet())
+        
+        ah = self.analytics_table.horizontalHeader()
+        ah.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for i in range(1, 9):
+            ah.setSectionResizeMode(i, QHeaderView.ResizeMode.ResizeToContents)
+        
+        self.analytics_table.verticalHeader().setVisible(False)
+        self.analytics_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        
+        analytics_layout.addWidget(self.analytics_table)
+        self.tabs.addTab(self.analytics_tab, "📊 Анализ ниш")
+        
+        # Вкладка 3: Возможности
+        self.opportunities_tab = QWidget()
+        opp_layout = QVBoxLayout(self.opportunities_tab)
+        
+        self.opportunities_text = QTextEdit()
+        self.opportunities_text.setReadOnly(True)
+        self.opportunities_text.setFont(QFont("Segoe UI", 11))
+        self.opportunities_text.setStyleSheet("""
+            QTextEdit {
+                background: white;
+                border: none;
+                border-radius: 8px;
+                padding: 15px;
+            }
+        """)
+        
+        opp_layout.addWidget(self.opportunities_text)
+        self.tabs.addTab(self.opportunities_tab, "💡 Возможности")
+        
+        # Вкладка 4: Графики
+        self.charts_tab = QWidget()
+        charts_layout = QVBoxLayout(self.charts_tab)
+        
+        chart_buttons = QHBoxLayout()
+        
+        btn1 = QPushButton("📈 Цена vs Продажи")
+        btn1.clicked.connect(lambda: self.show_chart('price_sales'))
+        btn1.setStyleSheet(self._get_button_style())
+        chart_buttons.addWidget(btn1)
+        
+        btn2 = QPushButton("🥧 Доли категорий")
+        btn2.clicked.connect(lambda: self.show_chart('pie'))
+        btn2.setStyleSheet(self._get_button_style())
+        chart_buttons.addWidget(btn2)
+        
+        btn3 = QPushButton("🏆 ТОП-10 ниш")
+        btn3.clicked.connect(lambda: self.show_chart('top_niches'))
+        btn3.setStyleSheet(self._get_button_style())
+        chart_buttons.addWidget(btn3)
+        
+        btn4 = QPushButton("💰 Ценовые сегменты")
+        btn4.clicked.connect(lambda: self.show_chart('segments'))
+        btn4.setStyleSheet(self._get_button_style())
+        chart_buttons.addWidget(btn4)
+        
+        charts_layout.addLayout(chart_buttons)
+        
+        self.chart_widget = ChartWidget()
+        charts_layout.addWidget(self.chart_widget)
+        
+        self.tabs.addTab(self.charts_tab, "📊 Графики")
+        
+        layout.addWidget(self.tabs)
+
+    def _get_combo_style(self):
+        return """
+            QComboBox {
+                padding: 10px 15px;
+                border: 2px solid #dee2e6;
+                border-radius: 8px;
+                background-color: #f8f9fa;
+                color: #212529;
+                min-width: 150px;
+            }
+            QComboBox:hover {
+                border: 2px solid #667eea;
+            }
+            QComboBox::drop-down {
+                border: none;
+                padding-right: 10px;
+            }
+            QComboBox QAbstractItemView {
+                border: 2px solid #dee2e6;
+                border-radius: 8px;
+                background-color: white;
+                selection-background-color: #667eea;
+                selection-color: white;
+            }
+        """
+    
+    def _get_button_style(self):
+        return """
+            QPushButton {
+                background: #667eea;
+                color: white;
+                padding: 10px 20px;
+                border: none;
+                border-radius: 8px;
+                font-size: 12px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background: #5568d3;
+            }
+        """
+
+    def load_url_list(self):
+        """Загрузка списка URL из текстового файла (по одному в строке)"""
+        filename, _ = QFileDialog.getOpenFileName(self, "Список URL", "", "Text Files (*.txt);;All Files (*)")
+        if not filename:
+            return
+        
+        try:
+            with open(filename, encoding='utf-8') as f:
+                urls = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось прочитать файл: {str(e)}")
+            return
+        
+        self.url_input.setText(' '.join(urls))
+
+    def refresh_snapshots(self):
+        """Список сохраненных снимков для вкладки анализа"""
+        try:
+            snapshots = get_snapshot_store().snapshots()
+        except Exception as e:
+            print(f"История недоступна: {e}")
+            snapshots = []
+        
+        current = self.snapshot_combo.currentData()
+        self.snapshot_combo.clear()
+        for snap in snapshots:
+            urls = snap['source'].split()
+            source = urlparse(urls[0]).netloc + urlparse(urls[0]).path if urls else ''
+            if len(urls) > 1:
+                source += f" (+{len(urls) - 1})"
+            created = datetime.fromtimestamp(snap['created_at']).strftime('%d.%m.%Y %H:%M')
+            self.snapshot_combo.addItem(f"{created} · {source} · товаров: {snap['count']}", snap['id'])
+        if current is not None and self.snapshot_combo.findData(current) >= 0:
+            self.snapshot_combo.setCurrentIndex(self.snapshot_combo.findData(current))
+        self.snapshot_button.setEnabled(bool(snapshots))
+
+    def load_snapshot(self):
+        """Открытие сохраненного снимка вместо нового парсинга"""
+        snapshot_id = self.snapshot_combo.currentData()
+        if snapshot_id is None:
+            return
+        
+        try:
+            products = get_snapshot_store().load(snapshot_id)
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось открыть снимок: {str(e)}")
+            return
+        
+        label = self.snapshot_combo.currentText()
+        self.show_results(products, snapshot_id, status=f"📂 Открыт снимок: {label}")
+
+    def start_parsing(self):
+        urls = re.split(r'[\s,;]+', self.url_input.text().strip())
+        urls = list(dict.fromkeys(u for u in urls if u))
+        
+        if not urls:
+            QMessageBox.warning(self, "Ошибка", "Введите URL страницы")
+            return
+        
+        for url in urls:
+            if not url.startswith('http'):
+                QMessageBox.warning(self, "Ошибка", f"URL должен начинаться с http:// или https://\n{url}")
+                return
+        
+        self.parse_button.setEnabled(False)
+        self.export_button.setEnabled(False)
+        self.product_model.clear()
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.category_model.clear()
+        self.opportunities_text.clear()
+        # Статистика по нишам обновляется по мере поступления товаров, расчет - в пуле потоков
+        self.analytics = None
+        self.analytics_generation += 1
+        self.live_analytics = AnalyticsEngine()
+        self.live_task = None
+        self.live_pending = []
+        self.start_live_analytics()
+        self.progress_bar.setValue(0)
+        self.status_label.setText("⏳ Загрузка страницы и анализ товаров...")
+        self.status_label.setStyleSheet("color: #667eea; font-weight: bold; background: transparent;")
+        
+        sort_by = self.sort_combo.currentText()
+        product_type = self.type_combo.currentText()
+        fetch_mode = self.FETCH_MODES[self.mode_combo.currentText()]
+        max_items = self.ITEM_LIMITS[self.limit_combo.currentText()]
+        skip_unchanged = self.skip_unchanged_check.isChecked()
+        
+        self.parser_thread = ParserThread(urls, sort_by, product_type, fetch_mode, max_items, skip_unchanged)
+        if len(urls) > 1:
+            self.batch_urls = urls
+            self.batch_done = 0
+            self.parser_thread.url_progress.connect(self.update_url_progress)
+        self.parser_thread.progress.connect(self.update_progress)
+        self.parser_thread.batch.connect(self.append_products)
+        self.parser_thread.finished.connect(self.finish_parsing)
+        self.parser_thread.error.connect(self.show_error)
+        self.parser_thread.start()
+
+    def update_url_progress(self, index, status):
+        if not status.startswith("загрузка"):
+            self.batch_done += 1
+        self.status_label.setText(
+            f"⏳ [{self.batch_done}/{len(self.batch_urls)}] {self.batch_urls[index]}: {status}")
+
+    def update_progress(self, value):
+        self.progress_bar.setValue(value)
+
+    def append_products(self, products):
+        """Добавление в таблицу пачки товаров, пришедшей во время парсинга"""
+        with self.ui_monitor.section("пачка товаров"):
+            self.product_model.append(products)
+            self.results_label.setText(f"📦 Получено товаров: {self.product_model.rowCount()}")
+        
+        # Пачки, пришедшие во время расчета, копятся и уходят в пул одной задачей
+        self.live_pending.extend(products)
+        if self.live_task is None:
+            self.start_live_analytics()
+
+    def start_live_analytics(self):
+        products, self.live_pending = self.live_pending, []
+        task = self.live_task = AnalyticsTask(products, generation=self.analytics_generation,
+                                              engine=self.live_analytics)
+        task.signals.finished.connect(self.apply_live_analytics)
+        task.signals.error.connect(lambda message: self.live_analytics_failed(task, message))
+        QThreadPool.globalInstance().start(task)
+
+    def apply_live_analytics(self, result):
+        """Статистика ниш по товарам, полученным к этому моменту"""
+        if result.generation != self.analytics_generation:
+            return
+        self.live_task = None
+        with self.ui_monitor.section("статистика ниш"):
+            self.category_model.set_stats(result.category_stats)
+        if self.live_pending:
+            self.start_live_analytics()
+
+    def live_analytics_failed(self, task, message):
+        print(f"Не удалось обновить статистику ниш: {message}")
+        if task is self.live_task:
+            self.live_task = None
+
+    def finish_parsing(self, products):
+        status = None
+        detector = self.parser_thread.detector
+        if detector and detector.report():
+            print(f"Проверка изменений: {detector.report()}")
+            status = f"✅ Анализ завершен: {detector.report()}"
+        self.show_results(products, self.parser_thread.snapshot_id, status)
+
+    def show_results(self, products, snapshot_id=None, status=None):
+        """Итоговый список в таблице и расчет аналитики в фоне; status - текст по окончании расчета"""
+        with self.ui_monitor.section("таблица товаров"):
+            self.products = products
+            # Заполнение таблицы товаров (пачки, показанные во время парсинга, заменяются отсортированным списком)
+            self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+            self.product_model.set_products(products)
+            self.results_label.setText(f"📦 Результатов: {len(products)}")
+            self.status_label.setText("⏳ Подсчет аналитики...")
+        
+        # Итоговый список отсортирован и очищен от повторов между страницами - аналитика считается по нему
+        # заново в пуле потоков вместе с историей снимков и отчетом; результаты пачек больше не нужны
+        self.analytics_generation += 1
+        self.live_analytics = None
+        self.live_task = None
+        self.live_pending = []
+        self.analytics_task = AnalyticsTask(products, snapshot_id, self.analytics_generation)
+        self.analytics_status = status or "✅ Анализ завершен успешно!"
+        self.analytics_task.signals.finished.connect(self.apply_analytics)
+        self.analytics_task.signals.error.connect(self.show_error)
+        QThreadPool.globalInstance().start(self.analytics_task)
+
+    def apply_analytics(self, result):
+        """Подстановка посчитанной в фоне аналитики"""
+        if result.generation != self.analytics_generation:
+            return
+        with self.ui_monitor.section("подстановка аналитики"):
+            self.analytics_task = None
+            self.analytics = result.analytics
+            self.category_model.set_stats(result.category_stats)
+            self.opportunities_text.setHtml(result.opportunities_html)
+            
+            print(f"Аналитика по {len(self.products)} товарам посчитана в фоне за {result.seconds:.2f}с")
+            self.status_label.setText(self.analytics_status)
+            self.status_label.setStyleSheet("color: #28a745; font-weight: bold; background: transparent;")
+            self.progress_bar.setValue(100)
+            self.parse_button.setEnabled(True)
+            self.export_button.setEnabled(True)
+            self.refresh_snapshots()
+    
+    def show_chart(self, chart_type):
+        """Показать график"""
+        if not self.analytics:
+            QMessageBox.warning(self, "Ошибка", "Сначала выполните анализ")
+            return
+        
+        try:
+            if chart_type == 'price_sales':
+                self.chart_widget.plot_price_vs_sales(self.analytics.products)
+            elif chart_type == 'pie':
+                category_stats = self.analytics.get_category_stats()
+                self.chart_widget.plot_category_pie(category_stats)
+            elif chart_type == 'top_niches':
+                category_stats = self.analytics.get_category_stats()
+                self.chart_widget.plot_top_niches(category_stats)
+            elif chart_type == 'segments':
+                segment_stats = self.analytics.get_price_segments()
+                self.chart_widget.plot_price_segments(segment_stats)
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось построить график: {str(e)}")
+
+    def export_to_excel(self):
+        """Экспорт отчета в Excel"""
+        if not self.products:
+            QMessageBox.warning(self, "Ошибка", "Нет данных для экспорта")
+            return
+        
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Сохранить отчет", 
+            f"market_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            "Excel Files (*.xlsx)"
+        )
+        
+        if not filename:
+            return
+        
+        # Статистика уже посчитана (запомнена движком), в фоне только запись файла
+        self.export_thread = ExportThread(ExcelReport.from_analytics(self.products, self.analytics), filename)
+        self.export_thread.progress.connect(self.update_progress)
+        self.export_thread.finished.connect(self.export_finished)
+        self.export_thread.error.connect(self.export_failed)
+        self.export_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("⏳ Экспорт в Excel...")
+        self.status_label.setStyleSheet("color: #667eea; font-weight: bold; background: transparent;")
+        self.export_thread.start()
+
+    def export_finished(self, filename):
+        self.export_button.setEnabled(True)
+        self.status_label.setText("✅ Отчет сохранен")
+        self.status_label.setStyleSheet("color: #28a745; font-weight: bold; background: transparent;")
+        QMessageBox.information(self, "Успех", f"Отчет успешно сохранен:\n{filename}")
+
+    def export_failed(self, error_msg):
+        self.export_button.setEnabled(True)
+        self.status_label.setText(f"❌ Ошибка экспорта: {error_msg}")
+        self.status_label.setStyleSheet("color: #dc3545; font-weight: bold; background: transparent;")
+        QMessageBox.critical(self, "Ошибка", f"Не удалось экспортировать: {error_msg}")
+
+    def closeEvent(self, event):
+        self.ui_monitor.report()
+        super().closeEvent(event)
+
+    def show_error(self, error_msg):
+        self.status_label.setText(f"❌ Ошибка: {error_msg}")
+        self.status_label.setStyleSheet("color: #dc3545; font-weight: bold; background: transparent;")
+        self.progress_bar.setValue(0)
+        self.parse_button.setEnabled(True)
+        QMessageBox.critical(self, "Ошибка", error_msg)
+
+
+def run_gui(argv):
+    app = QApplication(argv)
+    app.setStyle('Fusion')
+    
+    palette = QPalette()
+    palette.setColor(QPalette.ColorRole.Window, QColor(240, 240, 245))
+    palette.setColor(QPalette.ColorRole.WindowText, QColor(44, 62, 80))
+    app.setPalette(palette)
+    
+    window = MainWindow()
+    window.show()
+    return app.exec()
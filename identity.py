@@ -0,0 +1,227 @@
+"""
+Один и тот же товар у разных продавцов и на разных площадках: группы
+предложений по близким названиям для сравнения цен ggsel и plati.
+
+Название сводится к множеству слов: нижний регистр, ё -> е, римские цифры
+-> арабские, без знаков и слов вроде «ключ» или «купить». Платформа,
+издание, регион и числа - признаки: у одного товара они совпадают в
+точности, иначе Elden Ring для Steam и для Xbox или FIFA 23 и FIFA 24
+склеились бы. По остальным словам нужна мера Жаккара не ниже порога.
+
+Одинаковые множества слов сразу считаются одним названием, разные
+сравниваются через MinHash и LSH: подпись множества - минимумы хешей его
+слов по MINHASH_PERMUTATIONS перестановкам, разбитые на LSH_BANDS полос.
+Кандидаты - названия с теми же признаками и совпавшей полосой. Каждое
+название сравнивается лишь с немногими кандидатами, поэтому время растет
+почти линейно с числом предложений.
+"""
+
+import re
+import zlib
+from urllib.parse import urlparse
+
+import numpy as np
+
+from core import SITE_HOSTS
+
+TITLE_SIMILARITY = 0.7      # порог меры Жаккара по словам названия без признаков
+MINHASH_PERMUTATIONS = 60
+LSH_BANDS = 20              # по 3 значения: пара с мерой 0.7 становится кандидатом почти наверняка
+MINHASH_SEED = 7
+MINHASH_PRIME = (1 << 31) - 1
+MINHASH_CHUNK = 20000       # названий на шаг расчета подписей
+
+WORD_RE = re.compile(r'[0-9a-zа-я]+')
+ALIASES = {
+    'ii': '2', 'iii': '3', 'iv': '4', 'v': '5', 'vi': '6', 'vii': '7', 'viii': '8', 'ix': '9',
+    'стим': 'steam', 'рф': 'ru', 'россия': 'ru', 'снг': 'cis', 'глобал': 'global', 'worldwide': 'global',
+    'ww': 'global', 'турция': 'tr', 'turkey': 'tr', 'делюкс': 'deluxe', 'голд': 'gold',
+}
+STOP_WORDS = frozenset([
+    'ключ', 'key', 'купить', 'код', 'code', 'активации', 'activation', 'лицензия', 'лицензионный',
+    'цифровой', 'digital', 'игра', 'game', 'для', 'на', 'и', 'в', 'с', 'the', 'of', 'and', 'for',
+    'pc', 'пк', 'app', 'моментально', 'быстро', 'мгновенно', 'навсегда', 'официальный', 'оригинал',
+    'edition', 'издание', 'версия', 'version', 'standard', 'стандартное', 'region', 'регион',
+])
+PLATFORMS = frozenset(['steam', 'xbox', 'ps4', 'ps5', 'psn', 'playstation', 'nintendo', 'switch', 'epic', 'egs',
+                       'origin', 'ea', 'uplay', 'ubisoft', 'gog', 'battle', 'rockstar', 'microsoft'])
+EDITIONS = frozenset(['deluxe', 'gold', 'ultimate', 'premium', 'complete', 'goty', 'definitive', 'collector',
+                      'collectors', 'полное', 'золотое', 'расширенное'])
+REGIONS = frozenset(['ru', 'cis', 'global', 'eu', 'us', 'uk', 'tr', 'ar', 'kz', 'ua', 'in', 'row'])
+ATTRIBUTE_WORDS = PLATFORMS | EDITIONS | REGIONS
+
+
+def title_tokens(name):
+    """Множество значимых слов названия"""
+    words = (ALIASES.get(w, w) for w in WORD_RE.findall(name.lower().replace('ё', 'е')))
+    return frozenset(w for w in words if w not in STOP_WORDS and (len(w) > 1 or w.isdigit()))
+
+
+def split_tokens(tokens):
+    """(признаки: платформа, издание, регион и числа; остальные слова)"""
+    attributes = frozenset(t for t in tokens if t in ATTRIBUTE_WORDS or t.isdigit())
+    return attributes, tokens - attributes
+
+
+def _similar(a, b, threshold):
+    (attributes_a, words_a), (attributes_b, words_b) = a, b
+    if attributes_a != attributes_b:
+        return False
+    union = len(words_a | words_b)
+    return bool(union) and len(words_a & words_b) >= threshold * union
+
+
+def similar(a, b, threshold=TITLE_SIMILARITY):
+    """Одно ли это название: те же признаки и мера Жаккара по остальным словам не ниже порога"""
+    return _similar(split_tokens(a), split_tokens(b), threshold)
+
+
+def product_site(product):
+    """Площадка товара по ссылке: ggsel, plati или хост; пустая строка без ссылки"""
+    host = urlparse(product.get('link') or '').netloc.lower().removeprefix('www.')
+    return SITE_HOSTS.get(host, host)
+
+
+class ProductIdentityIndex:
+    """
+    Группы предложений одного товара.
+
+    group_ids - номер группы для каждого товара в порядке первого появления.
+    Товары без значимых слов в названии остаются каждый в своей группе.
+    """
+
+    COMPARE_COLUMNS = ['name', 'offers', 'sites', 'cheapest_site', 'cheapest_price', 'cheapest_link',
+                       'priciest_site', 'priciest_price', 'priciest_link', 'saving_pct']
+
+    def __init__(self, products, threshold=TITLE_SIMILARITY, permutations=MINHASH_PERMUTATIONS, bands=LSH_BANDS):
+        self.products = products
+        self.threshold = threshold
+        self.permutations = permutations
+        self.bands = bands
+        self.titles = 0         # разных названий (множеств слов)
+        self.candidates = 0     # пар названий, проверенных по мере Жаккара
+        self.group_ids = self._build()
+
+    def _build(self):
+        titles = {}
+        title_of = np.empty(len(self.products), dtype=np.int64)
+        for i, p in enumerate(self.products):
+            tokens = title_tokens(p['name'])
+            title_of[i] = titles.setdefault(tokens, len(titles)) if tokens else -1
+        token_sets = list(titles)
+        self.titles = len(token_sets)
+
+        roots = self._link(token_sets)
+        # Товары без слов получают собственные метки за пределами номеров названий
+        labels = np.where(title_of >= 0, roots[np.maximum(title_of, 0)],
+                          len(token_sets) + np.arange(len(self.products)))
+        _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+        # Нумерация групп в порядке первого товара группы
+        rank = np.empty(len(first), dtype=np.int64)
+        rank[np.argsort(first, kind='stable')] = np.arange(len(first))
+        return rank[inverse]
+
+    def _signatures(self, token_sets):
+        """Подписи MinHash, строка на множество слов"""
+        vocab = {}
+        flat = []
+        offsets = np.empty(len(token_sets), dtype=np.int64)
+        for i, tokens in enumerate(token_sets):
+            offsets[i] = len(flat)
+            flat.extend(vocab.setdefault(t, len(vocab)) for t in tokens)
+        flat = np.array(flat, dtype=np.int64)
+
+        hashes = np.fromiter((zlib.crc32(t.encode('utf-8')) for t in vocab), dtype=np.uint64, count=len(vocab))
+        rnd = np.random.default_rng(MINHASH_SEED)
+        a = rnd.integers(1, MINHASH_PRIME, self.permutations, dtype=np.uint64)
+        b = rnd.integers(0, MINHASH_PRIME, self.permutations, dtype=np.uint64)
+        values = ((hashes[:, None] * a + b) % MINHASH_PRIME).astype(np.uint32)
+
+        signatures = np.empty((len(token_sets), self.permutations), dtype=np.uint32)
+        for start in range(0, len(token_sets), MINHASH_CHUNK):
+            end = min(start + MINHASH_CHUNK, len(token_sets))
+            low = offsets[start]
+            high = offsets[end] if end < len(token_sets) else len(flat)
+            signatures[start:end] = np.minimum.reduceat(values[flat[low:high]], offsets[start:end] - low, axis=0)
+        return signatures
+
+    def _candidates(self, signatures, attributes):
+        """Пары (название, первое название корзины) с теми же признаками и совпавшей полосой, без повторов"""
+        n = len(signatures)
+        rows = self.permutations // self.bands
+        pairs = []
+        for band in range(self.bands):
+            columns = np.column_stack([attributes, signatures[:, band * rows:(band + 1) * rows]])
+            keys = np.ascontiguousarray(columns).view(f'V{4 * (rows + 1)}').ravel()
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            heads = first[inverse.ravel()]
+            members = np.flatnonzero(heads != np.arange(n))
+            pairs.append(members * n + heads[members])
+        if not pairs:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(pairs))
+
+    def _link(self, token_sets):
+        """Корень группы для каждого названия; с каждым сравнивается только первое название его корзины"""
+        parent = list(range(len(token_sets)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        if len(token_sets) > 1:
+            n = len(token_sets)
+            parts = [split_tokens(tokens) for tokens in token_sets]
+            attribute_ids = {}
+            attributes = np.fromiter((attribute_ids.setdefault(a, len(attribute_ids)) for a, _ in parts),
+                                     dtype=np.uint32, count=n)
+            for pair in self._candidates(self._signatures(token_sets), attributes).tolist():
+                i, j = divmod(pair, n)
+                root_i, root_j = find(i), find(j)
+                if root_i == root_j:
+                    continue
+                self.candidates += 1
+                if _similar(parts[i], parts[j], self.threshold):
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+        return np.array([find(i) for i in range(len(token_sets))], dtype=np.int64)
+
+    def groups(self, min_size=2):
+        """Номера товаров по группам, только группы не меньше min_size"""
+        order = np.argsort(self.group_ids, kind='stable')
+        bounds = np.flatnonzero(np.diff(self.group_ids[order])) + 1
+        return [group.tolist() for group in np.split(order, bounds) if len(group) >= min_size]
+
+    def cross_site(self, min_sites=2):
+        """
+        Сравнение цен по группам, представленным на нескольких площадках:
+        самое дешевое предложение группы против самого дорогого из лучших
+        предложений остальных площадок. Сначала наибольшая экономия.
+        """
+        rows = []
+        for members in self.groups():
+            best = {}
+            for i in members:
+                p = self.products[i]
+                site = product_site(p)
+                if site and (site not in best or p['price'] < best[site]['price']):
+                    best[site] = p
+            if len(best) < min_sites:
+                continue
+            offers = sorted(best.items(), key=lambda item: item[1]['price'])
+            (low_site, low), (high_site, high) = offers[0], offers[-1]
+            rows.append({
+                'name': low['name'],
+                'offers': len(members),
+                'sites': len(best),
+                'cheapest_site': low_site,
+                'cheapest_price': low['price'],
+                'cheapest_link': low['link'],
+                'priciest_site': high_site,
+                'priciest_price': high['price'],
+                'priciest_link': high['link'],
+                'saving_pct': 100 * (high['price'] - low['price']) / high['price'] if high['price'] else 0.0,
+            })
+        rows.sort(key=lambda row: row['saving_pct'], reverse=True)
+        return rows
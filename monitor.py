@@ -0,0 +1,247 @@
+"""
+Мониторинг каталогов по расписанию: постоянная очередь заданий в SQLite,
+ограниченный пул потоков и корзина токенов на домен.
+
+Каждое задание - адрес каталога с интервалом. Результат сохраняется снимком
+в историю сразу после загрузки; при ошибке задание повторяется с растущей
+паузой, не чаще своего обычного интервала.
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+
+from core import (SNAPSHOT_DB, ChangeDetector, DomainRateLimiter, DriverPool, PageScraper, ParsePool,
+                  create_http_session, save_snapshot)
+
+MONITOR_WORKERS = 2         # одновременно выполняемых заданий
+MONITOR_DOMAIN_INTERVAL = 3.0   # секунд на токен для одного домена
+MONITOR_DOMAIN_BURST = 2        # запросов к домену подряд после простоя
+MONITOR_POLL = 30.0         # самый долгий сон планировщика между проверками очереди, сек
+JOB_LEASE = 10 * MONITOR_POLL   # отметка без продления дольше этого - задание брошено упавшим процессом
+RETRY_BASE = 60.0           # пауза после первой ошибки, сек; дальше удваивается
+RETRY_MAX = 3600.0          # потолок паузы между повторами, сек
+
+
+class JobQueue:
+    """
+    Задания мониторинга в той же базе, что и история снимков.
+
+    Задание забирается в работу отметкой running_since, поэтому несколько
+    процессов не выполнят его дважды. Пока задание выполняется, процесс
+    продлевает отметку (renew); release_stale снимает только отметки, не
+    продленные дольше JOB_LEASE, то есть оставшиеся после аварийной остановки,
+    и не трогает задания живого соседнего процесса.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY,
+            url TEXT NOT NULL,
+            product_type TEXT NOT NULL,
+            fetch_mode TEXT NOT NULL,
+            max_items INTEGER,
+            interval REAL NOT NULL,
+            next_run REAL NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            running_since REAL,
+            last_run REAL,
+            last_status TEXT,
+            last_error TEXT,
+            last_snapshot INTEGER,
+            last_count INTEGER,
+            UNIQUE (url, product_type)
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_next ON jobs(next_run);
+    """
+
+    def __init__(self, path=SNAPSHOT_DB):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _connection(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, url, interval, product_type="Все", fetch_mode='auto', max_items=None):
+        """Новое задание или новые параметры существующего; возвращает его номер"""
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO jobs (url, product_type, fetch_mode, max_items, interval, next_run) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (url, product_type) DO UPDATE SET "
+                "fetch_mode = excluded.fetch_mode, max_items = excluded.max_items, interval = excluded.interval",
+                (url, product_type, fetch_mode, max_items, interval, time.time()))
+            return conn.execute("SELECT id FROM jobs WHERE url = ? AND product_type = ?",
+                                (url, product_type)).fetchone()[0]
+
+    def remove(self, job_id):
+        with self._connection() as conn:
+            return conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,)).rowcount > 0
+
+    def jobs(self):
+        with self._connection() as conn:
+            return [dict(r) for r in conn.execute("SELECT * FROM jobs ORDER BY next_run")]
+
+    def claim(self, limit, now=None):
+        """Забрать в работу до limit заданий, срок которых наступил"""
+        now = time.time() if now is None else now
+        with self._connection() as conn:
+            # BEGIN IMMEDIATE: выбор и отметка - одна транзакция записи
+            conn.execute("BEGIN IMMEDIATE")
+            rows = [dict(r) for r in conn.execute(
+                "SELECT * FROM jobs WHERE running_since IS NULL AND next_run <= ? ORDER BY next_run LIMIT ?",
+                (now, limit))]
+            conn.executemany("UPDATE jobs SET running_since = ? WHERE id = ?", ((now, r['id']) for r in rows))
+        return rows
+
+    def next_due(self):
+        """Время ближайшего свободного задания или None"""
+        with self._connection() as conn:
+            return conn.execute("SELECT MIN(next_run) FROM jobs WHERE running_since IS NULL").fetchone()[0]
+
+    def finish(self, job, snapshot_id, count, now=None):
+        now = time.time() if now is None else now
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET running_since = NULL, attempts = 0, next_run = ?, last_run = ?, "
+                "last_status = 'ok', last_error = NULL, last_snapshot = ?, last_count = ? WHERE id = ?",
+                (now + job['interval'], now, snapshot_id, count, job['id']))
+
+    def fail(self, job, error, now=None):
+        """Ошибка задания: повтор через RETRY_BASE * 2^n со случайным разбросом; возвращает паузу"""
+        now = time.time() if now is None else now
+        attempts = job['attempts'] + 1
+        delay = min(RETRY_BASE * 2 ** (attempts - 1), RETRY_MAX, job['interval'])
+        delay *= random.uniform(0.8, 1.2)
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET running_since = NULL, attempts = ?, next_run = ?, last_run = ?, "
+                "last_status = 'error', last_error = ? WHERE id = ?",
+                (attempts, now + delay, now, str(error)[:500], job['id']))
+        return delay
+
+    def renew(self, job_ids, now=None):
+        """Продление отметок выполняемых заданий"""
+        now = time.time() if now is None else now
+        with self._connection() as conn:
+            conn.executemany("UPDATE jobs SET running_since = ? WHERE id = ? AND running_since IS NOT NULL",
+                             ((now, job_id) for job_id in job_ids))
+
+    def release_stale(self, lease=JOB_LEASE, now=None):
+        """Снять отметки заданий, не продленные дольше lease секунд: их процесс остановлен"""
+        now = time.time() if now is None else now
+        with self._connection() as conn:
+            return conn.execute("UPDATE jobs SET running_since = NULL WHERE running_since < ?",
+                                (now - lease,)).rowcount
+
+
+class Monitor:
+    """Планировщик: забирает наступившие задания и выполняет их в ограниченном пуле"""
+
+    def __init__(self, queue=None, workers=MONITOR_WORKERS, limiter=None, skip_unchanged=True):
+        self.queue = queue or JobQueue()
+        self.workers = workers
+        self.limiter = limiter or DomainRateLimiter(per_domain=1, min_interval=MONITOR_DOMAIN_INTERVAL,
+                                                    burst=MONITOR_DOMAIN_BURST)
+        self.detector = ChangeDetector() if skip_unchanged else None
+        self.pool = DriverPool(size=workers)
+        self.parse_pool = ParsePool(workers)    # разбор больших страниц не мешает загрузке в соседнем потоке
+        self.done = 0
+        self.failed = 0
+        self._local = threading.local()
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run_job(self, job):
+        """Загрузка одного задания с сохранением снимка; ошибки уходят в очередь на повтор"""
+        if not hasattr(self._local, 'session'):
+            self._local.session = create_http_session()
+        started = time.perf_counter()
+        try:
+            scraper = PageScraper(job['product_type'], job['fetch_mode'], pool=self.pool,
+                                  session=self._local.session, rate_limiter=self.limiter,
+                                  max_items=job['max_items'], detector=self.detector, parse_pool=self.parse_pool)
+            products = scraper.fetch_products(job['url'])
+            if not products:
+                raise RuntimeError("не удалось извлечь товары")
+            snapshot_id = scraper.snapshot_id or save_snapshot(products, [job['url']], job['product_type'])
+        except Exception as e:
+            delay = self.queue.fail(job, e)
+            print(f"Задание {job['id']}: ошибка ({e}), повтор через {delay / 60:.0f} мин")
+            return False
+
+        self.queue.finish(job, snapshot_id, len(products))
+        print(f"Задание {job['id']}: товаров {len(products)}, снимок {snapshot_id}, "
+              f"{time.perf_counter() - started:.1f} с")
+        return True
+
+    def _count(self, futures):
+        for future in futures:
+            if future.result():
+                self.done += 1
+            else:
+                self.failed += 1
+
+    def run(self, once=False, poll=MONITOR_POLL):
+        """
+        Цикл планировщика до stop(). С once=True выполняет наступившие задания
+        и возвращается, когда они завершены (запуск из cron).
+        """
+        running = {}    # future -> номер задания
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                while not self._stop.is_set():
+                    self.queue.renew(running.values())
+                    released = self.queue.release_stale()
+                    if released:
+                        print(f"Снято зависших заданий: {released}")
+                    
+                    free = self.workers - len(running)
+                    if free > 0:
+                        for job in self.queue.claim(free):
+                            running[executor.submit(self.run_job, job)] = job['id']
+
+                    if once and not running:
+                        break
+
+                    # Сон до ближайшего задания, но с проверкой завершившихся потоков
+                    next_due = self.queue.next_due()
+                    timeout = poll if next_due is None else min(poll, max(next_due - time.time(), 0.1))
+                    if running:
+                        finished, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                        self._count(finished)
+                        for future in finished:
+                            del running[future]
+                    elif not once:
+                        self._stop.wait(timeout)
+                
+                # Задания, начатые до остановки, доделываются с продлением отметок
+                while running:
+                    finished, _ = wait(running, timeout=poll)
+                    self._count(finished)
+                    for future in finished:
+                        del running[future]
+                    self.queue.renew(running.values())
+        finally:
+            self.pool.shutdown()
+            self.parse_pool.shutdown()
+
+        print(f"Мониторинг остановлен: выполнено {self.done}, ошибок {self.failed}")
+        if self.detector and self.detector.report():
+            print(f"Проверка изменений: {self.detector.report()}")
@@ -0,0 +1,99 @@
+"""
+Запись ответов для tests/test_http_fetcher.py через RecordedSession.
+
+Вместо сайтов ответы отдает заглушка со страницами из benchmarks/fixtures.py
+и ответами API поиска plati: каталог ggsel из трех страниц (вторая частично
+повторяет первую, третья - карточки первой со ссылками из слайдера) и два
+ответа API plati, во втором - повторы со ссылками партнерок. Для проверки
+лимитов - большие каталоги дальше 30 страниц: ggsel из BIG_GGSEL_PAGES
+страниц по 3 карточки без блока рекомендаций и поиск plati из
+BIG_PLATI_PAGES страниц по 10 товаров. Ответы пишутся тем же путем, что и при
+записи с сайтов.
+
+Запуск:
+    python tests/record_http.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+
+TESTS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS), 'benchmarks'))
+
+from core import HttpFetcher, RecordedResponse, RecordedSession, create_parser, full_url  # noqa: E402
+from fixtures import GAMES, ggsel_page  # noqa: E402
+
+RECORDED_DIR = os.path.join(TESTS, 'recorded')
+GGSEL_URL = 'https://ggsel.net/catalog/steam'
+PLATI_URL = 'https://plati.market/search/steam'
+BIG_GGSEL_URL = 'https://ggsel.net/catalog/big'
+BIG_PLATI_URL = 'https://plati.market/search/big'
+BIG_GGSEL_PAGES = 32
+BIG_PLATI_PAGES = 35
+
+
+def plati_items(numbers, referral=False):
+    items = []
+    for i in numbers:
+        url = f"https://plati.market/itm/{GAMES[i % len(GAMES)].lower().replace(' ', '-')}/{3000000 + i}"
+        items.append({'id': 3000000 + i, 'name': f"{GAMES[i % len(GAMES)]} ключ #{i}",
+                      'price_rur': f"{100 + i * 10},50", 'numsold': i * 3,
+                      'url': url + '?ai=777' if referral else url})
+    return items
+
+
+def responses():
+    """Адрес -> (код, текст, заголовки)"""
+    html = {'Content-Type': 'text/html; charset=utf-8', 'ETag': '"ggsel-1"'}
+    slider = re.sub(r'href="(/catalog/product/\d+)"', r'href="\1?from=slider"', ggsel_page(20, seed=1))
+    api = {'Content-Type': 'application/json'}
+    pages = {
+        GGSEL_URL: (200, ggsel_page(20, seed=1), html),
+        full_url(GGSEL_URL, {'page': 2}): (200, ggsel_page(20, seed=2, start=15), html),
+        full_url(GGSEL_URL, {'page': 3}): (200, slider, html),
+    }
+    for page, items in ((1, plati_items(range(10))), (2, plati_items(range(8, 13), referral=True))):
+        params = HttpFetcher.plati_params('steam', page, 500)
+        pages[full_url(HttpFetcher.PLATI_SEARCH_API, params)] = (
+            200, json.dumps({'Totalpages': 2, 'items': items}, ensure_ascii=False), api)
+
+    # Последняя страница большого каталога ggsel повторяет первую - на ней обход останавливается
+    for page in range(1, BIG_GGSEL_PAGES + 2):
+        text = re.sub(r'<div class="BottomGoods.*?</div></main>', '</main>',
+                      ggsel_page(3, seed=page, start=3 * ((page - 1) % BIG_GGSEL_PAGES)))
+        pages[full_url(BIG_GGSEL_URL, {'page': page} if page > 1 else None)] = (200, text, html)
+    for page in range(1, BIG_PLATI_PAGES + 1):
+        params = HttpFetcher.plati_params('big', page, 500)
+        items = plati_items(range(10 * (page - 1), 10 * page))
+        pages[full_url(HttpFetcher.PLATI_SEARCH_API, params)] = (
+            200, json.dumps({'Totalpages': BIG_PLATI_PAGES, 'items': items}, ensure_ascii=False), api)
+    return pages
+
+
+class StubSession:
+    """Сайты без сети: ответы из responses()"""
+
+    def __init__(self):
+        self.pages = responses()
+
+    def get(self, url, **kwargs):
+        return RecordedResponse(url, *self.pages.get(url, (404, '', {})))
+
+
+def main():
+    shutil.rmtree(RECORDED_DIR, ignore_errors=True)
+    session = RecordedSession(RECORDED_DIR, session=StubSession())
+    with contextlib.redirect_stdout(io.StringIO()):
+        for url in (GGSEL_URL, PLATI_URL, BIG_GGSEL_URL, BIG_PLATI_URL):
+            HttpFetcher(create_parser(max_items=0), session=session).fetch(url)
+    print(f"Записано ответов: {len(os.listdir(RECORDED_DIR))} -> {RECORDED_DIR}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""HttpFetcher на записанных ответах (tests/recorded, запись - tests/record_http.py): разбор и отбор повторов"""
+
+import os
+from functools import partial
+
+import pytest
+import requests
+
+import core
+from core import (DEFAULT_MAX_ITEMS, BatchScraper, DomainRateLimiter, HttpFetcher, PageScraper, RecordedSession,
+                  create_parser, link_key, merge_products)
+
+RECORDED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recorded')
+BIG_GGSEL_URL = 'https://ggsel.net/catalog/big'     # 32 страницы по 3 карточки, 33-я повторяет первую
+BIG_PLATI_URL = 'https://plati.market/search/big'   # 35 страниц API по 10 товаров
+
+
+@pytest.fixture
+def fetcher():
+    return HttpFetcher(create_parser(), session=RecordedSession(RECORDED_DIR))
+
+
+def test_ggsel_pages(fetcher):
+    products = fetcher.fetch('https://ggsel.net/catalog/steam')
+    # Вторая страница повторяет 5 карточек первой, третья - только повторы из слайдера
+    assert [p['link'].rsplit('/', 1)[1] for p in products] == [str(100000 + i) for i in range(35)]
+    assert len({link_key(p['link']) for p in products}) == 35
+    assert all(p['name'] and p['price'] > 0 for p in products)
+    assert fetcher.bytes_received > 0
+
+
+def test_plati_search(fetcher):
+    products = fetcher.fetch('https://plati.market/search/steam')
+    # Повторы второй страницы отличаются меткой партнерки и отбрасываются при загрузке
+    assert [p['link'].split('?')[0].rsplit('/', 1)[1] for p in products] == [str(3000000 + i) for i in range(13)]
+    assert products[0]['price'] == 100.5
+    assert len(merge_products([products])) == 13
+
+
+def test_unrecorded_url(fetcher):
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch('https://ggsel.net/catalog/xbox')
+
+
+@pytest.mark.parametrize('url, max_items, expected', [
+    (BIG_GGSEL_URL, 0, 96),
+    (BIG_PLATI_URL, 0, 350),
+    (BIG_GGSEL_URL, None, 96),
+    (BIG_PLATI_URL, None, DEFAULT_MAX_ITEMS['plati']),
+    (BIG_PLATI_URL, 320, 320),
+])
+def test_page_limit_follows_item_limit(url, max_items, expected):
+    # Страниц больше 30: без лимита обход идет до конца каталога
+    fetcher = HttpFetcher(create_parser(max_items=max_items), session=RecordedSession(RECORDED_DIR))
+    products = fetcher.fetch(url)
+    assert len(products) == expected
+    assert len({link_key(p['link']) for p in products}) == expected
+
+
+@pytest.mark.parametrize('max_items, expected', [(0, 350), (None, DEFAULT_MAX_ITEMS['plati']), (100, 100)])
+def test_scraper_total_limit(max_items, expected):
+    batches = []
+    scraper = PageScraper(fetch_mode='http', session=RecordedSession(RECORDED_DIR), on_products=batches.append,
+                          max_items=max_items)
+    assert len(scraper.fetch_products(BIG_PLATI_URL)) == expected
+    assert sum(len(batch) for batch in batches) == expected
+
+
+def test_batch_streams_each_offer_once(monkeypatch):
+    # Каталог steam целиком входит в первые страницы большого каталога
+    monkeypatch.setattr(core, 'create_http_session', lambda: RecordedSession(RECORDED_DIR))
+    monkeypatch.setattr(core, 'DomainRateLimiter', partial(DomainRateLimiter, min_interval=0))
+    batches = []
+    products = BatchScraper(['https://ggsel.net/catalog/steam', BIG_GGSEL_URL], fetch_mode='http', max_items=0,
+                            on_products=batches.append, parse_processes=0).run()
+    streamed = [link_key(p['link']) for batch in batches for p in batch]
+    assert len(streamed) == len(set(streamed)) == len(products) == 96
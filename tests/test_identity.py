@@ -0,0 +1,120 @@
+"""Нормализация ссылок предложений и группы одного товара на ggsel и plati"""
+
+from itertools import combinations
+
+import pytest
+
+from core import link_key, merge_products
+from identity import ProductIdentityIndex, similar, title_tokens
+
+LINKS = [
+    # ggsel: слаг, слайдер, якорь, другой домен, www, схема в верхнем регистре
+    ("https://ggsel.net/catalog/product/3051213", ('ggsel', '3051213')),
+    ("https://ggsel.net/catalog/product/elden-ring-key-3051213", ('ggsel', '3051213')),
+    ("https://ggsel.net/catalog/product/elden-ring-key-3051213?from=slider", ('ggsel', '3051213')),
+    ("https://ggsel.net/catalog/product/3051213/#reviews", ('ggsel', '3051213')),
+    ("https://www.ggsel.com/catalog/product/3051213", ('ggsel', '3051213')),
+    ("HTTPS://GGSEL.NET/catalog/product/3051213", ('ggsel', '3051213')),
+    ("https://ggsel.net/catalog/product/3051213?utm_source=tg&utm_medium=post", ('ggsel', '3051213')),
+    # plati: слаг, партнерка, хосты plati.ru/io/market, www
+    ("https://plati.market/itm/3051213", ('plati', '3051213')),
+    ("https://plati.market/itm/elden-ring-steam/3051213", ('plati', '3051213')),
+    ("https://plati.market/itm/elden-ring-steam/3051213?ai=123456", ('plati', '3051213')),
+    ("https://www.plati.market/itm/elden-ring-steam/3051213/", ('plati', '3051213')),
+    ("https://plati.ru/itm/3051213", ('plati', '3051213')),
+    ("https://plati.io/itm/elden-ring-steam/3051213", ('plati', '3051213')),
+    ("http://plati.ru/itm/elden-ring-steam/3051213?ai=1&utm_campaign=x", ('plati', '3051213')),
+    # произвольный магазин: без меток, параметры товара остаются и упорядочиваются
+    ("https://www.shop.ru/item/42/?utm_source=x&ref=7", ('shop.ru', '/item/42', '')),
+    ("https://shop.ru/item?id=42&color=red&gclid=abc", ('shop.ru', '/item', 'color=red&id=42')),
+    ("/catalog/product/3051213", ('', '/catalog/product/3051213', '')),
+]
+
+DIFFERENT_LINKS = [
+    ("https://ggsel.net/catalog/product/3051213", "https://plati.market/itm/3051213"),
+    ("https://ggsel.net/catalog/product/3051213", "https://ggsel.net/catalog/product/3051214"),
+    ("https://shop.ru/item?id=42", "https://shop.ru/item?id=43"),
+]
+
+SAME_TITLES = [
+    ("Elden Ring Steam", "ELDEN RING | Steam Ключ"),
+    ("Elden Ring Deluxe Edition Steam RU", "Ключ Elden Ring Deluxe (Steam) РФ"),
+    ("Dark Souls III Steam", "Dark Souls 3 [Steam] KEY"),
+    ("Cyberpunk 2077 Steam Россия", "Купить Cyberpunk 2077 (STEAM) RU"),
+]
+
+DIFFERENT_TITLES = [
+    ("Elden Ring Steam", "Elden Ring Xbox"),
+    ("FIFA 23", "FIFA 24"),
+    ("Elden Ring Steam", "Elden Ring Deluxe Edition Steam"),
+    ("Elden Ring Steam RU", "Elden Ring Steam Global"),
+    ("Dark Souls 2 Steam", "Dark Souls III Steam"),
+    ("Elden Ring Steam", "Dark Souls Steam"),
+]
+
+
+@pytest.mark.parametrize('link, expected', LINKS)
+def test_link_key(link, expected):
+    assert link_key(link) == expected
+
+
+@pytest.mark.parametrize('a, b', DIFFERENT_LINKS)
+def test_link_key_keeps_offers_apart(a, b):
+    assert link_key(a) != link_key(b)
+
+
+def test_merge_link_variants():
+    products = [{'name': 'Elden Ring', 'price': 1999.0, 'link': link} for link, _ in LINKS]
+    assert len(merge_products([products])) == len({key for _, key in LINKS})
+
+
+@pytest.mark.parametrize('a, b', SAME_TITLES)
+def test_same_product(a, b):
+    assert similar(title_tokens(a), title_tokens(b))
+
+
+@pytest.mark.parametrize('a, b', DIFFERENT_TITLES)
+def test_different_products(a, b):
+    assert not similar(title_tokens(a), title_tokens(b))
+    index = ProductIdentityIndex([{'name': a, 'price': 1.0, 'link': 'https://ggsel.net/catalog/product/1'},
+                                  {'name': b, 'price': 2.0, 'link': 'https://plati.market/itm/2'}])
+    assert index.group_ids.tolist() == [0, 1]
+    assert index.cross_site() == []
+
+
+def test_groups_match_brute_force():
+    names = [name for pair in SAME_TITLES + DIFFERENT_TITLES for name in pair]
+    names += ["Elden Ring Ключ Steam моментально", "Cyberpunk 2077 GOG", "FIFA 23 Ultimate Edition"]
+    products = [{'name': name, 'price': float(100 + i), 'link': f"https://plati.market/itm/{i}"}
+                for i, name in enumerate(names)]
+
+    # Полный перебор: связные компоненты графа похожих пар
+    parent = list(range(len(names)))
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    tokens = [title_tokens(name) for name in names]
+    for i, j in combinations(range(len(names)), 2):
+        if similar(tokens[i], tokens[j]):
+            parent[max(find(i), find(j))] = min(find(i), find(j))
+    ids = {}
+    expected = [ids.setdefault(find(i), len(ids)) for i in range(len(names))]
+
+    assert ProductIdentityIndex(products).group_ids.tolist() == expected
+
+
+def test_cross_site():
+    products = [
+        {'name': "Elden Ring Steam", 'price': 2500.0, 'link': "https://ggsel.net/catalog/product/1"},
+        {'name': "ELDEN RING (Steam) Ключ", 'price': 1900.0, 'link': "https://plati.market/itm/elden-ring/2"},
+        {'name': "Elden Ring | Steam", 'price': 2100.0, 'link': "https://plati.market/itm/3"},
+        {'name': "Elden Ring Xbox", 'price': 900.0, 'link': "https://plati.market/itm/4"},
+    ]
+    [row] = ProductIdentityIndex(products).cross_site()
+    assert (row['offers'], row['sites']) == (3, 2)
+    assert (row['cheapest_site'], row['cheapest_price']) == ('plati', 1900.0)
+    assert (row['priciest_site'], row['priciest_price']) == ('ggsel', 2500.0)
+    assert row['saving_pct'] == pytest.approx(24.0)
@@ -0,0 +1,82 @@
+"""Очередь заданий мониторинга: отметки выполнения, их продление и паузы повторов после ошибок"""
+
+import time
+
+import pytest
+
+from monitor import JOB_LEASE, RETRY_BASE, RETRY_MAX, JobQueue
+
+DAY = 86400.0
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / 'history.db'))
+
+
+def job(queue, job_id):
+    return next(j for j in queue.jobs() if j['id'] == job_id)
+
+
+def test_claimed_job_is_not_claimed_again(queue, tmp_path):
+    job_id = queue.add('https://ggsel.net/catalog/steam', DAY)
+    now = time.time() + 1
+    assert [j['id'] for j in queue.claim(5, now=now)] == [job_id]
+    assert queue.claim(5, now=now) == []
+    # Соседний процесс с той же базой
+    assert JobQueue(str(tmp_path / 'history.db')).claim(5, now=now + 60) == []
+    assert queue.next_due() is None
+
+
+def test_release_only_expired_leases(queue):
+    live = queue.add('https://ggsel.net/catalog/steam', DAY)
+    dead = queue.add('https://plati.market/search/steam', DAY)
+    start = time.time() + 1
+    assert len(queue.claim(5, now=start)) == 2
+
+    assert queue.release_stale(now=start + JOB_LEASE - 1) == 0
+    queue.renew([live], now=start + JOB_LEASE - 1)
+    # Продлена только отметка live; dead осталась от упавшего процесса
+    assert queue.release_stale(now=start + JOB_LEASE + 1) == 1
+    assert job(queue, live)['running_since'] == start + JOB_LEASE - 1
+    assert job(queue, dead)['running_since'] is None
+    assert [j['id'] for j in queue.claim(5, now=start + JOB_LEASE + 1)] == [dead]
+
+
+def test_renew_skips_released_jobs(queue):
+    job_id = queue.add('https://ggsel.net/catalog/steam', DAY)
+    start = time.time() + 1
+    queue.claim(1, now=start)
+    queue.finish(job(queue, job_id), snapshot_id=1, count=10, now=start + 5)
+    queue.renew([job_id], now=start + 6)
+    assert job(queue, job_id)['running_since'] is None
+
+
+@pytest.mark.parametrize('interval', [DAY, 300.0])
+def test_fail_backoff(queue, interval):
+    job_id = queue.add('https://ggsel.net/catalog/steam', interval)
+    now = time.time() + 1
+    bases, delays = [], []
+    for attempt in range(1, 12):
+        queue.claim(1, now=now)
+        delay = queue.fail(job(queue, job_id), RuntimeError('timeout'), now=now)
+        base = min(RETRY_BASE * 2 ** (attempt - 1), RETRY_MAX, interval)
+        assert 0.8 * base <= delay <= 1.2 * base
+        bases.append(base)
+        delays.append(delay)
+        state = job(queue, job_id)
+        assert (state['attempts'], state['last_status'], state['last_error']) == (attempt, 'error', 'timeout')
+        assert state['next_run'] == pytest.approx(now + delay)
+        assert state['running_since'] is None
+        now = state['next_run']
+
+    # Пока пауза не уперлась в потолок, она растет и с разбросом: 1.2 * base < 0.8 * 2 * base
+    assert bases[-1] == min(RETRY_MAX, interval)
+    for i in range(len(bases) - 1):
+        if bases[i + 1] > bases[i]:
+            assert delays[i + 1] > delays[i]
+
+    queue.claim(1, now=now)
+    queue.finish(job(queue, job_id), snapshot_id=1, count=10, now=now)
+    assert job(queue, job_id)['attempts'] == 0
+
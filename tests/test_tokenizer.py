@@ -0,0 +1,69 @@
+"""Разбор цены и продаж общим токенизатором: известные форматы карточек ggsel, plati и магазинов"""
+
+import pytest
+
+from core import parse_price, parse_sales
+
+PRICES = [
+    # ggsel
+    ("499\xa0₽", 499.0),
+    ("= 499 ₽", 499.0),
+    ("~ 510 = 499\xa0₽", 499.0),
+    ("~ 1 020 = 1\xa0000\xa0₽", 1000.0),
+    ("12 345 ₽", 12345.0),
+    ("от 99 ₽", 99.0),
+    ("Бесплатно", None),
+    ("", None),
+    # plati
+    ("1234,56 ₽", 1234.56),
+    ("1 234,5 ₽", 1234.5),
+    ("499.90 руб.", 499.9),
+    ("от 15 ₽", 15.0),
+    ("1 299 ₽ 1 500 ₽", 1299.0),
+    # произвольный магазин
+    ("1 234 руб.", 1234.0),
+    ("Цена: 1 234.50 руб", 1234.5),
+    ("$19.99", 19.99),
+    ("по запросу", None),
+]
+
+SALES = [
+    # ggsel
+    ("345 продаж", 345),
+    ("10 000+ продаж", 10000),
+    ("10\xa0000+", 10000),
+    ("5\u202f000 продаж", 5000),
+    ("1,2 тыс продаж", 1200),
+    ("нет продаж", 0),
+    (None, 0),
+    # plati
+    ("Продано 345", 345),
+    ("Продано 1,2 тыс", 1200),
+    ("Продано 1.5 тыс.", 1500),
+    ("Продано 3 тысячи", 3000),
+    ("Продано 2 млн", 2_000_000),
+    ("Продано 1,5 млн", 1_500_000),
+    ("Продано 2.5k", 2500),
+    ("Продано 12К", 12000),
+    ("Продано 10 000+", 10000),
+    ("Продано 500+", 500),
+    ("Продано менее 10", 5),
+    ("Продано: менее 100", 50),
+    ("Продано 7 купили", 7),
+    # произвольный магазин
+    ("12 продаж", 12),
+    ("1 234 sold", 1234),
+    ("1.2k sales", 1200),
+]
+
+
+@pytest.mark.parametrize('text, expected', PRICES)
+def test_parse_price(text, expected):
+    assert parse_price(text) == expected
+    assert parse_price.__wrapped__(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', SALES)
+def test_parse_sales(text, expected):
+    assert parse_sales(text) == expected
+    assert parse_sales.__wrapped__(text) == expected